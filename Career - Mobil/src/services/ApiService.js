@@ -145,7 +145,14 @@ class ApiService {
       clearTimeout(timeoutId);
 
       if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status} - ${response.statusText}`);
+        const httpError = new Error(`HTTP error! status: ${response.status} - ${response.statusText}`);
+        httpError.status = response.status;
+        // Sent with 503 when the server sheds load: seconds to wait before retrying
+        const retryAfter = parseInt(response.headers.get('Retry-After'), 10);
+        if (!Number.isNaN(retryAfter)) {
+          httpError.retryAfter = retryAfter;
+        }
+        throw httpError;
       }
 
       const data = await response.json();
@@ -364,8 +371,14 @@ class ApiService {
           throw error; // Last attempt failed, throw error
         }
 
-        // Wait before retry (exponential backoff)
-        await new Promise(resolve => setTimeout(resolve, Math.pow(2, attempt) * 1000));
+        if (error.status >= 400 && error.status < 500) {
+          throw error; // Client errors do not go away by retrying
+        }
+
+        // Wait before retry (exponential backoff, at least Retry-After when the server is overloaded);
+        // the random part keeps clients that failed together from retrying together
+        const backoff = Math.max(Math.pow(2, attempt), error.retryAfter || 0) * 1000;
+        await new Promise(resolve => setTimeout(resolve, backoff + Math.random() * 500));
       }
     }
   }
@@ -0,0 +1,104 @@
+import threading
+import time
+
+
+class AdmissionGate:
+    """
+    Admission control for one endpoint: at most ``max_in_flight`` requests
+    run at once and at most ``max_queue`` more wait up to ``queue_timeout``
+    seconds for a slot. Anything beyond that is rejected immediately, so a
+    spike turns into fast rejections instead of a growing backlog.
+
+    Gates created with the same ``parent`` also share its limits: a request
+    needs a free slot in its own gate and in the parent, so the endpoints
+    together never hold more than the parent's ``max_in_flight`` slots and
+    ``max_queue`` waiters.
+    """
+
+    ADMITTED = "admitted"
+    QUEUE_FULL = "queue_full"
+    QUEUE_TIMEOUT = "queue_timeout"
+
+    def __init__(self, name, max_in_flight, max_queue=0, queue_timeout=1.0, parent=None):
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.parent = parent
+        # One condition for the whole tree, so checking every level is atomic
+        self._cond = parent._cond if parent is not None else threading.Condition()
+        self._chain = (self, parent) if parent is not None else (self,)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.queued_total = 0
+        self.shed = {self.QUEUE_FULL: 0, self.QUEUE_TIMEOUT: 0}
+
+    def _has_slot(self):
+        return all(gate.in_flight < gate.max_in_flight for gate in self._chain)
+
+    def _take(self):
+        for gate in self._chain:
+            gate.in_flight += 1
+            gate.admitted += 1
+
+    def try_enter(self):
+        """Take a slot if one is free right now, without queueing."""
+        with self._cond:
+            if self._has_slot() and not self.queued:
+                self._take()
+                return True
+            return False
+
+    def enter(self):
+        """
+        Take a slot, queueing for up to ``queue_timeout`` seconds when all are busy.
+
+        Returns:
+            str: ADMITTED, or the reason the request is shed (QUEUE_FULL, QUEUE_TIMEOUT)
+        """
+        with self._cond:
+            if self._has_slot() and not self.queued:
+                self._take()
+                return self.ADMITTED
+            if any(gate.queued >= gate.max_queue for gate in self._chain):
+                self.shed[self.QUEUE_FULL] += 1
+                return self.QUEUE_FULL
+
+            for gate in self._chain:
+                gate.queued += 1
+                gate.queued_total += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while not self._has_slot():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed[self.QUEUE_TIMEOUT] += 1
+                        return self.QUEUE_TIMEOUT
+                    self._cond.wait(remaining)
+            finally:
+                for gate in self._chain:
+                    gate.queued -= 1
+            self._take()
+            return self.ADMITTED
+
+    def leave(self):
+        """Release a slot taken by ``enter`` or ``try_enter``."""
+        with self._cond:
+            for gate in self._chain:
+                gate.in_flight -= 1
+            # Waiters of other endpoints may be blocked on the shared parent
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "queued_total": self.queued_total,
+                "shed": dict(self.shed),
+            }
@@ -1,10 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-from app import search_jobs, get_job_details
+from admission import AdmissionGate
+from app import (search_jobs, search_jobs_batch, search_jobs_cached, search_jobs_federated, search_jobs_local,
+                 get_job_details,
+                 get_job_details_cached, get_cache_stats,
+                 get_index_stats, get_upstream_status, job_id, job_urls_from_result, prefetch_job_details,
+                 save_search, get_saved_search, delete_saved_search, get_new_jobs, get_saved_search_stats,
+                 start_saved_search_scheduler, JobDeduplicator, MAX_PREFETCH)
+from cache import TTLCache
+from metrics import registry as metrics_registry, stage
+from projection import make_projection, truncate_text
+from shared_state import DEFAULT_SHARED_STATE_PATH
+from skills import get_default_matcher
+import argparse
+import base64
+import gzip
+import json
 import logging
+import os
+import random
+import time
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyoneldir; yoksa yalnızca gzip kullanılır
+    brotli = None
 
 # Flask uygulamasını oluştur
 app = Flask(__name__)
@@ -16,6 +39,237 @@ CORS(app, origins=["*"])
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Endpoint başına Cache-Control değerleri
+CACHE_CONTROL = {
+    'health_check': 'no-cache',
+    'api_search_jobs': 'public, max-age=60, stale-while-revalidate=300',
+    'api_job_details': 'public, max-age=3600',
+    'api_job_details_prefetch': 'no-store',
+    'api_search_jobs_batch': 'no-store',
+    'api_search_jobs_federated': 'public, max-age=60',
+    'api_create_saved_search': 'no-store',
+    'api_saved_search': 'no-cache',
+    'api_saved_search_new_jobs': 'no-cache',
+    'api_saved_search_stats': 'no-store',
+    'api_admission_stats': 'no-store',
+    'api_cache_stats': 'no-store',
+    'api_index_stats': 'no-store',
+    'api_upstream_status': 'no-store',
+    'api_metrics': 'no-store'
+}
+
+# Bu boyutun (byte) altındaki yanıtlar sıkıştırılmaz
+COMPRESS_MIN_SIZE = int(os.environ.get("CAREER_COMPRESS_MIN_SIZE", "1024"))
+
+# Aynı içeriğin tekrar tekrar sıkıştırılmaması için (ETag, encoding) -> sıkıştırılmış gövde
+compressed_bodies = TTLCache(ttl=300, max_entries=256, stale_ttl=0)
+
+# İstek başına süre ve durum kodu metrikleri
+http_request_seconds = metrics_registry.histogram(
+    "career_http_request_seconds", "HTTP API request latency by endpoint", labels=("endpoint",))
+http_requests = metrics_registry.counter(
+    "career_http_requests_total", "HTTP API requests by endpoint and status code", labels=("endpoint", "status"))
+
+# Yük atma (admission control): upstream'e gidebilen endpoint'lerde eşzamanlı istek ve
+# bekleme kuyruğu sınırlıdır; dolduğunda istek beklemeden 503 + Retry-After ile reddedilir.
+# Sınırlar süreç başınadır. Endpoint kapıları tek bir toplam bütçeyi paylaşır: çalışan ve
+# kuyrukta bekleyen istekler birlikte worker thread sayısından az thread tutar, böylece
+# sağlık kontrolü ve önbellekten dönen cevaplar için her zaman boş thread kalır.
+ADMISSION_ENABLED = os.environ.get("CAREER_ADMISSION", "1") != "0"
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("CAREER_ADMISSION_QUEUE_TIMEOUT", "1"))
+ADMISSION_RETRY_AFTER = int(os.environ.get("CAREER_ADMISSION_RETRY_AFTER", "2"))
+
+# Aşırı yükte arama ve detay istekleri upstream yerine yalnızca önbellekten/indeksten cevaplanır
+DEGRADED_MODE = os.environ.get("CAREER_DEGRADED_MODE", "1") != "0"
+DEGRADABLE_ENDPOINTS = {'api_search_jobs', 'api_job_details'}
+
+# Endpoint başına toplam bütçeden alınabilecek en büyük pay;
+# ağır toplu endpoint'ler tek başına tüm kapasiteyi tutamaz
+ADMISSION_SHARES = {
+    'api_search_jobs': 1.0,
+    'api_job_details': 1.0,
+    'api_search_jobs_stream': 0.25,
+    'api_search_jobs_batch': 0.25,
+    'api_search_jobs_federated': 0.25,
+    'api_job_details_prefetch': 0.25,
+    'api_create_saved_search': 0.25,
+}
+
+def build_admission_gates(threads):
+    """
+    Süreçteki istek thread sayısına göre toplam bütçeyi ve endpoint başına AdmissionGate'leri oluştur
+
+    Returns:
+        tuple: (toplam kapı, {endpoint: kapı})
+    """
+    max_in_flight = int(os.environ.get("CAREER_ADMISSION_MAX_IN_FLIGHT", str(max(1, threads * 3 // 4))))
+    # Kuyrukta bekleyen istek de bir thread tutar; en az bir thread boş kalır
+    max_queue = int(os.environ.get("CAREER_ADMISSION_MAX_QUEUE", str(max(0, threads - max_in_flight - 1))))
+    total = AdmissionGate('total', max_in_flight, max_queue, ADMISSION_QUEUE_TIMEOUT)
+    gates = {
+        endpoint: AdmissionGate(endpoint, max(1, int(max_in_flight * share)), int(max_queue * share),
+                                ADMISSION_QUEUE_TIMEOUT, parent=total)
+        for endpoint, share in ADMISSION_SHARES.items()
+    }
+    return total, gates
+
+admission_total, admission_gates = build_admission_gates(int(os.environ.get("CAREER_API_THREADS", "8")))
+
+http_shed = metrics_registry.counter(
+    "career_http_shed_total", "Requests rejected with 503 by admission control, by endpoint and reason",
+    labels=("endpoint", "reason"))
+http_degraded = metrics_registry.counter(
+    "career_http_degraded_total", "Requests answered from cached or indexed data while overloaded, by outcome",
+    labels=("endpoint", "outcome"))
+metrics_registry.gauge("career_http_in_flight", "Requests holding an admission slot, by endpoint", lambda: {
+    (name,): gate.in_flight for name, gate in admission_gates.items()
+}, labels=("endpoint",))
+metrics_registry.gauge("career_http_queue_depth", "Requests waiting for an admission slot, by endpoint", lambda: {
+    (name,): gate.queued for name, gate in admission_gates.items()
+}, labels=("endpoint",))
+
+# Kayıtlı aramaları yoklayan thread her süreçte (gunicorn worker'ları dahil) ilk istekte başlatılır
+SAVED_SEARCH_SCHEDULER = os.environ.get("CAREER_SAVED_SEARCH_SCHEDULER", "1") != "0"
+saved_search_scheduler_pid = None
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def ensure_saved_search_scheduler():
+    global saved_search_scheduler_pid
+    if SAVED_SEARCH_SCHEDULER and saved_search_scheduler_pid != os.getpid():
+        saved_search_scheduler_pid = os.getpid()
+        start_saved_search_scheduler()
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    İstek süresini ve durum kodunu kaydet
+
+    optimize_response'tan önce kaydedildiği için ondan sonra çalışır;
+    ölçülen süreye sıkıştırma da dahildir. Akışlı yanıtlarda ilk bayta
+    kadar geçen süre ölçülür.
+    """
+    endpoint = request.endpoint or 'unknown'
+    started = g.get('request_started')
+    if started is not None:
+        http_request_seconds.observe(time.perf_counter() - started, endpoint)
+    http_requests.inc(endpoint, str(response.status_code))
+    return response
+
+@app.before_request
+def admit_request():
+    """
+    İsteği endpoint'in kapasitesine göre kabul et, kuyruğa al veya reddet
+
+    Boş yer yoksa ve endpoint destekliyorsa istek kuyruğa girmeden "degraded"
+    olarak işaretlenir; handler önce önbellekteki/indeksteki veriye bakar.
+    """
+    gate = admission_gates.get(request.endpoint) if ADMISSION_ENABLED else None
+    if gate is None:
+        return None
+    if gate.try_enter():
+        g.admission_gate = gate
+        return None
+    if DEGRADED_MODE and request.endpoint in DEGRADABLE_ENDPOINTS:
+        g.degraded = True
+        return None
+    return wait_for_admission(gate)
+
+def wait_for_admission(gate=None):
+    """Kuyrukta yer açılmasını bekle; kabul edilmezse 503 yanıtı döner, edilirse None"""
+    gate = gate or admission_gates[request.endpoint]
+    g.degraded = False
+    outcome = gate.enter()
+    if outcome == AdmissionGate.ADMITTED:
+        g.admission_gate = gate
+        return None
+    return shed_response(outcome)
+
+def shed_response(reason):
+    """
+    Aşırı yük yanıtı: 503 ve Retry-After
+
+    Retry-After rastgele uzatılır ki reddedilen istemciler aynı anda tekrar gelmesin.
+    """
+    http_shed.inc(request.endpoint or 'unknown', reason)
+    retry_after = ADMISSION_RETRY_AFTER + random.randint(0, ADMISSION_RETRY_AFTER)
+    response = jsonify({
+        "error": "Server overloaded",
+        "message": "Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin",
+        "reason": reason,
+        "retryAfter": retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.teardown_request
+def release_admission(exc):
+    gate = g.pop('admission_gate', None)
+    if gate is not None:
+        gate.leave()
+
+def compress_body(data, encoding):
+    """Yanıt gövdesini verilen encoding ile sıkıştır"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+@app.after_request
+def optimize_response(response):
+    """
+    Yanıtlara Cache-Control, güçlü ETag ve sıkıştırma uygula
+
+    If-None-Match eşleşirse gövdesiz 304 döner. Akışlı yanıtlara dokunulmaz.
+    Her encoding'in kendi ETag'i vardır; başka bir temsilin (ör. gzip
+    kopyasının) ETag'iyle gelen istek 304 değil tam gövdeli 200 alır.
+    """
+    cache_control = CACHE_CONTROL.get(request.endpoint)
+    if cache_control and 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = cache_control
+
+    if response.is_streamed or response.direct_passthrough or response.status_code != 200:
+        return response
+    if 'Content-Encoding' in response.headers:
+        return response
+
+    data = response.get_data()
+    encoding = None
+    if len(data) >= COMPRESS_MIN_SIZE:
+        offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+        encoding = request.accept_encodings.best_match(offered)
+        response.vary.add('Accept-Encoding')
+
+    if request.method in ('GET', 'HEAD'):
+        # Her temsil (sıkıştırılmış/sıkıştırılmamış) için ayrı güçlü ETag
+        if not response.get_etag()[0]:
+            response.add_etag()
+        etag = response.get_etag()[0]
+        if encoding:
+            etag = f"{etag}-{encoding}"
+            response.set_etag(etag)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    else:
+        etag = None
+
+    if encoding:
+        key = (etag, encoding) if etag else None
+        body = compressed_bodies.get(key) if key else None
+        if body is None:
+            body = compress_body(data, encoding)
+            if key:
+                compressed_bodies.set(key, body)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+
+    return response
+
 @app.route('/', methods=['GET'])
 def health_check():
     """API sağlık kontrolü"""
@@ -25,7 +279,18 @@ def health_check():
         "version": "1.0.0",
         "endpoints": {
             "search_jobs": "/api/jobs/search",
+            "search_jobs_stream": "/api/jobs/search/stream",
+            "search_jobs_batch": "/api/jobs/search/batch",
+            "search_jobs_federated": "/api/jobs/search/federated",
             "job_details": "/api/jobs/details",
+            "job_details_prefetch": "/api/jobs/details/prefetch",
+            "saved_searches": "/api/saved-searches",
+            "saved_search_new_jobs": "/api/saved-searches/<id>/new",
+            "cache_stats": "/api/cache/stats",
+            "index_stats": "/api/index/stats",
+            "admission_stats": "/api/admission/stats",
+            "upstream_status": "/api/upstream/status",
+            "metrics": "/metrics",
             "health": "/"
         }
     })
@@ -43,61 +308,88 @@ def api_search_jobs():
     - pagesize (optional): Sayfa başına sonuç sayısı
     - contracttype (optional): Sözleşme türü (p, c, t)
     - contractperiod (optional): Çalışma süresi (f, p)
+    - source (optional): 'local' ise upstream yerine yerel iş ilanı indeksinden cevap verilir
+    - page (optional): Sayfa numarası (yalnızca source=local için)
+    - prefetch (optional): İlk N ilanın detayları arka planda çekilip önbelleğe alınır (maksimum 20)
+    - fields (optional): Döndürülecek ilan alanları, virgülle ayrılmış (ör. id,title,company,url)
+    - max_description_chars (optional): Açıklamalar bu karakter sayısında kesilir
+    - summary (optional): true ise yalnızca liste ekranı için gereken alanlar döner
+    - paginate (optional): 'cursor' ise sonuçlar sunucudaki pencereden verilir ve yanıtta nextCursor döner
+    - cursor (optional): Önceki yanıttaki nextCursor; diğer parametreler imleçten alınır
     """
     try:
-        # Gerekli parametreleri al
-        keywords = request.args.get('keywords', '').strip()
-        location = request.args.get('location', '').strip()
-        
-        if not keywords:
-            return jsonify({
-                "error": "Keywords parameter is required",
-                "message": "Anahtar kelime parametresi gereklidir"
-            }), 400
-            
-        if not location:
-            return jsonify({
-                "error": "Location parameter is required", 
-                "message": "Lokasyon parametresi gereklidir"
-            }), 400
-        
-        # Opsiyonel parametreler
-        locale = request.args.get('locale', 'tr_TR')
-        sort_type = request.args.get('sort', 'relevance')
-        pagesize = request.args.get('pagesize', '10')
-        contracttype = request.args.get('contracttype')
-        contractperiod = request.args.get('contractperiod')
-        
-        # Sayısal parametreleri dönüştür
+        args = request.args
+        position = None
+        if args.get('cursor'):
+            try:
+                cursor_args, position = decode_cursor(args['cursor'])
+            except ValueError:
+                return jsonify({
+                    "error": "Invalid cursor",
+                    "message": "Geçersiz sayfalama imleci"
+                }), 400
+            # İstekte açıkça verilen parametreler imleçtekileri ezer
+            args = dict(cursor_args, **{key: value for key, value in args.items() if key != 'cursor'})
+        elif args.get('paginate') == 'cursor':
+            position = (0, 0)
+
+        search_args, error_response = parse_search_args(args)
+        if error_response:
+            return error_response
+
+        projection, error_response = parse_projection_args(args)
+        if error_response:
+            return error_response
+
+        keywords = search_args['keywords']
+        location = search_args['location']
+        source = args.get('source', 'upstream')
+        logger.info(f"Job search request: keywords='{keywords}', location='{location}', locale='{search_args['locale']}', source='{source}'")
+
         try:
-            pagesize = int(pagesize)
-            if pagesize > 50:  # Maksimum limit
-                pagesize = 50
+            prefetch = min(max(0, int(args.get('prefetch', '0'))), MAX_PREFETCH)
         except ValueError:
-            pagesize = 10
-        
-        # İş arama fonksiyonunu çağır
-        optional_params = {
-            'sort': sort_type,
-            'pagesize': pagesize
-        }
-        
-        if contracttype:
-            optional_params['contracttype'] = contracttype
-        if contractperiod:
-            optional_params['contractperiod'] = contractperiod
-            
-        logger.info(f"Job search request: keywords='{keywords}', location='{location}', locale='{locale}'")
+            prefetch = 0
+
+        if g.get('degraded'):
+            # source=local de kapasiteye tabidir: indeks sorgusu thread tutar ve hazır bir cevabı yoktur
+            page = degraded_search_page(args, search_args, position, projection) if source != 'local' else None
+            if page is not None:
+                http_degraded.inc(request.endpoint, 'served')
+                response = jsonify(page)
+                response.headers['Cache-Control'] = 'no-store'
+                return response
+            # Önbellekte yoksa normal yoldan sıraya girilir
+            http_degraded.inc(request.endpoint, 'miss')
+            error_response = wait_for_admission()
+            if error_response:
+                return error_response
+
+        if position is not None and source != 'local':
+            # Sonraki sayfalar upstream'e gitmeden ve yeniden formatlanmadan pencereden dilimlenir
+            page = window_page(args, search_args, *position)
+            if prefetch:
+                prefetch_job_details(job_urls_from_result(page, prefetch), search_args['locale'], wait=False)
+            if projection is not None and page.get('success'):
+                page['jobs'] = projection.jobs(page['jobs'])
+            return jsonify(page)
         
-        result = search_jobs(
-            keywords=keywords,
-            location=location,
-            locale=locale,
-            **optional_params
-        )
+        if source == 'local':
+            try:
+                page = max(1, int(request.args.get('page', '1')))
+            except ValueError:
+                page = 1
+            result = search_jobs_local(keywords, location, locale=search_args['locale'], page=page, pagesize=search_args['pagesize'])
+        else:
+            result = search_jobs(**search_args)
+
+        # Detay ekranı açıldığında önbellekten gelsin diye ilk ilanlar arka planda çekilir
+        if prefetch:
+            prefetch_job_details(job_urls_from_result(result, prefetch), search_args['locale'], wait=False)
         
         # Sonucu mobil uygulama için uygun formata dönüştür
-        formatted_result = format_search_results(result, keywords, location)
+        with stage("format"):
+            formatted_result = format_search_results(result, keywords, location, projection=projection)
         
         return jsonify(formatted_result)
         
@@ -109,6 +401,448 @@ def api_search_jobs():
             "details": str(e)
         }), 500
 
+# Akış (stream) endpoint'inde tek istekte çekilebilecek maksimum sayfa
+MAX_STREAM_PAGES = 10
+
+@app.route('/api/jobs/search/stream', methods=['GET'])
+def api_search_jobs_stream():
+    """
+    Akışlı iş arama API endpoint'i
+
+    Her iş ilanı formatlanır formatlanmaz gönderilir; istenirse sonraki
+    sayfalar da aynı bağlantı üzerinden akmaya devam eder.
+
+    Query Parameters:
+    - /api/jobs/search ile aynı parametreler
+    - format (optional): ndjson (default) veya sse
+    - pages (optional): Akıtılacak sayfa sayısı (default: 1, maksimum: 10)
+
+    Olaylar (her satır/olay bir JSON nesnesi):
+    - {"event": "meta", ...}: Arama kriterleri
+    - {"event": "job", "job": {...}}: Tek iş ilanı
+    - {"event": "page", ...}: Bir sayfa tamamlandı
+    - {"event": "error", ...}: Upstream hatası, akış sonlanır
+    - {"event": "end", "count": N}: Akış tamamlandı
+    """
+    search_args, error_response = parse_search_args(request.args)
+    if error_response:
+        return error_response
+
+    stream_format = request.args.get('format', 'ndjson').lower()
+    if stream_format not in ('ndjson', 'sse'):
+        stream_format = 'ndjson'
+
+    try:
+        max_pages = max(1, min(int(request.args.get('pages', '1')), MAX_STREAM_PAGES))
+    except ValueError:
+        max_pages = 1
+
+    keywords = search_args['keywords']
+    location = search_args['location']
+    logger.info(f"Job search stream request: keywords='{keywords}', location='{location}', locale='{search_args['locale']}', pages={max_pages}")
+
+    def encode(payload):
+        data = json.dumps(payload, ensure_ascii=False)
+        if stream_format == 'sse':
+            return f"event: {payload['event']}\ndata: {data}\n\n"
+        return data + "\n"
+
+    def generate():
+        yield encode({
+            'event': 'meta',
+            'searchCriteria': {'query': keywords, 'location': location},
+            'pages': max_pages
+        })
+
+        count = 0
+        deduplicator = JobDeduplicator()
+        for page in range(1, max_pages + 1):
+            try:
+                result = search_jobs(page=page, **search_args)
+            except Exception as e:
+                logger.error(f"Error in job search stream: {str(e)}")
+                yield encode({'event': 'error', 'page': page, 'error': 'Internal server error', 'message': 'İş arama sırasında bir hata oluştu'})
+                break
+
+            if 'error' in result:
+                yield encode(dict(format_error_result(result), event='error', page=page))
+                break
+
+            is_demo = result.get('type') == 'demo'
+            jobs = result.get('jobs', [])
+            for formatted_job in format_jobs(jobs, location, demo=is_demo, deduplicator=deduplicator):
+                yield encode({'event': 'job', 'page': page, 'job': formatted_job})
+                count += 1
+
+            total = result.get('total_jobs' if is_demo else 'hits', len(jobs))
+            yield encode({'event': 'page', 'page': page, 'count': len(jobs), 'totalResults': total})
+
+            # Sonuç sayfaları (upstream veya demo) bittiyse dur
+            if not jobs or page >= int(result.get('pages') or page):
+                break
+
+        yield encode({'event': 'end', 'count': count})
+
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/jobs/search/batch', methods=['POST'])
+def api_search_jobs_batch():
+    """
+    Toplu iş arama API endpoint'i
+
+    Birden fazla aramayı (ör. farklı şehirler veya pozisyon eş anlamlıları)
+    tek istekte, upstream'e eşzamanlı olarak çalıştırır.
+
+    JSON Body:
+    - queries (required): [{"keywords": ..., "location": ..., "locale"?, "sort"?, "pagesize"?, ...}] (maksimum 20)
+    - locale (optional): Varsayılan dil kodu (default: tr_TR)
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        queries = body.get('queries')
+
+        if not isinstance(queries, list) or not queries:
+            return jsonify({
+                "error": "Queries parameter is required",
+                "message": "Sorgu listesi (queries) gereklidir"
+            }), 400
+
+        locale = body.get('locale', 'tr_TR')
+
+        # Sayfa boyutu tekil arama ile aynı varsayılan ve limitle uygulanır;
+        # istemcinin gönderdiği sözlükler değiştirilmez
+        queries = [dict(query) if isinstance(query, dict) else query for query in queries]
+        for query in queries:
+            if isinstance(query, dict):
+                try:
+                    query['pagesize'] = min(int(query.get('pagesize', 10)), 50)
+                except (TypeError, ValueError):
+                    query['pagesize'] = 10
+
+        logger.info(f"Job batch search request: {len(queries)} queries, locale='{locale}'")
+
+        batch = search_jobs_batch(queries, locale=locale)
+
+        results = []
+        # Birleşik listedeki her ilanın geldiği sorgunun lokasyonu ve demo olup olmadığı
+        origins = {}
+        for item in batch['results']:
+            query = item['query'] if isinstance(item['query'], dict) else {}
+            results.append({
+                'query': query,
+                'result': format_search_results(item['result'], query.get('keywords', ''), query.get('location', ''))
+            })
+            for job in item['result'].get('jobs', []):
+                origins.setdefault(id(job), (query.get('location', ''), item['result'].get('type') == 'demo'))
+
+        # Birleştirme (URL ve başlık/şirket/lokasyon tekilleştirmesi) MCP aracıyla aynı olsun diye
+        # search_jobs_batch'in sonucu formatlanır
+        merged_raw = batch['merged']['jobs']
+        requirements = extract_requirements_batch([job.get('description', '') for job in merged_raw])
+        merged_jobs = [
+            format_job(job, *origins[id(job)], requirements=reqs)
+            for job, reqs in zip(merged_raw, requirements)
+        ]
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'merged': {
+                'jobs': merged_jobs,
+                'totalResults': len(merged_jobs)
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error in job batch search API: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": "Toplu iş arama sırasında bir hata oluştu",
+            "details": str(e)
+        }), 500
+
+# Mobil uygulama formatındaki ilan alanları
+# (locales yalnızca çok lokalli aramada bulunur)
+FORMATTED_JOB_FIELDS = ('id', 'title', 'company', 'location', 'description', 'requirements', 'salary',
+                        'type', 'postedDate', 'url', 'locales')
+
+# summary=true ile dönen alanlar (liste ekranı için yeterli, açıklamasız)
+SUMMARY_JOB_FIELDS = ('id', 'title', 'company', 'location', 'salary', 'type', 'postedDate', 'url', 'locales')
+
+# MCP araçlarındaki ve Careerjet'teki alan adları da kabul edilir
+API_FIELD_ALIASES = {'locations': 'location', 'date': 'postedDate', 'posted_date': 'postedDate'}
+
+def parse_projection_args(args):
+    """
+    fields / max_description_chars / summary parametrelerini doğrula
+
+    Returns:
+        tuple: (Projection veya None, hata yanıtı) - hata yoksa ikinci değer None
+    """
+    summary = args.get('summary', '').lower() in ('1', 'true', 'yes')
+    try:
+        projection = make_projection(
+            args.get('fields'),
+            args.get('max_description_chars') or None,
+            summary,
+            allowed=FORMATTED_JOB_FIELDS,
+            summary_fields=SUMMARY_JOB_FIELDS,
+            aliases=API_FIELD_ALIASES,
+        )
+    except ValueError as e:
+        return None, (jsonify({
+            "error": str(e),
+            "message": "Geçersiz alan listesi veya açıklama uzunluğu"
+        }), 400)
+    return projection, None
+
+# Metin olarak beklenen arama parametreleri
+SEARCH_TEXT_PARAMS = ('keywords', 'location', 'locale', 'sort', 'contracttype', 'contractperiod')
+
+def parse_search_args(args):
+    """
+    Arama sorgu parametrelerini doğrula ve search_jobs argümanlarına dönüştür
+
+    Returns:
+        tuple: (search_jobs argümanları, hata yanıtı) - hata yoksa ikinci değer None
+    """
+    # JSON gövdesinden gelen değerler string olmayabilir (ör. sayı, liste)
+    invalid = [name for name in SEARCH_TEXT_PARAMS
+               if args.get(name) is not None and not isinstance(args.get(name), str)]
+    if invalid:
+        return None, (jsonify({
+            "error": f"Parameters must be strings: {', '.join(invalid)}",
+            "message": "Arama parametreleri metin olmalıdır"
+        }), 400)
+
+    # Gerekli parametreleri al
+    keywords = (args.get('keywords') or '').strip()
+    location = (args.get('location') or '').strip()
+    
+    if not keywords:
+        return None, (jsonify({
+            "error": "Keywords parameter is required",
+            "message": "Anahtar kelime parametresi gereklidir"
+        }), 400)
+        
+    if not location:
+        return None, (jsonify({
+            "error": "Location parameter is required", 
+            "message": "Lokasyon parametresi gereklidir"
+        }), 400)
+    
+    # Opsiyonel parametreler
+    locale = args.get('locale') or 'tr_TR'
+    sort_type = args.get('sort') or 'relevance'
+    pagesize = args.get('pagesize', '10')
+    contracttype = args.get('contracttype')
+    contractperiod = args.get('contractperiod')
+    
+    # Sayısal parametreleri dönüştür
+    try:
+        pagesize = max(1, min(int(pagesize), 50))  # Maksimum limit 50
+    except (TypeError, ValueError):
+        return None, (jsonify({
+            "error": "pagesize must be an integer",
+            "message": "Sayfa boyutu tam sayı olmalıdır"
+        }), 400)
+    
+    search_args = {
+        'keywords': keywords,
+        'location': location,
+        'locale': locale,
+        'sort': sort_type,
+        'pagesize': pagesize
+    }
+    
+    if contracttype:
+        search_args['contracttype'] = contracttype
+    if contractperiod:
+        search_args['contractperiod'] = contractperiod
+    
+    return search_args, None
+
+@app.route('/api/jobs/search/federated', methods=['GET'])
+def api_search_jobs_federated():
+    """
+    Çok lokalli (federe) iş arama
+
+    Aynı arama birden fazla Careerjet lokalinde eşzamanlı çalıştırılır;
+    sonuçlar tekilleştirilip alaka ve tarihe göre tek listede sıralanır.
+    Süresinde cevap vermeyen lokaller beklenmez, yanıtta "partial": true döner.
+
+    Query Parameters:
+    - keywords, location (required): Arama parametreleri
+    - locales (required): Virgülle ayrılmış lokal kodları (ör. tr_TR,en_GB,de_DE; maksimum 8)
+    - timeout (optional): Lokaller için beklenecek süre, saniye (default: 5)
+    - date_weight (optional): Sıralamada tarihin payı, 0-1 (default: 0.3; sort=date ise 1)
+    - sort, pagesize, contracttype, contractperiod (optional): Lokal başına arama parametreleri
+    - fields, max_description_chars, summary (optional): /api/jobs/search ile aynı
+    """
+    try:
+        search_args, error_response = parse_search_args(request.args)
+        if error_response:
+            return error_response
+
+        projection, error_response = parse_projection_args(request.args)
+        if error_response:
+            return error_response
+
+        search_args.pop('locale', None)
+        locales = request.args.get('locales', '')
+        logger.info(f"Federated search request: keywords='{search_args['keywords']}', location='{search_args['location']}', locales='{locales}'")
+
+        result = search_jobs_federated(locales=locales, timeout=request.args.get('timeout'),
+                                       date_weight=request.args.get('date_weight'), **search_args)
+        if 'error' in result:
+            return jsonify(dict(result, message="Geçersiz lokal listesi veya parametre")), 400
+
+        with stage("format"):
+            formatted = format_search_results(result, search_args['keywords'], search_args['location'],
+                                              projection=projection)
+        formatted['locales'] = result['locales']
+        formatted['partial'] = result['partial']
+
+        response = jsonify(formatted)
+        if result['partial']:
+            # Eksik sonuç önbellekte kalmamalı; lokal tamamlanınca tekrar istenebilir
+            response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    except Exception as e:
+        logger.error(f"Error in federated search API: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": "Çok lokalli arama sırasında bir hata oluştu",
+            "details": str(e)
+        }), 500
+
+# Cursor sayfalamada upstream'den tek seferde çekilip formatlanan pencere (Careerjet en fazla 100 döner)
+SEARCH_WINDOW_SIZE = min(int(os.environ.get("CAREER_SEARCH_WINDOW_SIZE", "100")), 100)
+
+# İmleçle gidilebilecek en fazla pencere; daha uzak pencereler upstream'e
+# anlamsız derin sayfa istekleri olurdu (varsayılan: 100 x 100 = 10.000 ilan)
+MAX_SEARCH_WINDOWS = int(os.environ.get("CAREER_SEARCH_MAX_WINDOWS", "100"))
+
+# Sorgu başına formatlanmış sonuç pencereleri; sonraki sayfalar buradan dilimlenir.
+# 100 ilanlık bir pencere açıklama uzunluğuna göre kabaca 150-550 KB tutar
+result_windows = TTLCache(
+    ttl=float(os.environ.get("CAREER_SEARCH_WINDOW_TTL", "300")),
+    max_entries=int(os.environ.get("CAREER_SEARCH_WINDOW_MAX_ENTRIES", "256")),
+    stale_ttl=0,
+    max_bytes=int(os.environ.get("CAREER_SEARCH_WINDOW_MAX_BYTES", str(32 * 1024 * 1024))),
+)
+
+# İmleçte taşınan istek parametreleri; pencere önbellekten düşse bile imleç onu yeniden kurabilir
+CURSOR_ARGS = ('keywords', 'location', 'locale', 'sort', 'pagesize', 'contracttype', 'contractperiod',
+               'fields', 'max_description_chars', 'summary')
+
+def encode_cursor(args, window, start):
+    """
+    Sonraki sayfanın konumunu opak bir imlece dönüştür
+    """
+    state = {key: args.get(key) for key in CURSOR_ARGS if args.get(key) not in (None, '')}
+    state['w'] = window
+    state['o'] = start
+    raw = json.dumps(state, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    İmleci çöz
+
+    Returns:
+        tuple: (istek parametreleri, (pencere, pencere içi konum))
+
+    Raises:
+        ValueError: İmleç bozuksa
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        window, start = int(state.pop('w')), int(state.pop('o'))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid cursor") from None
+    if not 0 <= window < MAX_SEARCH_WINDOWS or not 0 <= start < SEARCH_WINDOW_SIZE:
+        raise ValueError("Invalid cursor")
+    return {key: str(value) for key, value in state.items() if key in CURSOR_ARGS}, (window, start)
+
+def is_cacheable_window(loaded):
+    # Hata, demo ve bayat sonuçlar pencere olarak saklanmaz; upstream düzelince gerçek veri gelsin
+    formatted, _ = loaded
+    return formatted.get('success') and not formatted.get('stale') and formatted.get('type') != 'demo'
+
+def load_result_window(search_args, window, cached_only=False):
+    """
+    Sorgunun window numaralı pencereyi (SEARCH_WINDOW_SIZE ilan) formatlanmış olarak döndür
+
+    cached_only ise upstream'e gidilmez; pencere önbellekte yoksa (None, 0) döner.
+
+    Returns:
+        tuple: (formatlanmış sonuç, upstream'den gelen ilan sayısı)
+    """
+    key = tuple(sorted((name, str(value)) for name, value in search_args.items() if name != 'pagesize')) + (window,)
+    if cached_only:
+        return result_windows.get(key) or (None, 0)
+
+    def load():
+        result = search_jobs(**dict(search_args, pagesize=SEARCH_WINDOW_SIZE, page=window + 1))
+        with stage("format"):
+            formatted = format_search_results(result, search_args['keywords'], search_args['location'])
+        return formatted, len(result.get('jobs', []))
+
+    return result_windows.get_or_load(key, load, cacheable=is_cacheable_window)
+
+def window_page(args, search_args, window, start, cached_only=False):
+    """
+    Pencereden bir sayfa dilimle; yanıta sonraki sayfanın imleci (nextCursor) eklenir
+
+    Pencerenin sonuna gelindiğinde ve upstream'de daha fazla sonuç varsa
+    imleç bir sonraki pencereyi gösterir. cached_only ise pencere önbellekte
+    yoksa None döner.
+    """
+    formatted, fetched = load_result_window(search_args, window, cached_only)
+    if formatted is None:
+        return None
+    if not formatted.get('success'):
+        return formatted
+
+    jobs = formatted['jobs'][start:start + search_args['pagesize']]
+    end = start + len(jobs)
+    next_cursor = None
+    if jobs and end < len(formatted['jobs']):
+        next_cursor = encode_cursor(args, window, end)
+    elif (jobs and fetched >= SEARCH_WINDOW_SIZE and window + 1 < MAX_SEARCH_WINDOWS
+          and (window + 1) * SEARCH_WINDOW_SIZE < formatted['totalResults']):
+        next_cursor = encode_cursor(args, window + 1, 0)
+    return dict(formatted, jobs=jobs, nextCursor=next_cursor)
+
+def degraded_search_page(args, search_args, position, projection):
+    """
+    Aşırı yükte aramayı upstream'e gitmeden cevapla
+
+    Returns:
+        dict: Önbellekteki pencereden, arama önbelleğinden veya yerel indeksten
+            formatlanmış sonuç ("degraded": true); veri yoksa None
+    """
+    if position is not None:
+        page = window_page(args, search_args, *position, cached_only=True)
+        if page is None or not page.get('success'):
+            return None
+        if projection is not None:
+            page['jobs'] = projection.jobs(page['jobs'])
+    else:
+        result = search_jobs_cached(**search_args)
+        if result is None:
+            return None
+        with stage("format"):
+            page = format_search_results(result, search_args['keywords'], search_args['location'], projection=projection)
+    page['degraded'] = True
+    return page
+
 @app.route('/api/jobs/details', methods=['GET'])
 def api_job_details():
     """
@@ -130,8 +864,30 @@ def api_job_details():
         locale = request.args.get('locale', 'tr_TR')
         
         logger.info(f"Job details request: url='{job_url}', locale='{locale}'")
+
+        if g.get('degraded'):
+            cached = get_job_details_cached(job_url)
+            if cached is not None:
+                http_degraded.inc(request.endpoint, 'served')
+                return jsonify(dict(cached, degraded=True))
+            http_degraded.inc(request.endpoint, 'miss')
+            error_response = wait_for_admission()
+            if error_response:
+                return error_response
         
         result = get_job_details(job_url, locale)
+
+        if result.get('rejected'):
+            return jsonify({
+                "error": result['error'],
+                "message": "Bu URL'den iş ilanı alınamaz; yalnızca izin verilen iş sitelerinin http(s) adresleri kabul edilir"
+            }), 400
+
+        if 'error' in result:
+            # Hatalı sonuç bir saat boyunca önbellekte kalmamalı
+            response = jsonify(dict(result, message="İş ilanı sayfası alınamadı"))
+            response.headers['Cache-Control'] = 'no-store'
+            return response, 502
         
         return jsonify(result)
         
@@ -143,28 +899,203 @@ def api_job_details():
             "details": str(e)
         }), 500
 
-def format_search_results(result, keywords, location):
+@app.route('/api/jobs/details/prefetch', methods=['POST'])
+def api_job_details_prefetch():
+    """
+    Toplu iş detayı endpoint'i
+
+    Verilen ilanların detaylarını sınırlı eşzamanlılıkla çeker ve önbelleğe
+    alır; sonraki /api/jobs/details istekleri önbellekten döner.
+
+    JSON Body:
+    - urls (required): İş ilanı URL listesi (maksimum 20)
+    - locale (optional): Dil kodu (default: tr_TR)
+    - wait (optional): false ise istek beklemeden döner, çekme arka planda sürer (default: true)
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        urls = body.get('urls')
+
+        if not isinstance(urls, list) or not urls:
+            return jsonify({
+                "error": "URLs parameter is required",
+                "message": "URL listesi (urls) gereklidir"
+            }), 400
+
+        if len(urls) > MAX_PREFETCH:
+            return jsonify({
+                "error": f"Too many URLs (max {MAX_PREFETCH})",
+                "message": f"En fazla {MAX_PREFETCH} URL gönderilebilir"
+            }), 400
+
+        locale = body.get('locale', 'tr_TR')
+        wait = body.get('wait', True) is not False
+
+        logger.info(f"Job details prefetch request: {len(urls)} urls, locale='{locale}', wait={wait}")
+
+        result = prefetch_job_details([url for url in urls if isinstance(url, str)], locale, wait=wait)
+
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error in job details prefetch API: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": "İş detayları alınırken bir hata oluştu",
+            "details": str(e)
+        }), 500
+
+def saved_search_error(result):
+    """Kayıtlı arama hatasını uygun durum koduyla yanıtla"""
+    error = result['error']
+    if error == "Saved searches are disabled":
+        return jsonify(dict(result, message="Kayıtlı aramalar devre dışı")), 503
+    if error == "Saved search not found":
+        return jsonify(dict(result, message="Kayıtlı arama bulunamadı")), 404
+    return jsonify(dict(result, message="Geçersiz kayıtlı arama parametresi")), 400
+
+@app.route('/api/saved-searches', methods=['POST'])
+def api_create_saved_search():
+    """
+    Kayıtlı arama oluştur
+
+    Arama hemen bir kez çalıştırılır; o anda var olan ilanlar başlangıç
+    kümesidir. Sonrasında arama arka planda (rastgele kaydırılmış
+    aralıklarla) yeniden yoklanır ve yalnızca yeni ilanlar saklanır.
+
+    JSON Body:
+    - keywords, location (required): Arama parametreleri
+    - locale (optional): Dil kodu (default: tr_TR)
+    - sort, pagesize, contracttype, contractperiod (optional): Arama parametreleri (default: sort=date, pagesize=50)
+    - interval (optional): Yoklama aralığı, saniye (default: 900)
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return jsonify({
+                "error": "JSON body must be an object",
+                "message": "İstek gövdesi bir JSON nesnesi olmalıdır"
+            }), 400
+        search_args, error_response = parse_search_args(dict({'sort': 'date', 'pagesize': 50}, **body))
+        if error_response:
+            return error_response
+
+        logger.info(f"Saved search request: keywords='{search_args['keywords']}', location='{search_args['location']}'")
+
+        result = save_search(interval=body.get('interval'), **search_args)
+        if 'error' in result:
+            return saved_search_error(result)
+        return jsonify(result), 201
+
+    except Exception as e:
+        logger.error(f"Error in saved search API: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": "Kayıtlı arama oluşturulurken bir hata oluştu",
+            "details": str(e)
+        }), 500
+
+@app.route('/api/saved-searches/<search_id>', methods=['GET', 'DELETE'])
+def api_saved_search(search_id):
+    """Kayıtlı aramanın yoklama durumu (GET) veya silinmesi (DELETE)"""
+    result = delete_saved_search(search_id) if request.method == 'DELETE' else get_saved_search(search_id)
+    if 'error' in result:
+        return saved_search_error(result)
+    return jsonify(result)
+
+@app.route('/api/saved-searches/<search_id>/new', methods=['GET'])
+def api_saved_search_new_jobs(search_id):
+    """
+    Kayıtlı aramada son kontrolden beri çıkan yeni ilanlar
+
+    Upstream'e gidilmez; yalnızca arka plan yoklamalarının bulduğu ilanlar
+    okunur. Yanıttaki cursor bir sonraki istekte since olarak gönderilir.
+
+    Query Parameters:
+    - since (optional): Önceki yanıttaki cursor (default: 0, kayıttan beri tüm yeni ilanlar)
+    - limit (optional): En fazla ilan sayısı (default: 100); hasMore kalan olup olmadığını söyler
+    - fields, max_description_chars, summary (optional): /api/jobs/search ile aynı
+    """
+    try:
+        projection, error_response = parse_projection_args(request.args)
+        if error_response:
+            return error_response
+
+        result = get_new_jobs(search_id, request.args.get('since', 0), request.args.get('limit', 100))
+        if 'error' in result:
+            return saved_search_error(result)
+
+        search = get_saved_search(search_id)
+        with stage("format"):
+            jobs = format_jobs(result['jobs'], search.get('location', ''), projection=projection)
+
+        return jsonify({
+            'success': True,
+            'searchId': search_id,
+            'jobs': jobs,
+            'count': len(jobs),
+            'cursor': result['cursor'],
+            'hasMore': result['has_more'],
+            'lastChecked': result['last_checked'],
+            'nextCheck': result['next_check'],
+            'lastError': result['last_error']
+        })
+
+    except Exception as e:
+        logger.error(f"Error in saved search new jobs API: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": "Yeni ilanlar alınırken bir hata oluştu",
+            "details": str(e)
+        }), 500
+
+@app.route('/api/saved-searches/stats', methods=['GET'])
+def api_saved_search_stats():
+    """Kayıtlı arama deposu ve zamanlayıcı istatistikleri"""
+    return jsonify(get_saved_search_stats())
+
+@app.route('/api/admission/stats', methods=['GET'])
+def api_admission_stats():
+    """Endpoint başına eşzamanlı istek, kuyruk derinliği ve reddedilen istek sayıları"""
+    return jsonify({
+        "enabled": ADMISSION_ENABLED,
+        "degraded_mode": DEGRADED_MODE,
+        "total": admission_total.stats(),
+        "endpoints": {name: gate.stats() for name, gate in admission_gates.items()}
+    })
+
+@app.route('/api/cache/stats', methods=['GET'])
+def api_cache_stats():
+    """Arama önbelleği istatistikleri (hit/miss sayaçları)"""
+    stats = get_cache_stats()
+    stats["windows"] = result_windows.stats()
+    return jsonify(stats)
+
+@app.route('/api/index/stats', methods=['GET'])
+def api_index_stats():
+    """Yerel iş ilanı indeksi istatistikleri"""
+    return jsonify(get_index_stats())
+
+@app.route('/api/upstream/status', methods=['GET'])
+def api_upstream_status():
+    """Upstream devre kesici durumu, hata oranı ve gecikme yüzdelikleri"""
+    return jsonify(get_upstream_status())
+
+@app.route('/metrics', methods=['GET'])
+def api_metrics():
+    """Prometheus metin formatında aşama gecikmeleri ve sayaçlar"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+def format_search_results(result, keywords, location, projection=None):
     """
     API sonuçlarını mobil uygulama için uygun formata dönüştür
+
+    projection verilirse her ilanda yalnızca istenen alanlar döner ve
+    açıklamalar kısaltılır.
     """
     if result.get('type') == 'demo':
         # Demo verilerini mobil uygulama formatına dönüştür
-        formatted_jobs = []
-        for job in result.get('jobs', []):
-            # Enhanced formatting for demo jobs
-            formatted_job = {
-                'id': job.get('id', str(hash(job.get('url', job.get('title', ''))))),
-                'title': job.get('title', ''),
-                'company': job.get('company', ''),
-                'location': job.get('location', location),
-                'description': job.get('description', ''),
-                'requirements': job.get('requirements', extract_requirements(job.get('description', ''))),
-                'salary': job.get('salary', ''),
-                'type': job.get('type', 'Tam Zamanlı'),
-                'postedDate': job.get('date', job.get('posted_date', '')),
-                'url': job.get('url', '')
-            }
-            formatted_jobs.append(formatted_job)
+        formatted_jobs = format_jobs(result.get('jobs', []), location, demo=True, projection=projection)
 
         return {
             'success': True,
@@ -180,35 +1111,13 @@ def format_search_results(result, keywords, location):
         }
     
     elif 'error' in result:
-        return {
-            'success': False,
-            'error': result.get('error'),
-            'message': result.get('message', 'Bir hata oluştu'),
-            'jobs': [],
-            'totalResults': 0
-        }
+        return format_error_result(result)
     
     else:
         # Gerçek API sonuçları için format (Careerjet API response)
-        jobs = result.get('jobs', [])
-        formatted_jobs = []
+        formatted_jobs = format_jobs(result.get('jobs', []), location, projection=projection)
         
-        for job in jobs:
-            formatted_job = {
-                'id': str(hash(job.get('url', job.get('title', '')))),
-                'title': job.get('title', ''),
-                'company': job.get('company', ''),
-                'location': job.get('locations', location),
-                'description': job.get('description', ''),
-                'requirements': extract_requirements(job.get('description', '')),
-                'salary': job.get('salary', 'Belirtilmemiş'),
-                'type': format_contract_type(job.get('contracttype', '')),
-                'postedDate': job.get('date', ''),
-                'url': job.get('url', '')
-            }
-            formatted_jobs.append(formatted_job)
-        
-        return {
+        formatted = {
             'success': True,
             'jobs': formatted_jobs,
             'totalResults': result.get('hits', len(formatted_jobs)),
@@ -217,30 +1126,119 @@ def format_search_results(result, keywords, location):
                 'location': location
             }
         }
+        if result.get('source') == 'stale_cache':
+            # Upstream erişilemezken son başarılı sonuç sunuluyor
+            formatted['stale'] = True
+        return formatted
+
+def format_jobs(jobs, location, demo=False, deduplicator=None, projection=None):
+    """
+    Bir sayfa iş ilanını formatla; gereksinimler tek toplu çağrıda çıkarılır
+
+    Tekrarlanan ilanlar (aynı URL veya aynı başlık/şirket/lokasyon)
+    formatlanmadan önce atılır. Birden fazla sayfa boyunca tekilleştirmek
+    için aynı deduplicator nesnesi verilebilir. projection gereksinimleri
+    içermiyorsa beceri eşleştirmesi hiç yapılmaz.
+    """
+    if deduplicator is None:
+        deduplicator = JobDeduplicator()
+    jobs = [job for job in jobs if deduplicator.add(job)]
+    if projection is not None and not projection.includes('requirements'):
+        requirements = [[]] * len(jobs)
+    else:
+        requirements = extract_requirements_batch([job.get('description', '') for job in jobs])
+    return [format_job(job, location, demo=demo, requirements=reqs, projection=projection)
+            for job, reqs in zip(jobs, requirements)]
+
+def format_error_result(result):
+    """
+    Hata sonucunu mobil uygulama formatına dönüştür
+    """
+    return {
+        'success': False,
+        'error': result.get('error'),
+        'message': result.get('message', 'Bir hata oluştu'),
+        'jobs': [],
+        'totalResults': 0
+    }
+
+# Mobil formattaki alanların ham ilandan nasıl üretildiği; description, requirements
+# ve locales format_job içinde ayrıca ele alınır
+JOB_FORMATTERS = {
+    'id': lambda job, location: job_id(job),
+    'title': lambda job, location: job.get('title', ''),
+    'company': lambda job, location: job.get('company', ''),
+    'location': lambda job, location: job.get('locations', location),
+    'salary': lambda job, location: job.get('salary', 'Belirtilmemiş'),
+    'type': lambda job, location: format_contract_type(job.get('contracttype', '')),
+    'postedDate': lambda job, location: job.get('date', ''),
+    'url': lambda job, location: job.get('url', ''),
+}
+
+# Demo ilanları zaten mobil formata yakındır
+DEMO_JOB_FORMATTERS = dict(
+    JOB_FORMATTERS,
+    id=lambda job, location: job.get('id', job_id(job)),
+    location=lambda job, location: job.get('location', location),
+    salary=lambda job, location: job.get('salary', ''),
+    type=lambda job, location: job.get('type', 'Tam Zamanlı'),
+    postedDate=lambda job, location: job.get('date', job.get('posted_date', '')),
+)
+
+def format_job(job, location, demo=False, requirements=None, projection=None):
+    """
+    Tek bir iş ilanını mobil uygulama formatına dönüştür
+
+    requirements verilmezse açıklamadan çıkarılır; sayfa formatlanırken
+    extract_requirements_batch ile önceden hesaplanıp verilmesi daha hızlıdır.
+    projection verilirse yalnızca istenen alanlar üretilir ve açıklama
+    formatlanırken kısaltılır; tam ilan bir kez daha kopyalanmaz.
+    """
+    fields = projection.fields if projection is not None and projection.fields is not None else FORMATTED_JOB_FIELDS
+    limit = projection.max_description_chars if projection is not None else None
+    formatters = DEMO_JOB_FORMATTERS if demo else JOB_FORMATTERS
+
+    formatted = {}
+    for name in fields:
+        if name == 'description':
+            description = job.get('description', '')
+            formatted[name] = truncate_text(description, limit) if limit is not None else description
+        elif name == 'requirements':
+            if demo and 'requirements' in job:
+                formatted[name] = job['requirements']
+            elif requirements is None:
+                formatted[name] = extract_requirements(job.get('description', ''))
+            else:
+                formatted[name] = requirements
+        elif name == 'locales':
+            # Çok lokalli aramada ilanı döndüren lokaller
+            if not demo and 'locales' in job:
+                formatted[name] = job['locales']
+        else:
+            formatted[name] = formatters[name](job, location)
+    return formatted
+
+# Hiç beceri bulunamazsa gösterilecek varsayılan gereksinimler
+DEFAULT_REQUIREMENTS = ['İlgili alanda deneyim', 'Takım çalışması', 'İletişim becerileri']
+
+# İlan başına gösterilecek maksimum gereksinim sayısı
+MAX_REQUIREMENTS = 5
 
 def extract_requirements(description):
     """
-    İş açıklamasından gereksinimleri çıkar (basit implementasyon)
+    İş açıklamasından gereksinimleri çıkar
+
+    Beceriler, yapılandırılabilir taksonomiden (skills.json) derlenmiş tek
+    bir eşleştirici ile kelime sınırlarına göre bulunur.
     """
-    # Basit anahtar kelime tabanlı gereksinim çıkarma
-    common_skills = [
-        'Python', 'JavaScript', 'React', 'Node.js', 'Java', 'C#', 'PHP',
-        'HTML', 'CSS', 'SQL', 'MongoDB', 'PostgreSQL', 'Git', 'Docker',
-        'AWS', 'Azure', 'Linux', 'Windows', 'API', 'REST', 'GraphQL'
-    ]
-    
-    requirements = []
-    description_lower = description.lower()
-    
-    for skill in common_skills:
-        if skill.lower() in description_lower:
-            requirements.append(skill)
-    
-    # Eğer hiç gereksinim bulunamazsa varsayılan ekle
-    if not requirements:
-        requirements = ['İlgili alanda deneyim', 'Takım çalışması', 'İletişim becerileri']
-    
-    return requirements[:5]  # Maksimum 5 gereksinim
+    return extract_requirements_batch([description])[0]
+
+def extract_requirements_batch(descriptions):
+    """
+    Bir sayfadaki tüm iş açıklamalarından gereksinimleri tek seferde çıkar
+    """
+    matches = get_default_matcher().match_many(descriptions)
+    return [(skills or DEFAULT_REQUIREMENTS)[:MAX_REQUIREMENTS] for skills in matches]
 
 def format_contract_type(contract_type):
     """
@@ -255,16 +1253,95 @@ def format_contract_type(contract_type):
     }
     return contract_map.get(contract_type, 'Tam Zamanlı')
 
+def run_production(host, port, workers, threads):
+    """
+    Production sunucusunu çalıştır
+
+    gunicorn varsa çok süreçli (gthread) worker'larla, yoksa (ör. Windows)
+    waitress ile tek süreçte çok thread'li çalışır. Worker'lar arasında
+    arama önbelleği ve upstream rate-limit durumu SQLite üzerinden paylaşılır.
+    """
+    global admission_total, admission_gates
+
+    # Worker süreçleri fork'tan önce ortamı devralır; paylaşılan durum her süreçte ayrı açılır
+    os.environ.setdefault("CAREER_SHARED_STATE_PATH", DEFAULT_SHARED_STATE_PATH)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is not None:
+        options = {
+            'bind': f"{host}:{port}",
+            'workers': workers,
+            'threads': threads,
+            'worker_class': 'gthread',
+            'timeout': 60,
+            'keepalive': 5,
+            'accesslog': '-'
+        }
+
+        # Kapasite sınırları worker başına thread sayısına göre
+        admission_total, admission_gates = build_admission_gates(threads)
+
+        class GunicornApplication(BaseApplication):
+            def load_config(self):
+                for key, value in options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return app
+
+        GunicornApplication().run()
+        return
+
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("Production modu için gunicorn veya waitress gereklidir: pip install -r requirements.txt")
+
+    logger.info(f"gunicorn bulunamadı, waitress ile tek süreçte {workers * threads} thread kullanılıyor")
+    admission_total, admission_gates = build_admission_gates(workers * threads)
+    serve(app, host=host, port=port, threads=workers * threads)
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Career MCP API Server")
+    parser.add_argument('--production', action='store_true',
+                        default=os.environ.get('CAREER_API_MODE') == 'production',
+                        help="Geliştirme sunucusu yerine çok worker'lı production sunucusunu kullan")
+    parser.add_argument('--host', default=os.environ.get('CAREER_API_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('CAREER_API_PORT', '5000')))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('CAREER_API_WORKERS', str(os.cpu_count() or 1))),
+                        help="Worker süreç sayısı (production)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('CAREER_API_THREADS', '8')),
+                        help="Worker başına thread sayısı (production)")
+    args = parser.parse_args()
+
     print("🚀 Career MCP API Server başlatılıyor...")
     print("📍 Endpoint'ler:")
     print("   - GET /                     : Sağlık kontrolü")
     print("   - GET /api/jobs/search      : İş arama")
+    print("   - GET /api/jobs/search/stream : Akışlı iş arama (NDJSON/SSE)")
+    print("   - POST /api/jobs/search/batch : Toplu iş arama")
+    print("   - GET /api/jobs/search/federated : Çok lokalli iş arama")
     print("   - GET /api/jobs/details     : İş detayları")
-    print("🌐 Server: http://localhost:5000")
-    
-    app.run(
-        host='0.0.0.0',
-        port=5000,
-        debug=True
-    )
+    print("   - POST /api/jobs/details/prefetch : Toplu iş detayı (önbelleğe alma)")
+    print("   - POST /api/saved-searches  : Kayıtlı arama oluşturma")
+    print("   - GET /api/saved-searches/<id>/new : Kayıtlı aramadaki yeni ilanlar")
+    print("   - GET /api/cache/stats      : Önbellek istatistikleri")
+    print("   - GET /api/index/stats      : Yerel iş indeksi istatistikleri")
+    print("   - GET /api/upstream/status  : Upstream devre kesici durumu")
+    print("   - GET /api/admission/stats  : Yük atma (eşzamanlılık/kuyruk) istatistikleri")
+    print("   - GET /metrics              : Prometheus metrikleri")
+    print(f"🌐 Server: http://localhost:{args.port}")
+
+    if args.production:
+        print(f"⚙️  Production modu: {args.workers} worker x {args.threads} thread")
+        run_production(args.host, args.port, args.workers, args.threads)
+    else:
+        app.run(
+            host=args.host,
+            port=args.port,
+            debug=True
+        )
@@ -1,6 +1,203 @@
-def search_jobs(keywords, location, locale="en_US", affid="213e213hd12344552", user_ip="127.0.0.1", user_agent="Mozilla/5.0", url="http://example.com", **kwargs):
+import asyncio
+import functools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from cache import SingleFlight, TTLCache, make_search_key
+from demo_corpus import JobCorpus
+from details import DEFAULT_ALLOWED_HOSTS, DetailsEngine
+from job_identity import job_content_key, job_id, normalize_job_url
+from job_index import get_job_index
+from metrics import demo_fallback_rate, registry as metrics_registry, search_paths, stage, upstream_responses
+from saved_searches import SavedSearchScheduler, get_saved_searches, job_fingerprint, next_check_time
+from shared_state import get_shared_state
+from upstream import TokenBucket, UpstreamScheduler, breaker as upstream_breaker, registry as upstream_registry
+
+# CAREER_UPSTREAM_API_URL points searches at another endpoint (e.g. the
+# benchmark stand-in server); the official client is skipped in that case
+CAREERJET_DIRECT_API_URL = os.environ.get("CAREER_UPSTREAM_API_URL") or "https://api.careerjet.com/jobs"
+USE_OFFICIAL_CLIENT = not os.environ.get("CAREER_UPSTREAM_API_URL")
+
+# Upstream parameters that take part in the cache key
+SEARCH_PARAM_KEYS = ['sort', 'start_num', 'pagesize', 'page', 'contracttype', 'contractperiod', 'salary']
+
+# Shared response cache for search_jobs (used by both server.py and api_server.py).
+# A 100-job page is estimated at 150-550 KB depending on description length, so
+# the entry limit alone would allow over 500 MB; the byte budget caps it
+search_cache = TTLCache(
+    ttl=float(os.environ.get("CAREER_CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("CAREER_CACHE_MAX_ENTRIES", "1024")),
+    stale_ttl=float(os.environ.get("CAREER_CACHE_STALE_TTL", "600")),
+    max_bytes=int(os.environ.get("CAREER_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+
+
+# Upstream rate limit in searches per second (0 = unlimited). With shared state
+# enabled the budget is shared by all worker processes on the host.
+UPSTREAM_RATE = float(os.environ.get("CAREER_UPSTREAM_RATE", "0"))
+UPSTREAM_BURST = float(os.environ.get("CAREER_UPSTREAM_BURST", str(max(1.0, UPSTREAM_RATE))))
+UPSTREAM_RATE_MAX_WAIT = float(os.environ.get("CAREER_UPSTREAM_RATE_MAX_WAIT", "5"))
+upstream_bucket = TokenBucket(UPSTREAM_RATE, UPSTREAM_BURST) if UPSTREAM_RATE > 0 else None
+
+# Upstream calls allowed per affiliate ID per day (0 = unlimited)
+AFFID_DAILY_QUOTA = int(os.environ.get("CAREER_AFFID_DAILY_QUOTA", "0"))
+
+
+def _take_upstream_token():
+    # The cross-process bucket in shared state wins over the in-process one
+    shared = get_shared_state()
+    if shared is not None:
+        return shared.take_token("upstream", UPSTREAM_RATE, UPSTREAM_BURST)
+    return upstream_bucket.take_token()
+
+
+def _consume_affid_quota(affid, quota, period):
+    shared = get_shared_state()
+    if shared is None:
+        return None
+    return shared.consume_quota(f"affid:{affid}", quota, period)
+
+
+def _refund_affid_quota(affid, period):
+    shared = get_shared_state()
+    if shared is not None:
+        shared.refund_quota(f"affid:{affid}", period)
+
+
+# Which client served each upstream call; "direct_api_fallback" means the official client failed
+upstream_routes = metrics_registry.counter(
+    "career_upstream_route_total", "Upstream calls by the client that made them", labels=("route",))
+
+# Every upstream call waits here; interactive searches are served before
+# agent (MCP) searches, and both before background cache refreshes
+upstream_scheduler = UpstreamScheduler(
+    take_token=_take_upstream_token if upstream_bucket is not None else None,
+    max_wait=UPSTREAM_RATE_MAX_WAIT,
+    quota=AFFID_DAILY_QUOTA,
+    consume_quota=_consume_affid_quota,
+    refund_quota=_refund_affid_quota,
+)
+
+# Cache and upstream state, read when metrics are scraped
+metrics_registry.gauge("career_cache_entries", "Entries in the in-process search cache",
+                       lambda: len(search_cache))
+metrics_registry.gauge("career_cache_bytes", "Estimated size of the in-process search cache",
+                       lambda: search_cache.bytes)
+metrics_registry.callback_counter("career_cache_lookups_total", "Search cache lookups by result", lambda: {
+    (result,): search_cache.stats()[result] for result in ("hits", "stale_hits", "misses")
+}, labels=("result",))
+metrics_registry.gauge("career_upstream_circuit_open", "1 while the upstream circuit breaker is open",
+                       lambda: int(upstream_breaker.state == upstream_breaker.OPEN))
+metrics_registry.gauge("career_upstream_timeout_seconds", "Current adaptive upstream timeout",
+                       upstream_breaker.timeout)
+
+
+def _details_allowed_hosts():
+    value = os.environ.get("CAREER_DETAILS_ALLOWED_HOSTS")
+    if not value:
+        return DEFAULT_ALLOWED_HOSTS
+    if value.strip() == "*":
+        return None
+    return tuple(host.strip().lower() for host in value.split(",") if host.strip())
+
+
+# Parsed job pages; stale entries are revalidated with ETag/Last-Modified.
+# Only pages on allowed hosts that resolve to public addresses are fetched
+details_engine = DetailsEngine(
+    ttl=float(os.environ.get("CAREER_DETAILS_TTL", "3600")),
+    max_entries=int(os.environ.get("CAREER_DETAILS_MAX_ENTRIES", "2048")),
+    max_workers=int(os.environ.get("CAREER_DETAILS_WORKERS", "4")),
+    timeout=float(os.environ.get("CAREER_DETAILS_TIMEOUT", "10")),
+    allowed_hosts=_details_allowed_hosts(),
+    allow_private=os.environ.get("CAREER_DETAILS_ALLOW_PRIVATE") == "1",
+    max_bytes=int(os.environ.get("CAREER_DETAILS_MAX_BYTES", "2000000")),
+)
+
+# Upper bound for one prefetch request
+MAX_PREFETCH = int(os.environ.get("CAREER_MAX_PREFETCH", "20"))
+
+# Careerjet returns at most 100 jobs per page
+MAX_PAGESIZE = 100
+
+# Demo posting dates are up to 30 days before today; CAREER_DEMO_REFERENCE_DATE
+# pins the day, so demo output (and its ETags) stays the same across days
+DEMO_REFERENCE_DATE = (date.fromisoformat(os.environ["CAREER_DEMO_REFERENCE_DATE"])
+                       if os.environ.get("CAREER_DEMO_REFERENCE_DATE") else None)
+
+# Offline fallback data; CAREER_DEMO_SEED picks another reproducible corpus
+demo_corpus = JobCorpus(
+    seed=int(os.environ.get("CAREER_DEMO_SEED", "0")),
+    size=int(os.environ.get("CAREER_DEMO_CORPUS_SIZE", "60")),
+    reference_date=DEMO_REFERENCE_DATE,
+)
+
+# Demo jobs per page when the caller does not set pagesize
+DEMO_PAGESIZE = 6
+
+# Upper bound for search_all_pages, so one call cannot drain the API quota
+MAX_ALL_PAGES_RESULTS = int(os.environ.get("CAREER_MAX_ALL_PAGES_RESULTS", "1000"))
+
+# Maximum number of queries accepted by search_jobs_batch
+MAX_BATCH_QUERIES = int(os.environ.get("CAREER_MAX_BATCH_QUERIES", "20"))
+
+# Federated searches: at most this many locales per call, each given
+# CAREER_FEDERATED_TIMEOUT seconds before the merge goes ahead without it
+MAX_FEDERATED_LOCALES = int(os.environ.get("CAREER_MAX_FEDERATED_LOCALES", "8"))
+FEDERATED_TIMEOUT = float(os.environ.get("CAREER_FEDERATED_TIMEOUT", "5"))
+
+# Merged ranking: reciprocal rank constant and the half-life (days) of the date score
+FEDERATED_RANK_K = 10
+FEDERATED_DATE_HALF_LIFE = float(os.environ.get("CAREER_FEDERATED_DATE_HALF_LIFE", "7"))
+
+# Collapses concurrent identical upstream searches into a single call
+search_flight = SingleFlight()
+
+# Bounded pool that runs blocking upstream calls for async callers (FastMCP tools)
+async_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CAREER_ASYNC_WORKERS", "8")),
+    thread_name_prefix="careerjet-async",
+)
+
+
+# Runs the per-locale searches of federated searches. Locale searches that
+# miss the deadline keep running here and still fill the cache for the next call.
+federated_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CAREER_FEDERATED_WORKERS", "16")),
+    thread_name_prefix="careerjet-federated",
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function on the bounded async executor without blocking the event loop.
+
+    Args:
+        func (callable): Blocking function to run
+        *args, **kwargs: Arguments passed to ``func``
+
+    Returns:
+        Whatever ``func`` returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(async_executor, functools.partial(func, *args, **kwargs))
+
+
+def is_cacheable_result(result):
+    """Only fresh upstream results are cached; errors, demo, indexed and stale data are not."""
+    return (isinstance(result, dict) and 'error' not in result
+            and result.get('type') != 'demo' and 'source' not in result)
+
+
+def search_jobs(keywords, location, locale="en_US", affid="213e213hd12344552", user_ip="127.0.0.1", user_agent="Mozilla/5.0", url="http://example.com", use_cache=True, priority="interactive", **kwargs):
     """
-    Search for jobs using Careerjet API.
+    Search for jobs using Careerjet API, served from the shared response cache when possible.
+
+    Concurrent identical searches that miss the cache share one upstream call.
 
     Args:
         keywords (str): Keywords to match job titles, content or company names
@@ -10,18 +207,668 @@ def search_jobs(keywords, location, locale="en_US", affid="213e213hd12344552", u
         user_ip (str): IP address of the end-user
         user_agent (str): User agent of the end-user's browser
         url (str): URL of page that will display the search results
+        use_cache (bool): Set to False to bypass the response cache
+        priority (str): Upstream scheduling class: "interactive" (API users),
+            "agent" (MCP tools) or "background"; stale cache refreshes always
+            run as "background"
         **kwargs: Additional search parameters (sort, start_num, pagesize, etc.)
 
     Returns:
         dict: Search results from Careerjet API
     """
+    params = {key: kwargs.get(key) for key in SEARCH_PARAM_KEYS}
+    key = make_search_key(keywords, location, locale, affid, params)
+    shared = get_shared_state() if use_cache else None
+
+    def fetch(fetch_priority=priority):
+        if shared is not None:
+            # Another worker process may already have fetched this search
+            with stage("shared_cache"):
+                cached = shared.cache_get(key)
+            if cached is not None:
+                search_paths.inc("shared_cache")
+                return cached
+
+        result = search_jobs_uncached(keywords, location, locale, affid, user_ip, user_agent, url,
+                                      priority=fetch_priority, **kwargs)
+        if result.get('type') == 'demo' or result.get('status_code') in (429, 503):
+            # Upstream is unreachable, tripped or over budget: serve the last good
+            # answer for this search, then real listings from the local index
+            last_good = search_cache.peek(key)
+            if last_good is not None:
+                search_paths.inc("stale_cache")
+                return dict(last_good, source='stale_cache')
+            with stage("local_index"):
+                indexed = search_jobs_local(keywords, location, locale=locale,
+                                            page=kwargs.get('page') or 1, pagesize=kwargs.get('pagesize') or 20)
+            if indexed.get('jobs'):
+                search_paths.inc("local_index")
+                return indexed
+            if result.get('circuit_open'):
+                result = create_demo_response(keywords, location, kwargs.get('page'), kwargs.get('pagesize'))
+        elif is_cacheable_result(result):
+            with stage("index_ingest"):
+                index_jobs(result.get('jobs', []), locale)
+            if shared is not None:
+                shared.cache_set(key, result, search_cache.ttl)
+
+        if result.get('type') == 'demo':
+            search_paths.inc("demo")
+        elif result.get('status_code') == 429:
+            search_paths.inc("rate_limited")
+        elif 'error' in result:
+            search_paths.inc("error")
+        else:
+            search_paths.inc("upstream")
+        return result
+
+    with stage("search"):
+        if not use_cache:
+            return fetch()
+
+        def load():
+            return search_flight.do(key, fetch)
+
+        def refresh():
+            return search_flight.do(key, functools.partial(fetch, "background"))
+
+        return search_cache.get_or_load(key, load, cacheable=is_cacheable_result, refresh_loader=refresh)
+
+
+def search_jobs_cached(keywords, location, locale="en_US", affid="213e213hd12344552", **kwargs):
+    """
+    Answer a search only from data this server already holds, never calling upstream.
+
+    Tries the response cache (expired entries included), the cross-worker
+    shared cache and the local job index, in that order. Used to keep
+    answering while the HTTP API sheds load.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        locale (str): Locale code (default: en_US)
+        affid (str): Affiliate ID the search is keyed by
+        **kwargs: Same search parameters as search_jobs (other keys are ignored)
+
+    Returns:
+        dict: Results with "source" set to "cache", "shared_cache" or "index",
+            or None when nothing is held for this search
+    """
+    params = {key: kwargs.get(key) for key in SEARCH_PARAM_KEYS}
+    key = make_search_key(keywords, location, locale, affid, params)
+    with stage("search_cached"):
+        cached = search_cache.peek(key)
+        if cached is not None:
+            return dict(cached, source='cache')
+        shared = get_shared_state()
+        if shared is not None:
+            cached = shared.cache_get(key)
+            if cached is not None:
+                return dict(cached, source='shared_cache')
+        indexed = search_jobs_local(keywords, location, locale=locale,
+                                    page=kwargs.get('page') or 1, pagesize=kwargs.get('pagesize') or 20)
+    if indexed.get('jobs'):
+        return indexed
+    return None
+
+
+async def search_jobs_async(keywords, location, **kwargs):
+    """
+    Async variant of search_jobs for event-loop callers.
+
+    The blocking search runs on the bounded executor, so concurrent calls
+    overlap instead of queueing on the event loop.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        **kwargs: Same keyword arguments as search_jobs
+
+    Returns:
+        dict: Search results from Careerjet API
+    """
+    return await run_blocking(search_jobs, keywords, location, **kwargs)
+
+
+class JobDeduplicator:
+    """
+    Incremental duplicate filter for job postings.
+
+    A job is a duplicate when its stable ID (normalized URL) or its content
+    key (title, company, location) was already seen. Keep one instance
+    across pages, locales or queries to deduplicate a whole result stream.
+    """
+
+    def __init__(self):
+        self._ids = set()
+        self._content_keys = set()
+        self.dropped = 0
+
+    def add(self, job):
+        """Return True if ``job`` is new, False if it is a duplicate."""
+        identifier = job_id(job)
+        content_key = job_content_key(job)
+        if identifier in self._ids or (content_key is not None and content_key in self._content_keys):
+            self.dropped += 1
+            return False
+        self._ids.add(identifier)
+        if content_key is not None:
+            self._content_keys.add(content_key)
+        return True
+
+
+def dedupe_jobs(jobs):
+    """
+    Drop duplicate job postings, keeping the first occurrence.
+
+    Duplicates are detected by normalized URL and by title/company/location,
+    so the same posting is dropped across pages, locales and batched queries.
+
+    Args:
+        jobs (list): Job dicts as returned by the upstream API
+
+    Returns:
+        list: Jobs without duplicates, in original order
+    """
+    deduplicator = JobDeduplicator()
+    return [job for job in jobs if deduplicator.add(job)]
+
+
+def search_all_pages(keywords, location, target_count=100, pagesize=50, max_concurrency=4, **kwargs):
+    """
+    Fetch enough result pages to collect ``target_count`` jobs in one call.
+
+    The first page is fetched to learn the upstream ``hits``/``pages``; the
+    remaining pages are then requested concurrently (at most
+    ``max_concurrency`` at a time). Pages beyond the available hits are
+    never requested.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        target_count (int): Number of jobs wanted (capped at MAX_ALL_PAGES_RESULTS)
+        pagesize (int): Jobs per upstream page (capped at MAX_PAGESIZE)
+        max_concurrency (int): Maximum number of concurrent page requests
+        **kwargs: Same keyword arguments as search_jobs (locale, affid, sort, ...)
+
+    Returns:
+        dict: Merged, deduplicated search results
+    """
+    target_count = max(1, min(int(target_count), MAX_ALL_PAGES_RESULTS))
+    pagesize = max(1, min(int(pagesize), MAX_PAGESIZE))
+    max_concurrency = max(1, int(max_concurrency))
+    kwargs.pop('page', None)
+    kwargs.pop('start_num', None)
+
+    def fetch_page(page):
+        return search_jobs(keywords, location, page=page, pagesize=pagesize, **kwargs)
+
+    first = fetch_page(1)
+    if 'error' in first or first.get('type') == 'demo':
+        return first
+
+    first_jobs = first.get('jobs', [])
+    hits = int(first.get('hits', len(first_jobs)) or 0)
+    last_page = -(-min(target_count, hits) // pagesize)
+    if first.get('pages'):
+        last_page = min(last_page, int(first['pages']))
+
+    pages = {1: first}
+    if last_page > 1 and first_jobs:
+        remaining = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(remaining))) as executor:
+            for page, result in zip(remaining, executor.map(fetch_page, remaining)):
+                pages[page] = result
+
+    jobs = []
+    page_errors = []
+    for page in sorted(pages):
+        result = pages[page]
+        if 'error' in result:
+            page_errors.append({'page': page, 'error': result['error']})
+            continue
+        page_jobs = result.get('jobs', [])
+        if not page_jobs:
+            break
+        jobs.extend(page_jobs)
+
+    jobs = dedupe_jobs(jobs)[:target_count]
+    merged = {
+        'type': first.get('type', 'JOBS'),
+        'hits': hits,
+        'pages': first.get('pages'),
+        'pages_fetched': len(pages),
+        'jobs': jobs,
+        'total_jobs': len(jobs),
+    }
+    if page_errors:
+        merged['page_errors'] = page_errors
+    return merged
+
+
+def search_jobs_batch(queries, max_concurrency=4, **defaults):
+    """
+    Run several searches concurrently and return per-query and merged results.
+
+    Args:
+        queries (list): Query dicts with "keywords" and "location" and any of
+            "locale", "sort", "pagesize", "page", "contracttype", "contractperiod"
+        max_concurrency (int): Maximum number of concurrent upstream searches
+        **defaults: Keyword arguments applied to every query unless the query
+            overrides them (locale, affid, user_ip, user_agent, url, ...)
+
+    Returns:
+        dict: {"results": [{"query", "result"}, ...], "merged": {"jobs", "total_jobs"}}
+    """
+    queries = list(queries or [])[:MAX_BATCH_QUERIES]
+    max_concurrency = max(1, int(max_concurrency))
+
+    def run(query):
+        if not isinstance(query, dict):
+            return {"error": "Each query must be an object"}
+        keywords = str(query.get('keywords') or '').strip()
+        location = str(query.get('location') or '').strip()
+        if not keywords or not location:
+            return {"error": "Each query requires keywords and location"}
+        params = dict(defaults)
+        for key in ['locale'] + SEARCH_PARAM_KEYS:
+            if query.get(key) is not None:
+                params[key] = query[key]
+        return search_jobs(keywords, location, **params)
+
+    if queries:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(queries))) as executor:
+            results = list(executor.map(run, queries))
+    else:
+        results = []
+
+    merged_jobs = dedupe_jobs(
+        job for result in results if 'error' not in result for job in result.get('jobs', [])
+    )
+    return {
+        'results': [{'query': query, 'result': result} for query, result in zip(queries, results)],
+        'merged': {
+            'jobs': merged_jobs,
+            'total_jobs': len(merged_jobs),
+        },
+    }
+
+
+LOCALE_PATTERN = re.compile(r"^[a-z]{2}_[A-Z]{2}$")
+
+
+def parse_job_date(value):
+    """
+    Parse the posting date of a job (ISO 8601 or RFC 2822, as sent by Careerjet).
+
+    Returns:
+        date: The posting date, or None if it cannot be parsed
+    """
+    if not value or not isinstance(value, str):
+        return None
     try:
-        # First try the official client
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).date()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def rank_federated_jobs(ranked_lists, date_weight=0.3, today=None):
+    """
+    Merge per-locale result lists into one deduplicated list ranked by relevance and date.
+
+    Relevance is reciprocal rank fusion: a job at position ``r`` of a locale's
+    list scores ``(k + 1) / (k + 1 + r)``, summed over the locales that
+    returned it, so a posting found in several locales ranks higher. The date
+    score halves every CAREER_FEDERATED_DATE_HALF_LIFE days; undated jobs
+    score 0. Duplicates are detected like JobDeduplicator does (normalized
+    URL, then title/company/location).
+
+    Args:
+        ranked_lists (list): (locale, jobs) pairs, each list in upstream order
+        date_weight (float): Share of the date score in the final score (0-1)
+        today (date): Reference date for the date score (default: today, UTC)
+
+    Returns:
+        list: Jobs with a "locales" list, best first
+    """
+    today = today or datetime.now(timezone.utc).date()
+    date_weight = min(1.0, max(0.0, float(date_weight)))
+    entries = []
+    by_key = {}
+    for locale, jobs in ranked_lists:
+        for rank, job in enumerate(jobs):
+            relevance = (FEDERATED_RANK_K + 1) / (FEDERATED_RANK_K + 1 + rank)
+            content_key = job_content_key(job)
+            keys = [('id', job_id(job))] + ([('content', content_key)] if content_key is not None else [])
+            entry = next((by_key[key] for key in keys if key in by_key), None)
+            if entry is None:
+                entry = {'job': job, 'locales': [locale], 'relevance': 0.0}
+                entries.append(entry)
+            elif locale not in entry['locales']:
+                entry['locales'].append(locale)
+            entry['relevance'] += relevance
+            for key in keys:
+                by_key.setdefault(key, entry)
+
+    if not entries:
+        return []
+    top_relevance = max(entry['relevance'] for entry in entries)
+    for position, entry in enumerate(entries):
+        posted = parse_job_date(entry['job'].get('date'))
+        recency = 0.5 ** (max(0, (today - posted).days) / FEDERATED_DATE_HALF_LIFE) if posted else 0.0
+        entry['score'] = (1 - date_weight) * entry['relevance'] / top_relevance + date_weight * recency
+        entry['position'] = position
+    # Ties keep the order the locales were given in
+    entries.sort(key=lambda entry: (-entry['score'], entry['position']))
+    return [dict(entry['job'], locales=entry['locales']) for entry in entries]
+
+
+def search_jobs_federated(keywords, location, locales, timeout=None, date_weight=None, **kwargs):
+    """
+    Run one search in several locales at once and merge the results.
+
+    All locales are searched concurrently through search_jobs (cache,
+    request coalescing and the upstream scheduler apply per locale). Locales
+    that do not answer within ``timeout`` seconds are reported as "timeout"
+    and left out, so one slow locale never holds up the others; their
+    searches finish in the background and are cached for the next call.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        locales (list): Locale codes, e.g. ["tr_TR", "en_GB", "de_DE"], or a
+            comma separated string (at most MAX_FEDERATED_LOCALES)
+        timeout (float): Seconds to wait for the locales (default: CAREER_FEDERATED_TIMEOUT)
+        date_weight (float): Share of recency in the ranking, 0-1 (default:
+            0.3, or 1.0 when ``sort`` is "date")
+        **kwargs: Same keyword arguments as search_jobs except locale (sort, pagesize, priority, ...)
+
+    Returns:
+        dict: {"jobs" (merged, ranked, each with "locales"), "total_jobs", "hits",
+            "locales" (status, hits, jobs and seconds per locale), "partial"} or an error
+    """
+    if isinstance(locales, str):
+        locales = locales.split(',')
+    locales = list(dict.fromkeys(str(locale).strip() for locale in locales or [] if str(locale).strip()))
+    if not locales:
+        return {"error": "At least one locale is required"}
+    if len(locales) > MAX_FEDERATED_LOCALES:
+        return {"error": f"Too many locales (max {MAX_FEDERATED_LOCALES})"}
+    invalid = [locale for locale in locales if not LOCALE_PATTERN.match(locale)]
+    if invalid:
+        return {"error": f"Invalid locale codes: {', '.join(invalid)} (expected e.g. tr_TR)"}
+    try:
+        timeout = FEDERATED_TIMEOUT if timeout is None else max(0.0, float(timeout))
+        if date_weight is None:
+            date_weight = 1.0 if kwargs.get('sort') == 'date' else 0.3
+        date_weight = float(date_weight)
+    except (TypeError, ValueError):
+        return {"error": "timeout and date_weight must be numbers"}
+    kwargs.pop('locale', None)
+
+    def run(locale):
+        started = time.perf_counter()
+        result = search_jobs(keywords, location, locale=locale, **kwargs)
+        return result, time.perf_counter() - started
+
+    with stage("federated_search"):
+        futures = {locale: federated_executor.submit(run, locale) for locale in locales}
+        wait_futures(futures.values(), timeout=timeout)
+
+    statuses = {}
+    ranked_lists = []
+    demo = None
+    for locale, future in futures.items():
+        if not future.done():
+            statuses[locale] = {'status': 'timeout'}
+            continue
         try:
-            from careerjet_api_client import CareerjetAPIClient
+            result, seconds = future.result()
+        except Exception as e:
+            statuses[locale] = {'status': 'error', 'error': str(e)}
+            continue
+        status = {'seconds': round(seconds, 3)}
+        if 'error' in result:
+            status.update(status='error', error=result['error'])
+        elif result.get('type') == 'demo':
+            status.update(status='demo', jobs=len(result.get('jobs', [])))
+            demo = demo or result
+        else:
+            status.update(status='ok', hits=result.get('hits', 0), jobs=len(result.get('jobs', [])))
+            if result.get('source'):
+                status['source'] = result['source']
+            ranked_lists.append((locale, result.get('jobs', [])))
+        statuses[locale] = status
+
+    merged = {
+        'type': 'JOBS',
+        'locales': statuses,
+        'partial': any(status['status'] != 'ok' for status in statuses.values()),
+    }
+    if not ranked_lists and demo is not None:
+        # No locale returned live listings; keep the offline fallback usable
+        jobs = demo.get('jobs', [])
+        merged.update(type='demo', message=demo.get('message'))
+    else:
+        with stage("federated_merge"):
+            jobs = rank_federated_jobs(ranked_lists, date_weight)
+    merged.update(
+        jobs=jobs,
+        total_jobs=len(jobs),
+        hits=sum(status.get('hits') or 0 for status in statuses.values()),
+    )
+    return merged
+
+
+def index_jobs(jobs, locale=None):
+    """
+    Add upstream listings to the local job index (no-op when the index is disabled).
+
+    Args:
+        jobs (list): Job dicts as returned by the Careerjet API
+        locale (str): Locale the jobs were fetched for
+
+    Returns:
+        int: Number of listings written
+    """
+    index = get_job_index()
+    if index is None or not jobs:
+        return 0
+    try:
+        return index.ingest(jobs, locale)
+    except Exception:
+        # The index is an optimization; never fail a search because of it
+        return 0
+
+
+def search_jobs_local(keywords, location=None, locale=None, page=1, pagesize=20):
+    """
+    Search previously seen listings in the local full-text index, without calling upstream.
+
+    Args:
+        keywords (str): Keywords to match job titles, companies, descriptions or locations
+        location (str): Optional location filter
+        locale (str): Optional locale filter
+        page (int): Page number (>= 1)
+        pagesize (int): Number of jobs per page
+
+    Returns:
+        dict: Careerjet-shaped results with "source": "index", or an error
+    """
+    index = get_job_index()
+    if index is None:
+        return {"error": "Local job index is disabled"}
+    try:
+        return index.search(keywords, location, locale=locale, page=page, pagesize=pagesize)
+    except Exception as e:
+        return {"error": f"Failed to search local job index: {str(e)}"}
+
+
+def get_index_stats():
+    """
+    Return size and retention settings of the local job index.
+
+    Returns:
+        dict: Index statistics, or {"enabled": False} when disabled
+    """
+    index = get_job_index()
+    if index is None:
+        return {"enabled": False}
+    return dict(index.stats(), enabled=True)
 
-            # Initialize Careerjet API client
-            cj = CareerjetAPIClient(locale)
+
+def warm_up(locales=None, connect_timeout=2.0):
+    """
+    Pay the one-off costs of the first search ahead of time.
+
+    Imports ``requests``, loads the official client for each locale (or
+    records that it is unavailable), opens the local job index and shared
+    state, and opens a pooled keep-alive connection to the upstream host
+    with a HEAD request. Failures are ignored; the first search then simply
+    pays the remaining cost itself.
+
+    Args:
+        locales (list): Locales to load the official client for
+            (default: CAREER_WARMUP_LOCALES, comma separated, or en_US)
+        connect_timeout (float): Timeout of the pre-connect request in seconds
+
+    Returns:
+        dict: Seconds spent in each warm-up step
+    """
+    if locales is None:
+        locales = [locale.strip() for locale in os.environ.get("CAREER_WARMUP_LOCALES", "en_US").split(",") if locale.strip()]
+
+    timings = {}
+
+    def step(name, func):
+        started = time.perf_counter()
+        try:
+            with stage("warm_up_" + name):
+                func()
+        except Exception:
+            pass
+        timings[name] = round(time.perf_counter() - started, 4)
+
+    def load_clients():
+        if USE_OFFICIAL_CLIENT:
+            for locale in locales:
+                upstream_registry.careerjet_client(locale)
+
+    def connect():
+        upstream_registry.session_for(CAREERJET_DIRECT_API_URL).head(CAREERJET_DIRECT_API_URL, timeout=connect_timeout)
+
+    step("import_requests", lambda: __import__("requests"))
+    step("careerjet_client", load_clients)
+    step("job_index", get_job_index)
+    step("shared_state", get_shared_state)
+    step("upstream_connection", connect)
+    return timings
+
+
+def get_upstream_status():
+    """
+    Return the upstream circuit breaker, scheduler and connection pool state for monitoring.
+
+    Returns:
+        dict: {"breaker": {...}, "scheduler": {...}, "pool": {...}}
+    """
+    return {
+        "breaker": upstream_breaker.stats(),
+        "scheduler": upstream_scheduler.stats(),
+        "pool": upstream_registry.stats(),
+    }
+
+
+def get_metrics():
+    """
+    Return per-stage latency histograms and search counters as a dict.
+
+    The same data is exported in Prometheus text format by the HTTP API's
+    /metrics endpoint.
+
+    Returns:
+        dict: {"metrics": {...}, "demo_fallback_rate": float}
+    """
+    return {
+        "metrics": metrics_registry.snapshot(),
+        "demo_fallback_rate": demo_fallback_rate(),
+    }
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters of the search response cache.
+
+    Returns:
+        dict: Cache statistics, with request coalescing counters under "coalescing"
+    """
+    stats = search_cache.stats()
+    stats["coalescing"] = search_flight.stats()
+    stats["details"] = details_engine.stats()
+    shared = get_shared_state()
+    if shared is not None:
+        stats["shared"] = shared.stats()
+    return stats
+
+
+def search_jobs_uncached(keywords, location, locale="en_US", affid="213e213hd12344552", user_ip="127.0.0.1", user_agent="Mozilla/5.0", url="http://example.com", priority="interactive", **kwargs):
+    """
+    Search for jobs using Careerjet API, always going to upstream.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        locale (str): Locale code (default: en_US)
+        affid (str): Affiliate ID (required by Careerjet)
+        user_ip (str): IP address of the end-user
+        user_agent (str): User agent of the end-user's browser
+        url (str): URL of page that will display the search results
+        priority (str): Upstream scheduling class ("interactive", "agent" or "background")
+        **kwargs: Additional search parameters (sort, start_num, pagesize, etc.)
+
+    Returns:
+        dict: Search results from Careerjet API
+    """
+    if not upstream_breaker.allow():
+        # Circuit is open: fail fast instead of waiting for a timeout
+        return {
+            "error": "Upstream temporarily unavailable",
+            "message": "The Careerjet API is failing, searches are paused briefly",
+            "status_code": 503,
+            "circuit_open": True
+        }
+
+    try:
+        slot = upstream_scheduler.acquire(priority, affid)
+        if slot == UpstreamScheduler.QUOTA_EXCEEDED:
+            return {
+                "error": "Upstream quota exceeded",
+                "message": "This affiliate ID has used its upstream search quota for today",
+                "status_code": 429
+            }
+        if slot != UpstreamScheduler.GRANTED:
+            return {
+                "error": "Upstream rate limit exceeded",
+                "message": "Too many searches are waiting for the Careerjet API, try again shortly",
+                "status_code": 429
+            }
+
+        # The official client cannot take a timeout, so probes and calls
+        # while upstream is failing go through the direct API, which uses
+        # the breaker's adaptive timeout
+        if not USE_OFFICIAL_CLIENT or upstream_breaker.degraded():
+            upstream_routes.inc("direct_api")
+            return search_jobs_direct_api(keywords, location, locale, affid, user_ip, user_agent, url, **kwargs)
+
+        # First try the official client
+        try:
+            # Reuse the long-lived Careerjet API client for this locale
+            with stage("client_import"):
+                cj = upstream_registry.careerjet_client(locale)
 
             # Prepare search parameters
             search_params = {
@@ -39,15 +886,25 @@ def search_jobs(keywords, location, locale="en_US", affid="213e213hd12344552", u
                     search_params[key] = value
 
             # Perform search
-            result = cj.search(search_params)
+            started = time.perf_counter()
+            with stage("official_client"):
+                result = cj.search(search_params)
+            upstream_breaker.record(True, time.perf_counter() - started)
+            upstream_routes.inc("official_client")
+            upstream_responses.inc("200")
             return result
 
         except Exception as client_error:
             # Fallback to direct HTTP API call
+            upstream_routes.inc("direct_api_fallback")
             return search_jobs_direct_api(keywords, location, locale, affid, user_ip, user_agent, url, **kwargs)
 
     except Exception as e:
         return {"error": f"Failed to search jobs: {str(e)}"}
+    finally:
+        # A half-open probe that ended without record() (rate limited or an
+        # unexpected exception) must not leave the breaker stuck
+        upstream_breaker.release()
 
 
 def search_jobs_direct_api(keywords, location, locale="en_US", affid="213e213hd12344552", user_ip="127.0.0.1", user_agent="Mozilla/5.0", url="http://example.com", **kwargs):
@@ -57,7 +914,7 @@ def search_jobs_direct_api(keywords, location, locale="en_US", affid="213e213hd1
     import requests
 
     # Use the official API endpoint
-    api_url = "https://api.careerjet.com/jobs"
+    api_url = CAREERJET_DIRECT_API_URL
 
     # Prepare parameters for the API
     params = {
@@ -68,7 +925,7 @@ def search_jobs_direct_api(keywords, location, locale="en_US", affid="213e213hd1
 
     # Add optional parameters
     for key, value in kwargs.items():
-        if key in ['contracttype', 'salary', 'page'] and value is not None:
+        if key in SEARCH_PARAM_KEYS and value is not None:
             params[key] = value
 
     try:
@@ -78,18 +935,31 @@ def search_jobs_direct_api(keywords, location, locale="en_US", affid="213e213hd1
             'Accept': 'application/json'
         }
 
-        response = requests.get(api_url, params=params, headers=headers, timeout=10)
+        # Timeout follows the observed upstream p99 instead of a fixed 10s
+        started = time.perf_counter()
+        session = upstream_registry.session_for(api_url)
+        with stage("direct_api"):
+            response = session.get(api_url, params=params, headers=headers, timeout=upstream_breaker.timeout())
+        latency = time.perf_counter() - started
+        upstream_responses.inc(str(response.status_code))
 
         if response.status_code == 200:
             try:
-                return response.json()
+                with stage("json_decode"):
+                    result = response.json()
+                upstream_breaker.record(True, latency)
+                return result
             except ValueError:
+                upstream_breaker.record(False, latency)
                 # If JSON parsing fails, return the text response
                 return {
                     "error": "Invalid JSON response",
                     "raw_response": response.text[:500]
                 }
-        elif response.status_code == 401:
+
+        # Client errors mean upstream is healthy; only 5xx count as failures
+        upstream_breaker.record(response.status_code < 500, latency)
+        if response.status_code == 401:
             return {
                 "error": "Authentication failed - Invalid API key",
                 "message": "You need a valid Careerjet API key. Get one from https://www.careerjet.com/partners/api/",
@@ -99,88 +969,35 @@ def search_jobs_direct_api(keywords, location, locale="en_US", affid="213e213hd1
             return {
                 "error": f"API request failed with status {response.status_code}",
                 "message": response.text[:200] if response.text else "No response content",
-                "url": response.url
+                "url": response.url,
+                "status_code": response.status_code
             }
 
     except requests.exceptions.RequestException as e:
+        upstream_breaker.record(False, time.perf_counter() - started)
+        upstream_responses.inc(type(e).__name__)
         # If API fails, provide a demo response for testing
-        return create_demo_response(keywords, location)
+        return create_demo_response(keywords, location, kwargs.get('page'), kwargs.get('pagesize'))
 
 
-def create_demo_response(keywords, location):
+def create_demo_response(keywords, location, page=1, pagesize=None):
     """
     Create an enhanced demo response for testing when API is not available.
-    """
-    import random
-    from datetime import datetime, timedelta
-
-    # Enhanced company list
-    companies = [
-        "Tech Innovations A.Ş.", "Dijital Çözümler Ltd.", "Yazılım Geliştirme A.Ş.",
-        "Teknoloji Merkezi", "İnovasyon Hub", "Startup Accelerator",
-        "Global Tech Solutions", "Akıllı Sistemler A.Ş.", "Veri Analitik Ltd.",
-        "Mobil Uygulama Stüdyosu", "E-Ticaret Platformu", "Fintech Startup",
-        "Bulut Teknolojileri A.Ş.", "AI Research Lab", "Blockchain Solutions"
-    ]
-
-    # Job types and experience levels
-    job_types = ["Senior", "Mid-Level", "Junior", "Lead", "Principal"]
-    work_types = ["Tam Zamanlı", "Yarı Zamanlı", "Freelance", "Remote", "Hibrit"]
-
-    # Skill sets based on keywords
-    skill_sets = {
-        "developer": ["React", "JavaScript", "TypeScript", "Node.js", "Python", "Git", "Docker"],
-        "frontend": ["React", "Vue.js", "Angular", "HTML", "CSS", "JavaScript", "Webpack"],
-        "backend": ["Node.js", "Python", "Java", "C#", "PostgreSQL", "MongoDB", "Redis"],
-        "mobile": ["React Native", "Flutter", "Swift", "Kotlin", "iOS", "Android"],
-        "data": ["Python", "R", "SQL", "Machine Learning", "TensorFlow", "Pandas"],
-        "devops": ["Docker", "Kubernetes", "AWS", "Jenkins", "Terraform", "Linux"]
-    }
 
-    # Determine relevant skills
-    relevant_skills = skill_sets.get("developer", ["Programming", "Problem Solving"])
-    for key in skill_sets:
-        if key.lower() in keywords.lower():
-            relevant_skills = skill_sets[key]
-            break
+    Jobs come from the seeded demo corpus, so the same query always returns
+    the same jobs and pages.
 
-    # Generate multiple job listings
-    jobs = []
-    for i in range(6):  # Generate 6 jobs
-        job_type = random.choice(job_types)
-        company = random.choice(companies)
-        work_type = random.choice(work_types)
-
-        # Salary ranges based on experience level
-        salary_ranges = {
-            "Junior": "8,000 - 15,000 TL",
-            "Mid-Level": "15,000 - 25,000 TL",
-            "Senior": "25,000 - 40,000 TL",
-            "Lead": "35,000 - 55,000 TL",
-            "Principal": "50,000 - 80,000 TL"
-        }
+    Args:
+        keywords (str): Search keywords
+        location (str): Search location
+        page (int): Page number (>= 1)
+        pagesize (int): Jobs per page (default: DEMO_PAGESIZE)
 
-        # Random skills selection
-        job_skills = random.sample(relevant_skills, min(4, len(relevant_skills)))
-
-        # Generate posting date (within last 7 days)
-        days_ago = random.randint(0, 7)
-        post_date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-
-        job = {
-            "id": f"demo_job_{i+1}",
-            "title": f"{job_type} {keywords}",
-            "company": company,
-            "location": location if work_type != "Remote" else f"{location} (Remote)",
-            "salary": salary_ranges.get(job_type, "Rekabetçi maaş"),
-            "description": f"{company} bünyesinde {job_type.lower()} seviye {keywords} pozisyonu için aday aranmaktadır. Modern teknolojiler ile çalışma, esnek çalışma saatleri ve profesyonel gelişim fırsatları sunulmaktadır.",
-            "requirements": job_skills,
-            "type": work_type,
-            "url": f"https://example.com/job/{i+1}",
-            "date": post_date,
-            "posted_date": post_date
-        }
-        jobs.append(job)
+    Returns:
+        dict: Demo response with "type": "demo", "total_jobs" and "pages"
+    """
+    pagesize = pagesize or DEMO_PAGESIZE
+    jobs = demo_corpus.page(keywords, location, page or 1, pagesize, style="demo")
 
     return {
         "type": "demo",
@@ -190,7 +1007,8 @@ def create_demo_response(keywords, location):
             "location": location
         },
         "jobs": jobs,
-        "total_jobs": len(jobs),
+        "total_jobs": demo_corpus.size,
+        "pages": -(-demo_corpus.size // pagesize),
         "note": "Gerçek iş ilanları için https://www.careerjet.com/partners/api/ adresinden API key alın.",
         "enhanced": True
     }
@@ -200,6 +1018,65 @@ def get_job_details(job_url, locale="en_US"):
     """
     Get detailed information about a specific job.
 
+    The job page is fetched and parsed into structured fields (title,
+    company, location, description, date_posted, valid_through,
+    employment_type, salary, apply_url). Parsed pages are cached and
+    revalidated with conditional requests once stale.
+
+    Args:
+        job_url (str): URL of the job posting
+        locale (str): Locale code (default: en_US)
+
+    Returns:
+        dict: Job details or error message; "cache" tells whether the page was
+            served from memory ("hit"), revalidated, downloaded ("miss") or stale
+    """
+    if not job_url:
+        return {"error": "Job URL is required"}
+    return details_engine.get(job_url, locale)
+
+
+def job_urls_from_result(result, top_n):
+    """Return the URLs of the first ``top_n`` jobs of a search result."""
+    jobs = result.get('jobs', []) if isinstance(result, dict) else []
+    return [job['url'] for job in jobs[:top_n] if job.get('url')]
+
+
+def prefetch_job_details(job_urls, locale="en_US", wait=True):
+    """
+    Fetch and cache the details of several jobs concurrently.
+
+    At most CAREER_DETAILS_WORKERS pages are fetched at a time and at most
+    MAX_PREFETCH URLs are accepted, so a later get_job_details for one of
+    them is a cache hit.
+
+    Args:
+        job_urls (list): Job posting URLs
+        locale (str): Locale code (default: en_US)
+        wait (bool): Wait for the pages; with False fetching continues in the background
+
+    Returns:
+        dict: Prefetch summary, with the parsed "details" per URL when waiting
+    """
+    return details_engine.prefetch(list(job_urls)[:MAX_PREFETCH], locale, wait=wait)
+
+
+def get_job_details_cached(job_url):
+    """
+    Return job details parsed earlier, without fetching the page.
+
+    Returns:
+        dict: Job details ("cache" is "hit" or "stale"), or None if the page was never loaded
+    """
+    if not job_url:
+        return None
+    return details_engine.peek(job_url)
+
+
+async def get_job_details_async(job_url, locale="en_US"):
+    """
+    Async variant of get_job_details, offloaded to the bounded executor.
+
     Args:
         job_url (str): URL of the job posting
         locale (str): Locale code (default: en_US)
@@ -207,16 +1084,260 @@ def get_job_details(job_url, locale="en_US"):
     Returns:
         dict: Job details or error message
     """
+    return await run_blocking(get_job_details, job_url, locale)
+
+
+async def prefetch_job_details_async(job_urls, locale="en_US"):
+    """
+    Async variant of prefetch_job_details (always waits for the pages).
+
+    Args:
+        job_urls (list): Job posting URLs
+        locale (str): Locale code (default: en_US)
+
+    Returns:
+        dict: Prefetch summary with the parsed "details" per URL
+    """
+    return await run_blocking(prefetch_job_details, job_urls, locale)
+
+
+# Saved searches are re-polled every CAREER_SAVED_SEARCH_INTERVAL seconds,
+# spread by +/- CAREER_SAVED_SEARCH_JITTER so polls do not bunch up
+SAVED_SEARCH_INTERVAL = float(os.environ.get("CAREER_SAVED_SEARCH_INTERVAL", "900"))
+SAVED_SEARCH_MIN_INTERVAL = float(os.environ.get("CAREER_SAVED_SEARCH_MIN_INTERVAL", "60"))
+SAVED_SEARCH_JITTER = float(os.environ.get("CAREER_SAVED_SEARCH_JITTER", "0.2"))
+
+# Search parameters a saved search may fix; it always polls the first page
+SAVED_SEARCH_PARAM_KEYS = ('sort', 'pagesize', 'contracttype', 'contractperiod', 'salary')
+SAVED_SEARCH_DEFAULTS = {'sort': 'date', 'pagesize': 50}
+
+saved_search_polls = metrics_registry.counter(
+    "career_saved_search_polls_total", "Saved search polls by outcome", labels=("outcome",))
+saved_search_new_jobs = metrics_registry.counter(
+    "career_saved_search_new_jobs_total", "Jobs found by saved search polls that were not seen before")
+
+_saved_search_scheduler = None
+_saved_search_scheduler_lock = threading.Lock()
+
+
+def poll_saved_search(search, priority="background"):
+    """
+    Run a saved search through the normal search path and record the jobs it has not seen yet.
+
+    Errors, demo data and fallback results (stale cache, local index) are not
+    compared, so an upstream outage never reports every job as new later on.
+
+    Args:
+        search (dict): Saved search as stored
+        priority (str): Upstream scheduling class of the search
+
+    Returns:
+        dict: {"new": int} or an error ("Saved search not found" if it was deleted meanwhile)
+    """
+    store = get_saved_searches()
+    now = time.time()
+    next_check = next_check_time(now, search['interval'], SAVED_SEARCH_JITTER)
+    with stage("saved_search_poll"):
+        result = search_jobs(search['keywords'], search['location'], locale=search['locale'],
+                             priority=priority, **search['params'])
+    if not is_cacheable_result(result):
+        error = result.get('error') or "Upstream unavailable ({})".format(result.get('source') or result.get('type'))
+        if not search['checks']:
+            # Without a baseline nothing can be reported; retry soon
+            next_check = next_check_time(now, min(search['interval'], SAVED_SEARCH_MIN_INTERVAL), SAVED_SEARCH_JITTER)
+        store.record_error(search['id'], error, next_check)
+        saved_search_polls.inc("skipped")
+        return {"error": error}
+    fingerprinted = [(job_fingerprint(job_id(job)), job) for job in result.get('jobs', [])]
+    new = store.record_poll(search['id'], fingerprinted, next_check)
+    if new < 0:
+        # Deleted while the search was running
+        saved_search_polls.inc("deleted")
+        return {"error": "Saved search not found"}
+    saved_search_polls.inc("ok")
+    saved_search_new_jobs.inc(amount=new)
+    return {"new": new}
+
+
+def save_search(keywords, location, locale="en_US", interval=None, **kwargs):
+    """
+    Save a search so it is re-polled in the background.
+
+    The search runs once right away to record the jobs that exist now;
+    get_new_jobs then only returns jobs that appear after that.
+
+    Args:
+        keywords (str): Keywords to match job titles, content or company names
+        location (str): Location of requested jobs
+        locale (str): Locale code (default: en_US)
+        interval (float): Seconds between polls (default: CAREER_SAVED_SEARCH_INTERVAL,
+            at least CAREER_SAVED_SEARCH_MIN_INTERVAL)
+        **kwargs: Fixed search parameters (sort, pagesize, contracttype, contractperiod, salary)
+
+    Returns:
+        dict: The saved search with its initial "cursor", or an error
+    """
+    store = get_saved_searches()
+    if store is None:
+        return {"error": "Saved searches are disabled"}
+    if not keywords or not keywords.strip():
+        return {"error": "Keywords are required"}
+    try:
+        interval = max(SAVED_SEARCH_MIN_INTERVAL, float(interval if interval is not None else SAVED_SEARCH_INTERVAL))
+    except (TypeError, ValueError):
+        return {"error": "interval must be a number of seconds"}
+    params = dict(SAVED_SEARCH_DEFAULTS)
+    params.update({key: kwargs[key] for key in SAVED_SEARCH_PARAM_KEYS if kwargs.get(key) not in (None, '')})
     try:
-        import requests
+        params['pagesize'] = max(1, min(int(params['pagesize']), MAX_PAGESIZE))
+    except (TypeError, ValueError):
+        return {"error": "pagesize must be an integer"}
 
-        # Simple job details extraction (basic implementation)
-        # In a real scenario, you might want to scrape the job page or use additional APIs
-        return {
-            "job_url": job_url,
-            "message": "Job details retrieval would require additional implementation",
-            "suggestion": "Use the search_jobs function to get job listings with basic details"
-        }
+    search = store.create(keywords.strip(), (location or '').strip(), locale, params, interval,
+                          next_check_time(time.time(), interval, SAVED_SEARCH_JITTER))
+    baseline = poll_saved_search(search, priority="interactive")
+    search = store.get(search['id'])
+    if search is None:
+        return {"error": "Saved search not found"}
+    search['cursor'] = store.cursor(search['id'])
+    if 'error' in baseline:
+        # The scheduler retries soon; its first successful poll becomes the baseline
+        search['warning'] = baseline['error']
+    return search
 
-    except Exception as e:
-        return {"error": f"Failed to get job details: {str(e)}"}
+
+def get_saved_search(search_id):
+    """
+    Return a saved search and its polling state.
+
+    Returns:
+        dict: The saved search or an error
+    """
+    store = get_saved_searches()
+    if store is None:
+        return {"error": "Saved searches are disabled"}
+    search = store.get(search_id)
+    if search is None:
+        return {"error": "Saved search not found"}
+    return search
+
+
+def list_saved_searches():
+    """Return all saved searches, or an error when saved searches are disabled."""
+    store = get_saved_searches()
+    if store is None:
+        return {"error": "Saved searches are disabled"}
+    return {"searches": store.list()}
+
+
+def delete_saved_search(search_id):
+    """
+    Delete a saved search and its fingerprints.
+
+    Returns:
+        dict: {"deleted": search_id} or an error
+    """
+    store = get_saved_searches()
+    if store is None:
+        return {"error": "Saved searches are disabled"}
+    if not store.delete(search_id):
+        return {"error": "Saved search not found"}
+    return {"deleted": search_id}
+
+
+def get_new_jobs(search_id, since=0, limit=100):
+    """
+    Return the jobs a saved search found since a cursor.
+
+    Only reads the saved search store; no search is made. Pass the returned
+    "cursor" as ``since`` next time to receive only later jobs.
+
+    Args:
+        search_id (str): Saved search ID
+        since (int): Cursor from the previous call (0: every job found since saving)
+        limit (int): Maximum number of jobs (1-100); "has_more" tells whether more remain
+
+    Returns:
+        dict: {"search_id", "jobs", "count", "cursor", "has_more", "last_checked",
+            "next_check"} or an error
+    """
+    search = get_saved_search(search_id)
+    if 'error' in search:
+        return search
+    try:
+        since = max(0, int(since or 0))
+        limit = max(1, min(int(limit), 100))
+    except (TypeError, ValueError):
+        return {"error": "since and limit must be integers"}
+    with stage("saved_search_since"):
+        jobs, cursor, has_more = get_saved_searches().new_jobs_since(search_id, since, limit)
+    return {
+        "search_id": search_id,
+        "jobs": jobs,
+        "count": len(jobs),
+        "cursor": cursor,
+        "has_more": has_more,
+        "last_checked": search['last_checked'],
+        "next_check": search['next_check'],
+        "last_error": search['last_error'],
+    }
+
+
+def start_saved_search_scheduler(tick=None):
+    """
+    Start the background thread that re-polls due saved searches in this process.
+
+    Safe to call repeatedly and after fork (each worker process runs its own
+    thread; claims in the shared database keep them from polling the same
+    search twice). Does nothing when saved searches are disabled.
+
+    Args:
+        tick (float): Seconds between checks for due searches
+            (default: CAREER_SAVED_SEARCH_TICK)
+
+    Returns:
+        bool: True if a thread was started by this call
+    """
+    global _saved_search_scheduler
+    store = get_saved_searches()
+    if store is None:
+        return False
+    with _saved_search_scheduler_lock:
+        if _saved_search_scheduler is None:
+            _saved_search_scheduler = SavedSearchScheduler(
+                store, poll_saved_search,
+                tick=float(tick if tick is not None else os.environ.get("CAREER_SAVED_SEARCH_TICK", "5")),
+            )
+    return _saved_search_scheduler.start()
+
+
+def get_saved_search_stats():
+    """
+    Return saved search store and scheduler statistics.
+
+    Returns:
+        dict: Statistics, or {"enabled": False} when disabled
+    """
+    store = get_saved_searches()
+    if store is None:
+        return {"enabled": False}
+    stats = dict(store.stats(), enabled=True)
+    scheduler = _saved_search_scheduler
+    stats["scheduler"] = scheduler.stats() if scheduler is not None else {"running": False}
+    return stats
+
+
+def get_server_stats():
+    """
+    Return everything get_server_stats_tool reports.
+
+    Blocking: the saved search statistics query SQLite.
+
+    Returns:
+        dict: get_metrics() plus "cache", "upstream" and "saved_searches" statistics
+    """
+    stats = get_metrics()
+    stats["cache"] = get_cache_stats()
+    stats["upstream"] = get_upstream_status()
+    stats["saved_searches"] = get_saved_search_stats()
+    return stats
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Skill extraction throughput benchmark.
+
+Compares the original linear substring scan of extract_requirements with the
+compiled SkillMatcher, per description and batched per page, using the
+shipped taxonomy and a synthetic taxonomy of several thousand skills.
+
+Usage:
+    python benchmarks/bench_skills.py [--descriptions 5000] [--synthetic-skills 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills import DEFAULT_TAXONOMY_PATH, SkillMatcher
+
+LEGACY_SKILLS = [
+    'Python', 'JavaScript', 'React', 'Node.js', 'Java', 'C#', 'PHP',
+    'HTML', 'CSS', 'SQL', 'MongoDB', 'PostgreSQL', 'Git', 'Docker',
+    'AWS', 'Azure', 'Linux', 'Windows', 'API', 'REST', 'GraphQL'
+]
+
+FILLER = (
+    "Ekibimize katılacak, yenilikçi projelerde görev alacak, takım çalışmasına yatkın "
+    "çalışma arkadaşları arıyoruz. We are looking for a motivated engineer to join our "
+    "fast-growing product team and help us build reliable services for millions of users. "
+).split()
+
+
+def legacy_extract(description):
+    """Original implementation: lowercase substring test per skill."""
+    requirements = []
+    description_lower = description.lower()
+    for skill in LEGACY_SKILLS:
+        if skill.lower() in description_lower:
+            requirements.append(skill)
+    return requirements[:5]
+
+
+def make_linear_scan(skills):
+    """The legacy substring scan generalized to a full taxonomy with synonyms."""
+    terms = [(term.lower(), skill["name"]) for skill in skills for term in [skill["name"]] + skill.get("synonyms", [])]
+
+    def extract(description):
+        description_lower = description.lower()
+        found = []
+        for term, name in terms:
+            if term in description_lower and name not in found:
+                found.append(name)
+        return found
+
+    return extract
+
+
+def make_descriptions(count, terms, seed=42):
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(60, 160))
+        for _ in range(rng.randint(2, 8)):
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        descriptions.append(" ".join(words))
+    return descriptions
+
+
+def synthetic_taxonomy(base_skills, extra, seed=7):
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzçğıöşü"
+    skills = list(base_skills)
+    for i in range(extra):
+        name = "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 12)))
+        skills.append({"name": f"{name}{i}", "synonyms": [f"{name} {i}", f"{name}-tool"]})
+    return skills
+
+
+def measure(label, func, descriptions, page_size=None, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if page_size:
+            for i in range(0, len(descriptions), page_size):
+                func(descriptions[i:i + page_size])
+        else:
+            for description in descriptions:
+                func(description)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(descriptions) / best
+    print(f"{label:<48} {best * 1000:9.1f} ms  {rate:12,.0f} desc/s")
+    return {"label": label, "seconds": best, "descriptions_per_second": rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--descriptions", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--synthetic-skills", type=int, default=5000)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with open(DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+        base_skills = json.load(f)["skills"]
+
+    terms = [skill["name"] for skill in base_skills] + ["JavaScript", "rapid", "APIs", "Java"]
+    descriptions = make_descriptions(args.descriptions, terms)
+
+    matcher = SkillMatcher(base_skills)
+    start = time.perf_counter()
+    large = SkillMatcher(synthetic_taxonomy(base_skills, args.synthetic_skills))
+    compile_seconds = time.perf_counter() - start
+
+    print(f"{args.descriptions} descriptions, taxonomy: {len(matcher.skills)} skills "
+          f"(synthetic: {len(large.skills)}, compiled in {compile_seconds * 1000:.0f} ms)\n")
+
+    results = [
+        measure(f"legacy substring scan ({len(LEGACY_SKILLS)} skills)", legacy_extract, descriptions),
+        measure(f"linear substring scan ({len(matcher.skills)} skills)", make_linear_scan(base_skills), descriptions, repeat=1),
+        measure(f"SkillMatcher.match ({len(matcher.skills)} skills)", matcher.match, descriptions),
+        measure(f"SkillMatcher.match_many ({len(matcher.skills)} skills, page={args.page_size})",
+                matcher.match_many, descriptions, page_size=args.page_size),
+        measure(f"SkillMatcher.match_many ({len(large.skills)} skills, page={args.page_size})",
+                large.match_many, descriptions, page_size=args.page_size),
+    ]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"descriptions": args.descriptions, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Careerjet search API.
+
+Answers GET /jobs with Careerjet-shaped JSON after a configurable latency,
+fails a configurable share of requests with HTTP 500 and generates pages
+of any size. Job listings come from the seeded demo corpus (demo_corpus.py)
+and are deterministic per (seed, keywords, location, page), so runs are
+reproducible without network access.
+
+Job URLs point back at the server: GET /job/<search>/<number> returns an
+HTML job page with schema.org JobPosting JSON-LD, an ETag and a
+Last-Modified header, and answers conditional requests with 304.
+
+Usage:
+    python benchmarks/fake_careerjet.py --port 8765 --latency-ms 80 --error-rate 0.05
+    CAREER_UPSTREAM_API_URL=http://127.0.0.1:8765/jobs python api_server.py
+
+The job pages live on a loopback address, which the details fetcher
+refuses by default; add CAREER_DETAILS_ALLOWED_HOSTS=127.0.0.1 and
+CAREER_DETAILS_ALLOW_PRIVATE=1 to fetch them.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demo_corpus import COMPANIES, FILLER, LEVELS, SKILL_SETS, TEAMS, JobCorpus
+
+SKILLS = sorted({skill for skills in SKILL_SETS.values() for skill in skills})
+
+# Posting dates count back from a fixed day, so listings do not change between runs
+REFERENCE_DATE = date(2024, 1, 31)
+
+DEFAULT_CONFIG = {
+    "latency_ms": 50.0,
+    "jitter_ms": 20.0,
+    "error_rate": 0.0,
+    "jobs_per_page": 20,
+    "hits": 1000,
+    "description_words": 120,
+}
+
+
+def make_job_page(path, config):
+    """Return the deterministic HTML page of one job (``path`` is /job/<search>/<number>)."""
+    rng = random.Random(path)
+    words = rng.choices(FILLER, k=config["description_words"])
+    skills = rng.sample(SKILLS, 4)
+    title = f"{rng.choice(LEVELS)} Developer - {rng.choice(TEAMS)}"
+    company = rng.choice(COMPANIES)
+    posting = {
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": title,
+        "hiringOrganization": {"@type": "Organization", "name": company},
+        "jobLocation": {"@type": "Place", "address": {
+            "@type": "PostalAddress", "addressLocality": "Istanbul", "addressCountry": "TR"}},
+        "datePosted": f"2024-01-{rng.randint(1, 28):02d}",
+        "employmentType": rng.choice(["FULL_TIME", "PART_TIME", "CONTRACTOR"]),
+        "baseSalary": {"@type": "MonetaryAmount", "currency": "TRY", "value": {
+            "@type": "QuantitativeValue", "minValue": rng.randint(15, 40) * 1000,
+            "maxValue": rng.randint(41, 80) * 1000, "unitText": "MONTH"}},
+        "description": "<p>" + " ".join(words) + "</p><ul>" + "".join(f"<li>{s}</li>" for s in skills) + "</ul>",
+    }
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{title} - {company}</title>"
+        f"<script type=\"application/ld+json\">{json.dumps(posting, ensure_ascii=False)}</script>"
+        "</head><body><header><nav>Fake Careerjet</nav></header>"
+        f"<main><h1>{title}</h1><div class=\"job-description\">{posting['description']}</div></main>"
+        "<footer>fake-careerjet.local</footer></body></html>"
+    )
+
+
+class FakeCareerjetHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as two writes; with Nagle on, every request on
+    # a kept-alive connection would wait ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        config = self.server.config
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/job/"):
+            self._send_job_page(parts.path)
+            return
+        if parts.path != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+
+        query = parse_qs(parts.query)
+        keywords = query.get("keywords", [""])[0]
+        location = query.get("location", [""])[0]
+        try:
+            page = max(1, int(query.get("page", ["1"])[0]))
+        except ValueError:
+            page = 1
+        try:
+            # Like Careerjet: pagesize is honoured up to 100, otherwise jobs_per_page applies
+            pagesize = min(100, max(1, int(query["pagesize"][0])))
+        except (KeyError, ValueError):
+            pagesize = config["jobs_per_page"]
+
+        with self.server.lock:
+            self.server.requests += 1
+            rng = self.server.rng
+            delay = max(0.0, config["latency_ms"] + rng.uniform(-1, 1) * config["jitter_ms"]) / 1000
+            failed = rng.random() < config["error_rate"]
+        time.sleep(delay)
+
+        if failed:
+            with self.server.lock:
+                self.server.errors += 1
+            self._send(500, {"error": "Injected upstream failure"})
+            return
+
+        pages = -(-config["hits"] // pagesize)
+        jobs = self.server.corpus.page(keywords, location, page, pagesize) if page <= pages else []
+        self._send(200, {"type": "JOBS", "hits": config["hits"], "pages": pages, "jobs": jobs})
+
+    def do_HEAD(self):
+        # Used by warm-up to open a keep-alive connection
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_job_page(self, path):
+        with self.server.lock:
+            self.server.page_requests += 1
+            version = self.server.page_version
+        etag = f'"{zlib.crc32(path.encode("utf-8")):x}-{version}"'
+        headers = {"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Cache-Control": "max-age=0"}
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.not_modified += 1
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        time.sleep(self.server.config["latency_ms"] / 1000)
+        body = make_job_page(path, self.server.config).encode("utf-8")
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host="127.0.0.1", port=0, seed=42, **config):
+    """
+    Start the fake API in a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free port)
+        seed (int): Seed of the job corpus, latency jitter and injected failures
+        **config: Overrides for DEFAULT_CONFIG (latency_ms, jitter_ms,
+            error_rate, jobs_per_page, hits, description_words)
+
+    Returns:
+        ThreadingHTTPServer: Running server; its ``url`` attribute is the
+            value for CAREER_UPSTREAM_API_URL. Stop it with ``shutdown()``.
+            Bump ``page_version`` to change every job page's ETag.
+    """
+    server = ThreadingHTTPServer((host, port), FakeCareerjetHandler)
+    server.daemon_threads = True
+    server.config = dict(DEFAULT_CONFIG, **config)
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.errors = 0
+    server.page_requests = 0
+    server.not_modified = 0
+    server.page_version = 1
+    server.url = f"http://{host}:{server.server_address[1]}/jobs"
+    server.corpus = JobCorpus(
+        seed=seed, size=server.config["hits"], description_words=server.config["description_words"],
+        reference_date=REFERENCE_DATE, url_base=server.url.rsplit("/", 1)[0], site="fake-careerjet.local",
+    )
+    threading.Thread(target=server.serve_forever, name="fake-careerjet", daemon=True).start()
+    return server
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_CONFIG["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_CONFIG["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"],
+                        help="Share of requests answered with HTTP 500 (0..1)")
+    parser.add_argument("--jobs-per-page", type=int, default=DEFAULT_CONFIG["jobs_per_page"])
+    parser.add_argument("--hits", type=int, default=DEFAULT_CONFIG["hits"])
+    parser.add_argument("--description-words", type=int, default=DEFAULT_CONFIG["description_words"])
+
+
+def config_from_args(args):
+    return {key: getattr(args, key) for key in DEFAULT_CONFIG}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, seed=args.seed, **config_from_args(args))
+    print(f"Fake Careerjet API on {server.url} ({json.dumps(server.config)})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP load generator for api_server.py.
+
+Sends requests from a number of concurrent keep-alive clients for a fixed
+duration and reports throughput and latency percentiles, so the Flask
+development server can be compared with the production entry point.
+503 responses from admission control are counted as "shed", not as errors.
+
+Usage:
+    python api_server.py                          # dev server on :5000
+    python api_server.py --production --port 5001 # production server
+    python benchmarks/load_api.py --url http://localhost:5000 --concurrency 32 --duration 20
+    python benchmarks/load_api.py --url http://localhost:5001 --concurrency 32 --duration 20
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+
+import requests
+
+DEFAULT_PATHS = [
+    "/api/jobs/search?keywords=yaz%C4%B1l%C4%B1m%20geli%C5%9Ftirici&location=%C4%B0stanbul",
+    "/api/jobs/search?keywords=python%20developer&location=Ankara",
+    "/api/jobs/search?keywords=m%C3%BChendis&location=Samsun",
+    "/",
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_load(base_url, paths, concurrency, duration, headers=None):
+    """
+    Run the load test.
+
+    Returns:
+        dict: Request, error and shed (503) counts, throughput (req/s) and
+            p50/p95/p99 latency (ms)
+    """
+    latencies = []
+    errors = [0]
+    shed = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local = []
+        failed = 0
+        rejected = 0
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            try:
+                response = session.get(base_url + path, headers=headers, timeout=30)
+                if response.status_code == 503:
+                    rejected += 1
+                elif response.status_code >= 500:
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+            shed[0] += rejected
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "url": base_url,
+        "concurrency": concurrency,
+        "duration": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": errors[0],
+        "shed": shed[0],
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", required=True,
+                        help="Base URL of a running server; repeat to compare several servers")
+    parser.add_argument("--path", action="append", help="Request path (default: a mix of searches and /)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: gzip")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    headers = {"Accept-Encoding": "gzip" if args.gzip else "identity"}
+    results = []
+    for url in args.url:
+        result = run_load(url.rstrip("/"), args.path or DEFAULT_PATHS, args.concurrency, args.duration, headers)
+        results.append(result)
+        print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
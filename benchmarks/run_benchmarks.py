@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reproducible benchmark suite against a local Careerjet stand-in.
+
+Starts benchmarks/fake_careerjet.py in-process, points the search code at
+it through CAREER_UPSTREAM_API_URL and measures throughput and latency
+percentiles for:
+
+- search_jobs (upstream miss, cache hit, concurrent misses) and a
+  federated search over three locales
+- one 100-job page of the demo corpus
+- format_search_results (full and summary projection) and
+  extract_requirements on one result page
+- job details: parsing the HTML fixtures, page fetch (miss), cache hit,
+  conditional revalidation and concurrent prefetch of a result page
+- the Flask endpoints (through the WSGI test client), including pages
+  served from a cursor window and the new jobs of a saved search
+- the FastMCP search_jobs_tool over a stdio round-trip
+
+Results are written as JSON; pass a previous file with --baseline to fail
+when a case's p95 latency regressed by more than --max-regression.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --output bench-new.json
+    python benchmarks/run_benchmarks.py --latency-ms 150 --error-rate 0.05 --jobs-per-page 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from fake_careerjet import add_config_arguments, config_from_args, start_server
+from load_api import percentile
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "iterations": len(latencies),
+        "errors": errors,
+        "duration": round(elapsed, 3),
+        "throughput_ops": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def measure(func, iterations, concurrency=1):
+    """
+    Call ``func(i)`` ``iterations`` times and summarize the latencies.
+
+    ``func`` returns False for a failed call; anything else counts as success.
+    """
+    def timed(i):
+        start = time.perf_counter()
+        ok = func(i)
+        return time.perf_counter() - start, ok is False
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed, range(iterations)))
+    else:
+        outcomes = [timed(i) for i in range(iterations)]
+    elapsed = time.perf_counter() - started
+    return summarize([latency for latency, _ in outcomes], sum(1 for _, failed in outcomes if failed), elapsed)
+
+
+def is_upstream_result(result):
+    return isinstance(result, dict) and 'error' not in result and result.get('type') != 'demo'
+
+
+def bench_core(args):
+    import app
+    import api_server
+    import details
+    from demo_corpus import JobCorpus
+    from projection import make_projection
+
+    # Per-request log lines would dominate the Flask timings
+    logging.getLogger("api_server").setLevel(logging.WARNING)
+
+    results = {}
+    results["search_jobs.miss"] = measure(
+        lambda i: is_upstream_result(app.search_jobs(f"python {i}", "Istanbul", locale="tr_TR")),
+        args.iterations,
+    )
+    results["search_jobs.miss_concurrent"] = measure(
+        lambda i: is_upstream_result(app.search_jobs(f"java {i}", "Ankara", locale="tr_TR")),
+        args.iterations, concurrency=args.concurrency,
+    )
+    results["search_jobs.federated_3"] = measure(
+        lambda i: app.search_jobs_federated(f"federated {i}", "Istanbul", ["tr_TR", "en_GB", "de_DE"])['total_jobs'] > 0,
+        args.iterations,
+    )
+    app.search_jobs("react", "Izmir", locale="tr_TR")
+    corpus = JobCorpus(seed=0, size=1_000_000, description_words=args.description_words)
+    results["demo_corpus.page_100"] = measure(
+        lambda i: len(corpus.page(f"corpus {i}", "Istanbul", i * 97 + 1, 100)) == 100,
+        args.iterations,
+    )
+    results["search_jobs.hit"] = measure(
+        lambda i: is_upstream_result(app.search_jobs("react", "Izmir", locale="tr_TR")),
+        args.iterations * 10,
+    )
+
+    page = app.search_jobs("devops", "Samsun", locale="tr_TR", use_cache=False)
+    results["format_search_results"] = measure(
+        lambda i: api_server.format_search_results(page, "devops", "Samsun")['success'],
+        args.iterations,
+    )
+    summary = make_projection(summary=True, allowed=api_server.FORMATTED_JOB_FIELDS,
+                              summary_fields=api_server.SUMMARY_JOB_FIELDS)
+    results["format_search_results.summary"] = measure(
+        lambda i: api_server.format_search_results(page, "devops", "Samsun", projection=summary)['success'],
+        args.iterations,
+    )
+    descriptions = [job.get('description', '') for job in page.get('jobs', [])] or [""]
+    results["extract_requirements"] = measure(
+        lambda i: api_server.extract_requirements(descriptions[i % len(descriptions)]),
+        args.iterations * 10,
+    )
+
+    fixtures = [open(os.path.join(BENCH_DIR, "fixtures", name), encoding="utf-8").read()
+                for name in ("job_jsonld.html", "job_plain.html")]
+    results["details.parse"] = measure(
+        lambda i: details.parse_job_page(fixtures[i % len(fixtures)])['title'] is not None,
+        args.iterations * 10,
+    )
+    urls = [job['url'] for job in app.search_jobs("details", "Istanbul", locale="tr_TR", pagesize=50).get('jobs', [])]
+    urls = (urls * (args.iterations // max(1, len(urls)) + 1))[:args.iterations]
+    results["details.get_miss"] = measure(
+        lambda i: app.get_job_details(f"{urls[i]}?v={i}").get('cache') == "miss", args.iterations,
+    )
+    results["details.get_hit"] = measure(
+        lambda i: app.get_job_details(f"{urls[i]}?v={i}").get('cache') == "hit", args.iterations,
+    )
+    revalidating = details.DetailsEngine(ttl=0, allowed_hosts=app.details_engine.allowed_hosts, allow_private=True)
+    for url in urls:
+        revalidating.get(url)
+    results["details.get_revalidated"] = measure(
+        lambda i: revalidating.get(urls[i]).get('cache') == "revalidated", args.iterations,
+    )
+    pages = [app.search_jobs(f"prefetch {i}", "Ankara", locale="tr_TR") for i in range(max(1, args.iterations // 10))]
+    results["details.prefetch_10"] = measure(
+        lambda i: app.prefetch_job_details(app.job_urls_from_result(pages[i], 10))['errors'] == 0, len(pages),
+    )
+
+    client = api_server.app.test_client()
+    results["flask.health"] = measure(lambda i: client.get('/').status_code == 200, args.iterations)
+    results["flask.search_miss"] = measure(
+        lambda i: client.get(f'/api/jobs/search?keywords=flask+{i}&location=Bursa').status_code == 200,
+        args.iterations,
+    )
+    results["flask.search_hit"] = measure(
+        lambda i: client.get('/api/jobs/search?keywords=flask+0&location=Bursa',
+                             headers={'Accept-Encoding': 'gzip'}).status_code == 200,
+        args.iterations * 5,
+    )
+    first = client.get('/api/jobs/search?keywords=scroll&location=Bursa&paginate=cursor&pagesize=20').get_json()
+    cursors = [first.get('nextCursor')]
+    for _ in range(3):
+        cursors.append(client.get(f'/api/jobs/search?cursor={cursors[-1]}').get_json().get('nextCursor'))
+    results["flask.search_cursor_next"] = measure(
+        lambda i: client.get(f'/api/jobs/search?cursor={cursors[i % len(cursors)]}').status_code == 200,
+        args.iterations * 5,
+    )
+    saved = client.post('/api/saved-searches', json={"keywords": "saved", "location": "Bursa"}).get_json()
+    app.poll_saved_search(app.get_saved_search(saved['id']))
+    results["flask.saved_search_new"] = measure(
+        lambda i: client.get(f"/api/saved-searches/{saved['id']}/new?since={saved['cursor']}").status_code == 200,
+        args.iterations * 5,
+    )
+    results["flask.search_batch"] = measure(
+        lambda i: client.post('/api/jobs/search/batch', json={"queries": [
+            {"keywords": f"batch {i} {n}", "location": "Antalya"} for n in range(4)
+        ]}).status_code == 200,
+        max(1, args.iterations // 4),
+    )
+    return results
+
+
+def bench_mcp(args):
+    """Measure search_jobs_tool calls through a real stdio FastMCP server process."""
+    try:
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+    except ImportError:
+        return {"mcp.search_jobs_tool.miss": {"skipped": "mcp client is not installed"}}
+
+    async def run():
+        params = StdioServerParameters(
+            command=sys.executable, args=[os.path.join(ROOT_DIR, "server.py")], env=dict(os.environ),
+        )
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def calls(keywords_for):
+                    latencies = []
+                    errors = 0
+                    started = time.perf_counter()
+                    for i in range(args.mcp_iterations):
+                        start = time.perf_counter()
+                        response = await session.call_tool(
+                            "search_jobs_tool", {"keywords": keywords_for(i), "location": "Istanbul", "locale": "tr_TR"},
+                        )
+                        latencies.append(time.perf_counter() - start)
+                        errors += bool(response.isError)
+                    return summarize(latencies, errors, time.perf_counter() - started)
+
+                # Misses include the upstream call; hits measure the stdio round-trip itself
+                return {
+                    "mcp.search_jobs_tool.miss": await calls(lambda i: f"mcp {i}"),
+                    "mcp.search_jobs_tool.hit": await calls(lambda i: "mcp 0"),
+                }
+
+    return asyncio.run(run())
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, results, max_regression):
+    """Return the cases whose p95 latency grew by more than ``max_regression`` (a fraction)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "p95_ms" not in previous or "p95_ms" not in current or not previous["p95_ms"]:
+            continue
+        change = current["p95_ms"] / previous["p95_ms"] - 1
+        if change > max_regression:
+            regressions.append({"case": name, "baseline_p95_ms": previous["p95_ms"],
+                                "p95_ms": current["p95_ms"], "change": round(change, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100, help="Iterations per upstream-bound case")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads for the concurrent search case")
+    parser.add_argument("--mcp-iterations", type=int, default=30)
+    parser.add_argument("--skip-mcp", action="store_true", help="Do not start the stdio MCP server")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results file to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed p95 growth over the baseline (0.2 = 20%%)")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    fake = start_server(**config_from_args(args))
+    workdir = tempfile.mkdtemp(prefix="career-bench-")
+    # Must be set before app is imported; the MCP subprocess inherits them
+    os.environ["CAREER_UPSTREAM_API_URL"] = fake.url
+    # The stand-in serves the job pages as well, from a loopback address
+    os.environ["CAREER_DETAILS_ALLOWED_HOSTS"] = urlsplit(fake.url).hostname
+    os.environ["CAREER_DETAILS_ALLOW_PRIVATE"] = "1"
+    os.environ["CAREER_JOB_INDEX_PATH"] = os.path.join(workdir, "jobs_index.db")
+    os.environ["CAREER_SAVED_SEARCH_PATH"] = os.path.join(workdir, "saved_searches.db")
+    os.environ["CAREER_SAVED_SEARCH_SCHEDULER"] = "0"
+    os.environ.pop("CAREER_SHARED_STATE_PATH", None)
+
+    results = bench_core(args)
+    if not args.skip_mcp:
+        results.update(bench_mcp(args))
+    fake.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "fake_upstream": dict(fake.config, requests=fake.requests, errors=fake.errors),
+        "results": results,
+    }
+
+    for name, stats in results.items():
+        if "skipped" in stats:
+            print(f"{name:<30} skipped: {stats['skipped']}")
+        else:
+            print(f"{name:<30} {stats['throughput_ops']:>10.1f} ops/s  p50 {stats['p50_ms']:>9.3f} ms  "
+                  f"p95 {stats['p95_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms  errors {stats['errors']}")
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f), results, args.max_regression)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']}: p95 {regression['baseline_p95_ms']} -> "
+                  f"{regression['p95_ms']} ms ({regression['change']:+.0%})")
+        exit_code = 1 if regressions else 0
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cold-start profile of the stdio MCP server.
+
+Reports:
+- an import-time profile of ``import server`` (python -X importtime),
+  aggregated per top-level package
+- time from process spawn to a completed MCP handshake, and the latency of
+  the first and second search_jobs_tool calls, with and without
+  CAREER_MCP_WARMUP (searches go to a local fake Careerjet server)
+
+Exits with status 1 when the median import time or handshake time exceeds
+its budget, so startup regressions show up.
+
+Usage:
+    python benchmarks/startup_profile.py
+    python benchmarks/startup_profile.py --runs 5 --import-budget-ms 800 --handshake-budget-ms 1500 --output startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+from fake_careerjet import start_server
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_imports(runs, top):
+    """Run ``python -X importtime -c 'import server'`` and summarize the slowest packages."""
+    totals = []
+    packages = {}
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import server"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stderr
+        run_packages = {}
+        for line in output.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, indent, module = int(match[1]), int(match[2]), match[3], match[4]
+            package = module.split(".")[0]
+            run_packages[package] = run_packages.get(package, 0) + self_us
+            if module == "server" and len(indent) == 1:
+                totals.append(cumulative_us / 1000)
+        for package, self_us in run_packages.items():
+            packages.setdefault(package, []).append(self_us / 1000)
+
+    slowest = sorted(((statistics.median(values), package) for package, values in packages.items()), reverse=True)
+    return {
+        "import_server_ms": round(statistics.median(totals), 1),
+        "runs": runs,
+        "top_packages_self_ms": {package: round(ms, 1) for ms, package in slowest[:top]},
+    }
+
+
+async def cold_start(env):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[os.path.join(ROOT_DIR, "server.py")], env=env)
+    spawned = time.perf_counter()
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                handshake = time.perf_counter() - spawned
+                timings = {"handshake_ms": handshake * 1000}
+                for name, keywords in (("first_call_ms", "python"), ("second_call_ms", "java")):
+                    started = time.perf_counter()
+                    await session.call_tool("search_jobs_tool", {"keywords": keywords, "location": "Istanbul"})
+                    timings[name] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def profile_cold_start(runs, upstream_url):
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="career-startup-")
+    for mode, warmup in (("cold", "0"), ("warm_up", "1")):
+        samples = []
+        for run in range(runs):
+            env = dict(os.environ, CAREER_UPSTREAM_API_URL=upstream_url, CAREER_MCP_WARMUP=warmup,
+                       CAREER_JOB_INDEX_PATH=os.path.join(workdir, f"{mode}-{run}.db"))
+            env.pop("CAREER_SHARED_STATE_PATH", None)
+            samples.append(asyncio.run(cold_start(env)))
+        results[mode] = {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Number of packages in the import profile")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latency of the fake upstream")
+    parser.add_argument("--import-budget-ms", type=float, default=1000.0)
+    parser.add_argument("--handshake-budget-ms", type=float, default=2000.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    report = {"imports": profile_imports(args.runs, args.top)}
+    print(f"import server: {report['imports']['import_server_ms']} ms (median of {args.runs})")
+    for package, ms in report["imports"]["top_packages_self_ms"].items():
+        print(f"  {package:<28} {ms:>8.1f} ms")
+
+    fake = start_server(latency_ms=args.latency_ms, jitter_ms=0)
+    try:
+        report["stdio"] = profile_cold_start(args.runs, fake.url)
+    finally:
+        fake.shutdown()
+    for mode, timings in report["stdio"].items():
+        print(f"{mode:<8} handshake {timings['handshake_ms']:>7.1f} ms  first call {timings['first_call_ms']:>7.1f} ms  "
+              f"second call {timings['second_call_ms']:>7.1f} ms")
+
+    over_budget = []
+    if report["imports"]["import_server_ms"] > args.import_budget_ms:
+        over_budget.append(f"import server {report['imports']['import_server_ms']} ms > {args.import_budget_ms} ms")
+    handshake = max(timings["handshake_ms"] for timings in report["stdio"].values())
+    if handshake > args.handshake_budget_ms:
+        over_budget.append(f"handshake {handshake} ms > {args.handshake_budget_ms} ms")
+    report["budget"] = {
+        "import_budget_ms": args.import_budget_ms,
+        "handshake_budget_ms": args.handshake_budget_ms,
+        "exceeded": over_budget,
+    }
+    for message in over_budget:
+        print(f"OVER BUDGET: {message}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
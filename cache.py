@@ -0,0 +1,322 @@
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_query_value(value):
+    """
+    Normalize a free-text query value so equivalent searches share a cache key.
+
+    Applies Unicode NFC normalization, case folding and whitespace collapsing,
+    so "  Yazılım  Geliştirici" and "yazılım geliştirici" map to the same key.
+    The combining dot left by folding Turkish "İ" is dropped, so "İstanbul"
+    and "istanbul" match as well.
+    """
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFC", str(value)).casefold().replace("\u0307", "")
+    return " ".join(text.split())
+
+
+def make_search_key(keywords, location, locale, affid, params):
+    """
+    Build a hashable cache key from normalized search parameters.
+
+    Args:
+        keywords (str): Search keywords
+        location (str): Search location
+        locale (str): Locale code
+        affid (str): Affiliate ID (results differ per API key)
+        params (dict): Optional upstream parameters (sort, page, pagesize, ...)
+
+    Returns:
+        tuple: Cache key
+    """
+    extra = tuple(sorted(
+        (key, str(value)) for key, value in params.items() if value is not None
+    ))
+    return (
+        normalize_query_value(keywords),
+        normalize_query_value(location),
+        (locale or "").strip(),
+        affid,
+        extra,
+    )
+
+
+def estimate_size(value):
+    """
+    Approximate the memory held by a JSON-like value, in bytes.
+
+    Sums ``sys.getsizeof`` over dicts, lists, tuples and their contents.
+    Strings shared between values (e.g. dict keys) are counted every time
+    they occur, so the estimate errs on the high side.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until", "size")
+
+    def __init__(self, value, fresh_until, stale_until, size=0):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.size = size
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with TTL, LRU eviction and stale-while-revalidate.
+
+    Entries are fresh for ``ttl`` seconds. After that they may still be served
+    for ``stale_ttl`` more seconds while a single background refresh runs.
+    At most ``max_entries`` entries are kept and, with ``max_bytes``, their
+    estimated size stays within that budget; the least recently used entry
+    is evicted first. Expired entries count against both limits until they
+    are evicted, since ``peek`` may still serve them.
+    """
+
+    def __init__(self, ttl=300, max_entries=1024, stale_ttl=600, max_bytes=None, sizeof=estimate_size):
+        """
+        Args:
+            ttl (float): Seconds an entry is fresh
+            max_entries (int): Maximum number of entries
+            stale_ttl (float): Extra seconds a stale entry may be served
+            max_bytes (int): Budget for the summed entry sizes (None: unlimited);
+                a single value larger than the budget is not stored
+            sizeof (callable): Size estimate of a value in bytes, charged at ``set``
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def get(self, key):
+        """Return a fresh value for ``key`` or None, without serving stale data."""
+        value, state = self.lookup(key)
+        return value if state == "fresh" else None
+
+    def lookup(self, key):
+        """
+        Look up ``key``.
+
+        Returns:
+            tuple: (value, state) where state is "fresh", "stale" or "miss"
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, "miss"
+            if now < entry.fresh_until:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry.value, "fresh"
+            if now < entry.stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return entry.value, "stale"
+            # Expired entries stay until evicted so peek() can serve them in an outage
+            self.misses += 1
+            return None, "miss"
+
+    def peek(self, key):
+        """
+        Return whatever value is stored for ``key``, even if expired, without
+        touching counters or LRU order. Used to serve a last known good answer.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            return entry.value if entry is not None else None
+
+    def set(self, key, value):
+        now = time.monotonic()
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        entry = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl, size)
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.size
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = entry
+            self.bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, cacheable=None, refresh_loader=None):
+        """
+        Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        Stale entries are returned immediately and refreshed in a background
+        thread with ``refresh_loader()`` (default: ``loader``).
+        ``cacheable(value)`` decides whether a loaded value is stored; by
+        default every value is stored.
+        """
+        value, state = self.lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self._refresh_in_background(key, refresh_loader or loader, cacheable)
+            return value
+
+        value = loader()
+        if cacheable is None or cacheable(value):
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, loader, cacheable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if cacheable is None or cacheable(value):
+                    self.set(key, value)
+                with self._lock:
+                    self.refreshes += 1
+            except Exception:
+                with self._lock:
+                    self.refresh_errors += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="cache-refresh", daemon=True).start()
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+            }
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.collapsed = 0
+        self.max_waiters = 0
+
+    def do(self, key, func):
+        """
+        Run ``func()`` once per in-flight ``key`` and share its outcome.
+
+        Returns:
+            The result of ``func()`` from the leading call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self):
+        """Return how many calls ran and how many were collapsed into them."""
+        with self._lock:
+            total = self.executions + self.collapsed
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "collapse_ratio": round(self.collapsed / total, 4) if total else 0.0,
+                "max_waiters": self.max_waiters,
+            }
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import math
+import random
+import sys
+import zlib
+from datetime import date, timedelta
+
+# Lookup tables are built once at import; generating a job only indexes into them
+COMPANY_NAMES = (
+    "Tech Innovations", "Dijital Çözümler", "Yazılım Geliştirme", "Teknoloji Merkezi", "İnovasyon Hub",
+    "Startup Accelerator", "Global Tech Solutions", "Akıllı Sistemler", "Veri Analitik", "Mobil Uygulama Stüdyosu",
+    "E-Ticaret Platformu", "Fintech Startup", "Bulut Teknolojileri", "AI Research Lab", "Blockchain Solutions",
+)
+COMPANY_SUFFIXES = ("A.Ş.", "Ltd.", "Teknoloji", "Yazılım", "Bilişim", "Group")
+COMPANIES = tuple(f"{name} {suffix}" for name in COMPANY_NAMES for suffix in COMPANY_SUFFIXES)
+
+LEVELS = ("Junior", "Mid-Level", "Senior", "Lead", "Principal")
+
+# Monthly gross salary range (TL) per level
+SALARY_RANGES = {
+    "Junior": (8000, 15000),
+    "Mid-Level": (15000, 25000),
+    "Senior": (25000, 40000),
+    "Lead": (35000, 55000),
+    "Principal": (50000, 80000),
+}
+
+TEAMS = ("Platform", "Ödeme Sistemleri", "Mobil", "Veri", "Altyapı", "Büyüme", "Müşteri Deneyimi")
+
+WORK_TYPES = ("Tam Zamanlı", "Yarı Zamanlı", "Freelance", "Remote", "Hibrit")
+
+# Careerjet contract type codes per work type
+CONTRACT_TYPES = {"Tam Zamanlı": "p", "Yarı Zamanlı": "p", "Freelance": "c", "Remote": "p", "Hibrit": "p"}
+
+SKILL_SETS = {
+    "developer": ("React", "JavaScript", "TypeScript", "Node.js", "Python", "Git", "Docker"),
+    "frontend": ("React", "Vue.js", "Angular", "HTML", "CSS", "JavaScript", "Webpack"),
+    "backend": ("Node.js", "Python", "Java", "C#", "PostgreSQL", "MongoDB", "Redis"),
+    "mobile": ("React Native", "Flutter", "Swift", "Kotlin", "iOS", "Android"),
+    "data": ("Python", "R", "SQL", "Machine Learning", "TensorFlow", "Pandas"),
+    "devops": ("Docker", "Kubernetes", "AWS", "Jenkins", "Terraform", "Linux"),
+}
+DEFAULT_SKILLS = SKILL_SETS["developer"]
+
+FILLER = tuple((
+    "Ekibimize katılacak, yenilikçi projelerde görev alacak, takım çalışmasına yatkın "
+    "çalışma arkadaşları arıyoruz. We are looking for a motivated engineer to join our "
+    "fast-growing product team and help us build reliable services for millions of users. "
+).split())
+
+# Every (level, team, company) combination; a query walks it in a permuted order so
+# the first len(COMBINATIONS) jobs never repeat a title/company pair
+COMBINATIONS = len(LEVELS) * len(TEAMS) * len(COMPANIES)
+
+
+# Distinct filler blocks per corpus; a job picks one instead of drawing words one by one
+FILLER_BLOCKS = 256
+
+# Posting dates go back this many days from the reference date
+POSTING_DAYS = 30
+
+
+def _coprime_step(n):
+    step = int(n * 0.618) | 1
+    while math.gcd(step, n) != 1:
+        step += 2
+    return step
+
+
+COMBINATION_STEP = _coprime_step(COMBINATIONS)
+
+
+class JobCorpus:
+    """
+    Seeded, lazily generated job corpus.
+
+    Every job is a pure function of (seed, keywords, location, number), so any
+    page can be produced without generating the ones before it and the same
+    query always yields the same jobs. Nothing is stored per job; iterating
+    over millions of jobs runs in constant memory.
+    """
+
+    def __init__(self, seed=0, size=1_000_000, description_words=0, reference_date=None,
+                 url_base="https://example.com", site="example.com"):
+        """
+        Args:
+            seed (int): Corpus seed; another seed gives another corpus
+            size (int): Number of jobs per query
+            description_words (int): Filler words appended to each description
+                (0 keeps the short template text)
+            reference_date (date): Posting dates are up to 30 days before it;
+                fix it to make output identical across days (default: today)
+            url_base (str): Job URLs are ``{url_base}/job/{query_id}/{number}``
+            site (str): Value of the Careerjet ``site`` field
+        """
+        self.seed = seed
+        self.size = size
+        self.description_words = description_words
+        self.reference_date = reference_date
+        self.url_base = url_base.rstrip("/")
+        self.site = site
+        filler_rng = random.Random(seed)
+        self._filler = tuple(
+            " " + " ".join(filler_rng.choices(FILLER, k=description_words)) for _ in range(FILLER_BLOCKS)
+        ) if description_words else None
+        self._dates_for = None
+        self._dates = ()
+
+    def _posting_dates(self):
+        day = self.reference_date or date.today()
+        if day != self._dates_for:
+            self._dates = tuple((day - timedelta(days=days)).isoformat() for days in range(POSTING_DAYS))
+            self._dates_for = day
+        return self._dates
+
+    def query_id(self, keywords, location):
+        """Stable numeric id of a query (case-insensitive)."""
+        key = f"{self.seed}|{keywords.strip().lower()}|{location.strip().lower()}"
+        return zlib.crc32(key.encode("utf-8"))
+
+    def job(self, keywords, location, number, style="careerjet", query_id=None):
+        """
+        Generate job ``number`` (0-based) of a query.
+
+        Args:
+            style (str): "careerjet" for Careerjet API fields, "demo" for the
+                demo response fields (id, location, requirements, type, ...)
+
+        Returns:
+            dict: The job
+        """
+        if query_id is None:
+            query_id = self.query_id(keywords, location)
+        rng = random.Random((query_id << 32) | number)
+
+        combination = (query_id + number * COMBINATION_STEP) % COMBINATIONS
+        combination, company_index = divmod(combination, len(COMPANIES))
+        level_index, team_index = divmod(combination, len(TEAMS))
+        level = LEVELS[level_index]
+        company = COMPANIES[company_index]
+        title = f"{level} {keywords} - {TEAMS[team_index]}"
+
+        work_type = WORK_TYPES[rng.randrange(len(WORK_TYPES))]
+        skills = rng.sample(_skills_for(keywords), 4)
+        low, high = SALARY_RANGES[level]
+        salary_min = low + rng.randrange(0, (high - low) // 2, 500)
+        salary_max = high - rng.randrange(0, (high - low) // 2, 500)
+        salary = f"{salary_min:,} - {salary_max:,} TL"
+        posted = self._posting_dates()[rng.randrange(POSTING_DAYS)]
+
+        description = (
+            f"{company} bünyesinde {level.lower()} seviye {keywords} pozisyonu için aday aranmaktadır. "
+            f"Aranan yetkinlikler: {', '.join(skills)}. Modern teknolojiler ile çalışma, esnek çalışma "
+            "saatleri ve profesyonel gelişim fırsatları sunulmaktadır."
+        )
+        if self._filler:
+            description += self._filler[rng.randrange(FILLER_BLOCKS)]
+
+        url = f"{self.url_base}/job/{query_id}/{number}"
+        place = location if work_type != "Remote" else f"{location} (Remote)"
+        if style == "demo":
+            return {
+                "id": f"demo_{query_id:x}_{number}",
+                "title": title,
+                "company": company,
+                "location": place,
+                "salary": salary,
+                "description": description,
+                "requirements": skills,
+                "type": work_type,
+                "url": url,
+                "date": posted,
+                "posted_date": posted,
+            }
+        return {
+            "title": title,
+            "company": company,
+            "locations": place,
+            "date": posted,
+            "description": description,
+            "salary": salary,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_type": "M",
+            "salary_currency_code": "TRY",
+            "contracttype": CONTRACT_TYPES[work_type],
+            "site": self.site,
+            "url": url,
+        }
+
+    def iter_jobs(self, keywords, location, start=0, stop=None, style="careerjet"):
+        """Yield jobs ``start``..``stop`` (default: the whole query) one at a time."""
+        query_id = self.query_id(keywords, location)
+        stop = self.size if stop is None else min(stop, self.size)
+        for number in range(start, stop):
+            yield self.job(keywords, location, number, style, query_id)
+
+    def page(self, keywords, location, page=1, pagesize=20, style="careerjet"):
+        """Return one result page (1-based) of a query."""
+        start = (max(1, page) - 1) * pagesize
+        return list(self.iter_jobs(keywords, location, start, start + pagesize, style))
+
+
+def _skills_for(keywords):
+    lowered = keywords.lower()
+    for key, skills in SKILL_SETS.items():
+        if key in lowered:
+            return skills
+    return DEFAULT_SKILLS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic job corpus as NDJSON (one job per line).")
+    parser.add_argument("--keywords", default="developer")
+    parser.add_argument("--location", default="Istanbul")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--description-words", type=int, default=0)
+    parser.add_argument("--reference-date", default="2024-01-31", help="ISO date that posting dates count back from")
+    parser.add_argument("--style", choices=("careerjet", "demo"), default="careerjet")
+    args = parser.parse_args()
+
+    corpus = JobCorpus(seed=args.seed, size=args.count, description_words=args.description_words,
+                       reference_date=date.fromisoformat(args.reference_date))
+    write = sys.stdout.write
+    try:
+        for job in corpus.iter_jobs(args.keywords, args.location, style=args.style):
+            write(json.dumps(job, ensure_ascii=False) + "\n")
+    except BrokenPipeError:
+        # Output was cut short (e.g. piped into head)
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,622 @@
+import codecs
+import ipaddress
+import json
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from cache import SingleFlight, TTLCache
+from metrics import stage
+
+# Elements without an end tag; they never change the nesting depth
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Elements whose text is never part of a job description
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "form", "button"}
+
+# Elements that start a new line in extracted text
+_BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section", "article"}
+
+# class/id fragments that mark the description container on job pages
+_DESCRIPTION_MARKERS = ("job-description", "jobdescription", "description", "job-details", "content")
+
+# Hosts (and their subdomains) job pages may be requested from. Careerjet
+# result URLs point at its own sites or at the jobviewtrack.com redirector
+DEFAULT_ALLOWED_HOSTS = (
+    "careerjet.com", "careerjet.co.uk", "careerjet.de", "careerjet.fr", "careerjet.es", "careerjet.it",
+    "careerjet.com.tr", "jobviewtrack.com",
+)
+
+
+# Byte order marks win over any declared charset
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+_HEADER_CHARSET = re.compile(r"""charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+# <meta charset="..."> as well as <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+
+class UnsafeURLError(ValueError):
+    """Raised for a job URL the details fetcher refuses to request."""
+
+
+def host_allowed(host, allowed_hosts):
+    """True if ``host`` is one of ``allowed_hosts`` or a subdomain of one."""
+    host = (host or "").lower().rstrip(".")
+    return any(host == allowed or host.endswith("." + allowed) for allowed in allowed_hosts)
+
+
+def check_job_url(url, allowed_hosts=DEFAULT_ALLOWED_HOSTS, resolve=False):
+    """
+    Validate a job page URL before it is requested.
+
+    Args:
+        url (str): URL to check
+        allowed_hosts (iterable): Allowed hosts; None accepts any host
+        resolve (bool): Also resolve the host and reject it unless every
+            address is public (no loopback, private, link-local or reserved
+            ranges such as cloud metadata endpoints)
+
+    Returns:
+        str: The lower-cased host name
+
+    Raises:
+        UnsafeURLError: If the URL must not be fetched
+        OSError: If ``resolve`` is set and the host does not resolve
+    """
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        raise UnsafeURLError(f"Invalid job URL: {url!r}")
+    if parts.scheme not in ("http", "https") or not host:
+        raise UnsafeURLError("Job URL must be an absolute http(s) URL")
+    if parts.username or parts.password:
+        raise UnsafeURLError("Job URL must not contain credentials")
+    if allowed_hosts is not None and not host_allowed(host, allowed_hosts):
+        raise UnsafeURLError(f"Job pages from {host} are not allowed")
+
+    if resolve:
+        # A name that does not resolve is a fetch error, not a rejection
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port or parts.scheme, type=socket.SOCK_STREAM)}
+        for address in addresses:
+            if not ipaddress.ip_address(address.split("%", 1)[0]).is_global:
+                raise UnsafeURLError(f"{host} resolves to a non-public address ({address})")
+    return host.lower()
+
+
+def check_peer(response):
+    """
+    Reject a response whose connection ended up at a non-public address.
+
+    ``check_job_url`` validates what the host resolved to before the request,
+    but the HTTP client resolves it again when it connects; a DNS-rebinding
+    host can answer with a public address first and an internal one second.
+    The connected socket's peer address is what the body would come from.
+
+    Raises:
+        UnsafeURLError: If the peer is not public or cannot be determined
+    """
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    if sock is None:
+        raise UnsafeURLError("Could not verify the address the job page was fetched from")
+    address = sock.getpeername()[0]
+    if not ipaddress.ip_address(address.split("%", 1)[0]).is_global:
+        raise UnsafeURLError(f"Job page connection went to a non-public address ({address})")
+
+
+def _codec(name):
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def decode_html(body, content_type=None):
+    """
+    Decode an HTML page body.
+
+    The encoding comes from a byte order mark, the Content-Type charset or a
+    <meta> charset declaration near the top of the page. Undeclared pages are
+    decoded as UTF-8 when they are valid UTF-8 and otherwise with the
+    detected encoding, falling back to ISO-8859-1. (``requests`` assumes
+    ISO-8859-1 for any text/html response without a charset, which garbles
+    UTF-8 Turkish pages.)
+
+    Args:
+        body (bytes): Raw response body
+        content_type (str): Content-Type header value
+
+    Returns:
+        str: Decoded page
+    """
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return body.decode(encoding, errors="replace")
+
+    declared = _HEADER_CHARSET.search(content_type or "")
+    encoding = declared and _codec(declared.group(1))
+    if not encoding:
+        declared = _META_CHARSET.search(body[:4096])
+        encoding = declared and _codec(declared.group(1).decode("ascii", "replace"))
+    if encoding:
+        return body.decode(encoding, errors="replace")
+
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    from requests.compat import chardet
+
+    detected = chardet.detect(body).get("encoding") if chardet is not None else None
+    return body.decode((detected and _codec(detected)) or "iso-8859-1", errors="replace")
+
+
+class _PageParser(HTMLParser):
+    """Collects JSON-LD blocks, meta tags, <title>, the first <h1> and readable text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.meta = {}
+        self.title = []
+        self.h1 = []
+        self.text = []
+        self.description = []
+        self._stack = []
+        self._script_ld = None
+        self._skip_depth = None
+        self._h1_depth = None
+        self._description_depth = None
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or attrs.get("itemprop") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"]
+            return
+        if tag in _VOID_TAGS:
+            if tag == "br":
+                self._newline()
+            return
+
+        self._stack.append(tag)
+        depth = len(self._stack)
+        if tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._script_ld = []
+        elif tag in _SKIP_TAGS and self._skip_depth is None:
+            self._skip_depth = depth
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and not self.h1 and self._h1_depth is None:
+            self._h1_depth = depth
+
+        if self._description_depth is None and not self.description:
+            marker = " ".join(filter(None, [attrs.get("id"), attrs.get("class"), attrs.get("itemprop")])).lower()
+            if any(fragment in marker for fragment in _DESCRIPTION_MARKERS):
+                self._description_depth = depth
+        if tag in _BLOCK_TAGS:
+            self._newline()
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS or tag not in self._stack:
+            return
+        # Close any unclosed children as well
+        while self._stack:
+            depth = len(self._stack)
+            closed = self._stack.pop()
+            if self._script_ld is not None and closed == "script":
+                self.json_ld.append("".join(self._script_ld))
+                self._script_ld = None
+            if self._skip_depth == depth:
+                self._skip_depth = None
+            if self._h1_depth == depth:
+                self._h1_depth = None
+            if self._description_depth == depth:
+                self._description_depth = None
+            if closed == "title":
+                self._in_title = False
+            if closed in _BLOCK_TAGS:
+                self._newline()
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self._script_ld is not None:
+            self._script_ld.append(data)
+            return
+        if self._in_title:
+            self.title.append(data)
+            return
+        if self._skip_depth is not None:
+            return
+        if self._h1_depth is not None:
+            self.h1.append(data)
+        self.text.append(data)
+        if self._description_depth is not None:
+            self.description.append(data)
+
+    def _newline(self):
+        self.text.append("\n")
+        if self._description_depth is not None:
+            self.description.append("\n")
+
+
+def _clean_text(parts):
+    lines = (" ".join(line.split()) for line in "".join(parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def html_to_text(html):
+    """Convert an HTML fragment (e.g. a JSON-LD description) to plain text with line breaks."""
+    if not html:
+        return ""
+    if "<" not in html:
+        # Some sites entity-escape the markup inside JSON-LD
+        html = unescape(html)
+        if "<" not in html:
+            return _clean_text([html])
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return _clean_text(parser.text)
+
+
+def _find_job_posting(node):
+    if isinstance(node, list):
+        for item in node:
+            found = _find_job_posting(item)
+            if found:
+                return found
+    elif isinstance(node, dict):
+        types = node.get("@type")
+        types = types if isinstance(types, list) else [types]
+        if "JobPosting" in types:
+            return node
+        if "@graph" in node:
+            return _find_job_posting(node["@graph"])
+    return None
+
+
+def _name(value):
+    if isinstance(value, dict):
+        return value.get("name")
+    if isinstance(value, list):
+        return _name(value[0]) if value else None
+    return value
+
+
+def _location(value):
+    places = value if isinstance(value, list) else [value]
+    names = []
+    for place in places:
+        if not isinstance(place, dict):
+            if place:
+                names.append(str(place))
+            continue
+        address = place.get("address", place)
+        if isinstance(address, str):
+            names.append(address)
+            continue
+        parts = [address.get(key) for key in ("addressLocality", "addressRegion", "addressCountry")]
+        parts = [_name(part) for part in parts if part]
+        if parts:
+            names.append(", ".join(dict.fromkeys(parts)))
+    return "; ".join(names) or None
+
+
+def _salary(value):
+    if not isinstance(value, dict):
+        return value or None
+    amount = value.get("value")
+    salary = {"currency": value.get("currency")}
+    if isinstance(amount, dict):
+        salary.update({
+            "min": amount.get("minValue"),
+            "max": amount.get("maxValue"),
+            "value": amount.get("value"),
+            "unit": amount.get("unitText"),
+        })
+    else:
+        salary["value"] = amount
+    return {key: val for key, val in salary.items() if val is not None} or None
+
+
+def parse_job_page(html, url=None):
+    """
+    Parse a job posting page into structured fields.
+
+    schema.org ``JobPosting`` JSON-LD is used when the page has it; otherwise
+    the fields come from meta tags, the title, the first <h1> and the page
+    text (preferring an element marked as the job description).
+
+    Args:
+        html (str): Page HTML
+        url (str): URL the page was fetched from
+
+    Returns:
+        dict: job_url, title, company, location, description, date_posted,
+            valid_through, employment_type, salary, apply_url, source
+    """
+    parser = _PageParser()
+    parser.feed(html or "")
+    parser.close()
+
+    posting = None
+    for block in parser.json_ld:
+        try:
+            posting = _find_job_posting(json.loads(block))
+        except ValueError:
+            continue
+        if posting:
+            break
+
+    meta = parser.meta
+    if posting:
+        employment_type = posting.get("employmentType")
+        if isinstance(employment_type, list):
+            employment_type = ", ".join(employment_type)
+        details = {
+            "title": posting.get("title") or _name(posting.get("name")),
+            "company": _name(posting.get("hiringOrganization")),
+            "location": _location(posting.get("jobLocation")) or _name(posting.get("applicantLocationRequirements")),
+            "description": html_to_text(posting.get("description")),
+            "date_posted": posting.get("datePosted"),
+            "valid_through": posting.get("validThrough"),
+            "employment_type": employment_type,
+            "salary": _salary(posting.get("baseSalary")),
+            "apply_url": posting.get("url") or url,
+            "source": "json-ld",
+        }
+    else:
+        description = _clean_text(parser.description) or _clean_text(parser.text)
+        details = {
+            "title": meta.get("og:title") or _clean_text(parser.h1) or _clean_text(parser.title),
+            "company": meta.get("og:site_name"),
+            "location": None,
+            "description": description or meta.get("og:description") or meta.get("description"),
+            "date_posted": None,
+            "valid_through": None,
+            "employment_type": None,
+            "salary": None,
+            "apply_url": meta.get("og:url") or url,
+            "source": "html",
+        }
+    details["job_url"] = url
+    return details
+
+
+def _accept_language(locale):
+    if not locale:
+        return None
+    language = locale.replace("_", "-")
+    primary = language.split("-")[0]
+    return f"{language},{primary};q=0.9,en;q=0.5"
+
+
+class DetailsEngine:
+    """
+    Fetches, parses and caches job detail pages.
+
+    Parsed details are cached for ``ttl`` seconds. After that the page is
+    re-requested with If-None-Match / If-Modified-Since, so an unchanged page
+    costs a 304 instead of a download and re-parse. Concurrent requests for
+    the same URL share one fetch, and ``prefetch`` loads many pages on a
+    bounded pool so opening a detail view is usually a cache hit.
+    """
+
+    def __init__(self, fetch=None, ttl=3600, max_entries=2048, max_workers=4, timeout=10,
+                 allowed_hosts=DEFAULT_ALLOWED_HOSTS, allow_private=False, max_bytes=2_000_000, max_redirects=3):
+        """
+        Args:
+            fetch (callable): ``fetch(url, headers) -> (status, headers, text)``;
+                defaults to a GET through the shared pages session. Pass a
+                fixture reader to run against local HTML files.
+            ttl (float): Seconds parsed details are served without revalidation
+            max_entries (int): Maximum cached pages
+            max_workers (int): Parallel fetches during prefetch
+            timeout (float): HTTP timeout in seconds
+            allowed_hosts (iterable): Hosts job URLs may point at (subdomains
+                included); None accepts any host
+            allow_private (bool): Allow hosts that resolve to loopback or
+                private addresses (only for a local stand-in upstream)
+            max_bytes (int): Largest page body read; bigger pages are an error
+            max_redirects (int): Redirects followed per fetch
+        """
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.allowed_hosts = tuple(allowed_hosts) if allowed_hosts is not None else None
+        self.allow_private = allow_private
+        self.max_bytes = max_bytes
+        self.max_redirects = max_redirects
+        self.cache = TTLCache(ttl=ttl, max_entries=max_entries, stale_ttl=0)
+        self._fetch = fetch or self._http_fetch
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="details-prefetch")
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    def _http_fetch(self, url, headers):
+        from upstream import registry
+
+        session = registry.pages_session()
+        for _ in range(self.max_redirects + 1):
+            # Every hop is re-checked, so an allowed host cannot redirect the
+            # fetch to another site or to an internal address
+            check_job_url(url, self.allowed_hosts, resolve=not self.allow_private)
+            with session.get(url, headers=headers, timeout=self.timeout, stream=True, allow_redirects=False) as response:
+                if not self.allow_private:
+                    check_peer(response)
+                if response.is_redirect:
+                    url = urljoin(url, response.headers["location"])
+                    continue
+                return response.status_code, response.headers, self._read_body(response)
+        raise UnsafeURLError(f"More than {self.max_redirects} redirects")
+
+    def _read_body(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise ValueError(f"Job page is larger than {self.max_bytes} bytes")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ValueError(f"Job page is larger than {self.max_bytes} bytes")
+            chunks.append(chunk)
+        return decode_html(b"".join(chunks), response.headers.get("content-type"))
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, url, locale=None):
+        """
+        Return parsed details for ``url``.
+
+        The result carries ``cache``: "hit" (served from memory), "revalidated"
+        (upstream answered 304), "miss" (downloaded and parsed) or "stale"
+        (re-fetch failed, last parsed copy served).
+
+        Returns:
+            dict: Parsed details, or {"job_url", "error"} if the page could not
+                be loaded; "rejected" is True when the URL is not allowed
+        """
+        try:
+            check_job_url(url, self.allowed_hosts)
+        except UnsafeURLError as e:
+            return {"job_url": url, "error": str(e), "rejected": True}
+        entry = self.cache.get(url)
+        if entry is not None:
+            return dict(entry["details"], cache="hit")
+        return self._flight.do(url, lambda: self._load(url, locale))
+
+    def peek(self, url):
+        """
+        Return details already parsed for ``url`` without any network access.
+
+        Returns:
+            dict: Details with ``cache`` "hit", or "stale" when past the TTL;
+                None if the page was never loaded
+        """
+        entry = self.cache.get(url)
+        if entry is not None:
+            return dict(entry["details"], cache="hit")
+        entry = self.cache.peek(url)
+        return dict(entry["details"], cache="stale") if entry is not None else None
+
+    def _load(self, url, locale):
+        previous = self.cache.peek(url)
+        headers = {"Accept": "text/html,application/xhtml+xml"}
+        language = _accept_language(locale)
+        if language:
+            headers["Accept-Language"] = language
+        if previous is not None:
+            if previous["etag"]:
+                headers["If-None-Match"] = previous["etag"]
+            if previous["last_modified"]:
+                headers["If-Modified-Since"] = previous["last_modified"]
+
+        try:
+            with stage("details_fetch"):
+                status, response_headers, body = self._fetch(url, headers)
+        except UnsafeURLError as e:
+            self._count("errors")
+            return {"job_url": url, "error": str(e), "rejected": True}
+        except Exception as e:
+            self._count("errors")
+            if previous is not None:
+                return dict(previous["details"], cache="stale")
+            return {"job_url": url, "error": f"Failed to get job details: {e}"}
+
+        if status == 304 and previous is not None:
+            self._count("not_modified")
+            self.cache.set(url, previous)
+            return dict(previous["details"], cache="revalidated")
+
+        if status != 200:
+            self._count("errors")
+            if previous is not None:
+                return dict(previous["details"], cache="stale")
+            return {"job_url": url, "error": f"Job page returned status {status}", "status_code": status}
+
+        with stage("details_parse"):
+            details = parse_job_page(body, url)
+        response_headers = {key.lower(): value for key, value in (response_headers or {}).items()}
+        self.cache.set(url, {
+            "details": details,
+            "etag": response_headers.get("etag"),
+            "last_modified": response_headers.get("last-modified"),
+        })
+        self._count("fetched")
+        return dict(details, cache="miss")
+
+    def prefetch(self, urls, locale=None, wait=True):
+        """
+        Load details for many URLs concurrently (at most ``max_workers`` at a time).
+
+        Args:
+            urls (list): Job page URLs; duplicates and empty values are ignored
+            locale (str): Locale used for Accept-Language
+            wait (bool): Block until all pages are loaded; with False the
+                fetches continue in the background
+
+        Returns:
+            dict: {"requested", "queued"} without waiting, otherwise also
+                "fetched", "cached", "errors" and the "details" per URL in input order
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        futures = [self._executor.submit(self.get, url, locale) for url in urls]
+        if not wait:
+            return {"requested": len(urls), "queued": len(futures)}
+
+        details = [future.result() for future in futures]
+        return {
+            "requested": len(urls),
+            "fetched": sum(1 for item in details if item.get("cache") == "miss"),
+            "cached": sum(1 for item in details if item.get("cache") in ("hit", "revalidated")),
+            "errors": sum(1 for item in details if "error" in item),
+            "details": details,
+        }
+
+    def stats(self):
+        stats = self.cache.stats()
+        with self._lock:
+            stats.update({"fetched": self.fetched, "not_modified": self.not_modified, "errors": self.errors})
+        return stats
+
+
+def fixture_fetcher(directory):
+    """
+    Return a ``fetch`` callable that serves HTML files from ``directory``.
+
+    The last path segment of the URL names the file (``.html`` is appended
+    when missing). The file's mtime is used as ETag and Last-Modified, so
+    conditional requests answer 304 until the file changes.
+    """
+    def fetch(url, headers):
+        name = re.sub(r"[?#].*$", "", url).rstrip("/").rsplit("/", 1)[-1]
+        path = os.path.join(directory, name if name.endswith(".html") else name + ".html")
+        if not os.path.isfile(path):
+            return 404, {}, ""
+        mtime = os.path.getmtime(path)
+        etag = f'"{int(mtime * 1000):x}"'
+        last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))
+        response_headers = {"ETag": etag, "Last-Modified": last_modified}
+        if headers.get("If-None-Match") == etag:
+            return 304, response_headers, ""
+        with open(path, "rb") as f:
+            return 200, response_headers, decode_html(f.read())
+
+    return fetch
@@ -0,0 +1,67 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from cache import normalize_query_value
+
+# Query parameters that only track the click source and never identify a job
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'referrer', 'src', 'source'}
+
+
+def normalize_job_url(url):
+    """
+    Normalize a job URL so the same posting always yields the same string.
+
+    Lowercases scheme and host, drops the fragment, "www.", default ports,
+    tracking parameters (utm_*, gclid, ...) and a trailing slash, and sorts
+    the remaining query parameters.
+
+    Args:
+        url (str): Job posting URL
+
+    Returns:
+        str: Normalized URL
+    """
+    parts = urlsplit((url or '').strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ''))
+
+
+def job_content_key(job):
+    """
+    Fingerprint a posting by its normalized title, company and location.
+
+    Careerjet serves the same posting under different URLs on different
+    locale sites; this key lets those copies be recognised as one job.
+    """
+    if not job.get('title') or not job.get('company'):
+        return None
+    location = job.get('locations') or job.get('location') or ''
+    return '\x1f'.join(normalize_query_value(value) for value in (job['title'], job['company'], location))
+
+
+def job_id(job):
+    """
+    Return a stable, content-addressed ID for a job.
+
+    The ID is a 64-bit BLAKE2b hash of the normalized URL (or of title,
+    company and location when there is no URL), so it is identical across
+    restarts, worker processes and hosts.
+
+    Args:
+        job (dict): Job dict as returned by the upstream API
+
+    Returns:
+        str: 16-character hex ID
+    """
+    url = job.get('url')
+    source = normalize_job_url(url) if url else (job_content_key(job) or job.get('title', ''))
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
@@ -0,0 +1,265 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from job_identity import job_content_key, job_id
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs_index.db")
+
+# Retention is enforced after this many ingest calls, not on every one
+_PRUNE_EVERY = 50
+
+# Bumped when the jobs table changes; older index files are rebuilt from scratch
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    content_key TEXT,
+    url TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    locations TEXT,
+    locale TEXT,
+    date TEXT,
+    payload TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+CREATE INDEX IF NOT EXISTS jobs_content_key ON jobs(content_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description, locations,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def normalize_search_text(text):
+    """
+    Fold text the same way for indexing and querying.
+
+    The FTS tokenizer strips diacritics (ş, ğ, ü, ...) but keeps Turkish
+    dotless "ı" and the combining dot of "İ", so those are folded here.
+    """
+    return (text or "").casefold().replace("\u0307", "").replace("ı", "i")
+
+
+def _match_terms(text):
+    return [f'"{token}"*' for token in re.findall(r"\w+", normalize_search_text(text))]
+
+
+class JobIndex:
+    """
+    On-disk job store with SQLite FTS5 full-text search.
+
+    Listings are keyed by the same stable ``job_id`` used everywhere else
+    (normalized URL, so tracking parameters do not matter) and matched by
+    title/company/location as well, so ingesting the same posting again,
+    even from another locale site, only refreshes its row. Retention is bounded by ``max_jobs`` and ``max_age_days``;
+    the least recently seen jobs are dropped first.
+    """
+
+    def __init__(self, path, max_jobs=50000, max_age_days=30):
+        self.path = path
+        self.max_jobs = max_jobs
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            # Index rows are only copies of search results; old files keyed by raw URL are dropped
+            self._conn.executescript(f"""
+                DROP TABLE IF EXISTS jobs;
+                DROP TABLE IF EXISTS jobs_fts;
+                PRAGMA user_version = {_SCHEMA_VERSION};
+            """)
+        self._conn.executescript(_SCHEMA)
+        self._ingest_calls = 0
+        self.ingested = 0
+        self.pruned = 0
+
+    def ingest(self, jobs, locale=None):
+        """
+        Insert or refresh job listings, deduplicated by job ID and content key.
+
+        Args:
+            jobs (list): Job dicts as returned by the Careerjet API
+            locale (str): Locale the jobs were fetched for
+
+        Returns:
+            int: Number of listings written
+        """
+        now = time.time()
+        rows = {}
+        for job in jobs:
+            if job.get('url'):
+                rows[job_id(job)] = job
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            for key, job in rows.items():
+                content_key = job_content_key(job)
+                locations = job.get('locations') or job.get('location') or ''
+                values = (job['url'], job.get('title', ''), job.get('company', ''), locations, locale,
+                          job.get('date', ''), json.dumps(job, ensure_ascii=False), now)
+                # The same posting may come back under another locale site's URL
+                existing = self._conn.execute(
+                    "SELECT id FROM jobs WHERE job_key = ? OR content_key = ? ORDER BY job_key = ? DESC LIMIT 1",
+                    (key, content_key, key),
+                ).fetchone()
+                if existing is not None:
+                    row_id = existing[0]
+                    self._conn.execute(
+                        """
+                        UPDATE jobs SET url = ?, title = ?, company = ?, locations = ?, locale = ?, date = ?,
+                            payload = ?, last_seen = ?
+                        WHERE id = ?
+                        """,
+                        values + (row_id,),
+                    )
+                    self._conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (row_id,))
+                else:
+                    row_id = self._conn.execute(
+                        """
+                        INSERT INTO jobs (url, title, company, locations, locale, date, payload, last_seen,
+                                          job_key, content_key, first_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        values + (key, content_key, now),
+                    ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO jobs_fts (rowid, title, company, description, locations) VALUES (?, ?, ?, ?, ?)",
+                    (row_id,
+                     normalize_search_text(job.get('title', '')),
+                     normalize_search_text(job.get('company', '')),
+                     normalize_search_text(job.get('description', '')),
+                     normalize_search_text(locations)),
+                )
+            self.ingested += len(rows)
+            self._ingest_calls += 1
+            if self._ingest_calls % _PRUNE_EVERY == 0:
+                self._prune(now)
+        return len(rows)
+
+    def _prune(self, now):
+        cutoff = now - self.max_age_days * 86400
+        stale = [row[0] for row in self._conn.execute("SELECT id FROM jobs WHERE last_seen < ?", (cutoff,))]
+        overflow = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - len(stale) - self.max_jobs
+        if overflow > 0:
+            stale += [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE last_seen >= ? ORDER BY last_seen LIMIT ?", (cutoff, overflow))]
+        if stale:
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(row_id,) for row_id in stale])
+            self._conn.executemany("DELETE FROM jobs_fts WHERE rowid = ?", [(row_id,) for row_id in stale])
+            self.pruned += len(stale)
+
+    def prune(self):
+        """Apply the retention policy now."""
+        with self._lock, self._conn:
+            self._prune(time.time())
+
+    def search(self, keywords, location=None, locale=None, page=1, pagesize=20):
+        """
+        Full-text search over title, company, description and location.
+
+        Args:
+            keywords (str): Keywords (all terms must match, prefix matching)
+            location (str): Optional location terms, matched against the location column
+            locale (str): Optional locale filter
+            page (int): Page number (>= 1)
+            pagesize (int): Jobs per page
+
+        Returns:
+            dict: Careerjet-shaped result with "hits", "pages" and "jobs"
+        """
+        terms = _match_terms(keywords)
+        location_terms = _match_terms(location)
+        if location_terms:
+            terms.append("locations : (" + " AND ".join(location_terms) + ")")
+        query = " AND ".join(terms)
+        if not query:
+            return {'type': 'JOBS', 'source': 'index', 'hits': 0, 'pages': 0, 'jobs': []}
+
+        page = max(1, int(page))
+        pagesize = max(1, int(pagesize))
+        where = "jobs_fts MATCH ?"
+        params = [query]
+        if locale:
+            where += " AND jobs.locale = ?"
+            params.append(locale)
+
+        with self._lock:
+            hits = self._conn.execute(
+                f"SELECT COUNT(*) FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT jobs.payload FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE {where}
+                ORDER BY bm25(jobs_fts, 10.0, 3.0, 1.0, 2.0), jobs.last_seen DESC
+                LIMIT ? OFFSET ?
+                """,
+                params + [pagesize, (page - 1) * pagesize],
+            ).fetchall()
+
+        return {
+            'type': 'JOBS',
+            'source': 'index',
+            'hits': hits,
+            'pages': -(-hits // pagesize),
+            'jobs': [json.loads(row[0]) for row in rows],
+        }
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return {
+            'path': self.path,
+            'jobs': count,
+            'max_jobs': self.max_jobs,
+            'max_age_days': self.max_age_days,
+            'ingested': self.ingested,
+            'pruned': self.pruned,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_disabled = False
+_default_lock = threading.Lock()
+
+
+def get_job_index():
+    """
+    Return the process-wide job index, opening it on first use.
+
+    The database path comes from ``CAREER_JOB_INDEX_PATH`` (default:
+    ``jobs_index.db`` next to this module); set it to an empty string to
+    disable the index. Returns None when disabled or when it cannot be opened.
+    """
+    global _default_index, _default_disabled
+    if _default_index is None and not _default_disabled:
+        with _default_lock:
+            if _default_index is None and not _default_disabled:
+                path = os.environ.get("CAREER_JOB_INDEX_PATH", DEFAULT_INDEX_PATH)
+                try:
+                    if path:
+                        _default_index = JobIndex(
+                            path,
+                            max_jobs=int(os.environ.get("CAREER_JOB_INDEX_MAX_JOBS", "50000")),
+                            max_age_days=float(os.environ.get("CAREER_JOB_INDEX_MAX_AGE_DAYS", "30")),
+                        )
+                except sqlite3.Error:
+                    pass
+                _default_disabled = _default_index is None
+    return _default_index
@@ -0,0 +1,234 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from in-memory work up to upstream timeouts
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, values, value) for values, value in sorted(self._values.items())]
+
+    def snapshot(self):
+        with self._lock:
+            return {",".join(values) or "total": value for values, value in sorted(self._values.items())}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with optional labels."""
+
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    result.append((self.name + "_bucket", values, cumulative, f'le="{_format_value(bound)}"'))
+                result.append((self.name + "_sum", values, total))
+                result.append((self.name + "_count", values, count))
+        return result
+
+    def _quantile(self, counts, count, q):
+        rank = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Return count, mean and bucket-estimated percentiles (ms) per label set."""
+        with self._lock:
+            series = {values: (list(counts), total, count) for values, (counts, total, count) in self._series.items()}
+        result = {}
+        for values, (counts, total, count) in sorted(series.items()):
+            def ms(seconds):
+                return None if seconds == float("inf") else round(seconds * 1000, 3)
+            result[",".join(values) or "total"] = {
+                "count": count,
+                "mean_ms": round(total / count * 1000, 3) if count else None,
+                "p50_ms": ms(self._quantile(counts, count, 0.5)),
+                "p95_ms": ms(self._quantile(counts, count, 0.95)),
+                "p99_ms": ms(self._quantile(counts, count, 0.99)),
+            }
+        return result
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name, help, func, labels=()):
+        """
+        Args:
+            func (callable): Returns a number, or a dict mapping label value
+                tuples to numbers when ``labels`` is set
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.func = func
+
+    def _read(self):
+        try:
+            value = self.func()
+        except Exception:
+            return {}
+        return value if isinstance(value, dict) else {(): value}
+
+    def samples(self):
+        return [(self.name, values, value) for values, value in sorted(self._read().items())]
+
+    def snapshot(self):
+        return {",".join(values) or "value": value for values, value in sorted(self._read().items())}
+
+
+class CallbackCounter(Gauge):
+    """Counter whose total is kept elsewhere and read from a callback at scrape time."""
+
+    type = "counter"
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name, help, func, labels=()):
+        return self._register(Gauge(name, help, func, labels))
+
+    def callback_counter(self, name, help, func, labels=()):
+        return self._register(CallbackCounter(name, help, func, labels))
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample in metric.samples():
+                name, values, value = sample[:3]
+                extra = sample[3] if len(sample) > 3 else None
+                lines.append(f"{name}{_format_labels(metric.labels, values, extra)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+
+# Process-wide registry; in multi-worker mode every worker exports its own
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram(
+    "career_stage_seconds", "Time spent in each stage of a job search", labels=("stage",))
+upstream_responses = registry.counter(
+    "career_upstream_responses_total", "Careerjet API responses by HTTP status or error", labels=("status",))
+search_paths = registry.counter(
+    "career_search_path_total", "Searches that went past the cache, by the path that produced the result",
+    labels=("path",))
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a block and record it under ``career_stage_seconds{stage=name}``.
+
+    Usage:
+        with stage("direct_api"):
+            response = session.get(...)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, name)
+
+
+def demo_fallback_rate():
+    """Share of searches past the cache that ended with demo data."""
+    paths = search_paths.snapshot()
+    total = sum(paths.values())
+    return round(paths.get("demo", 0) / total, 4) if total else 0.0
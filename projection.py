@@ -0,0 +1,196 @@
+from job_identity import job_id
+from skills import get_default_matcher
+
+# Canonical job fields shared by the MCP tools and the REST API. Careerjet
+# results and the local index name the location "locations" while demo data
+# uses "location" and carries its own "id" and "requirements"; the readers
+# below fill each canonical field from either shape. Federated searches add
+# "locales", the locales that returned the job.
+JOB_FIELDS = (
+    "id", "title", "company", "location", "date", "description", "requirements", "salary", "salary_min",
+    "salary_max", "salary_type", "salary_currency_code", "site", "url", "locales",
+)
+
+# Other names accepted for canonical fields
+FIELD_ALIASES = {"locations": "location", "postedDate": "date", "posted_date": "date"}
+
+# Fields kept by summary mode: enough to list and pick jobs, no description
+SUMMARY_FIELDS = ("id", "title", "company", "location", "date", "salary", "url", "locales")
+
+_MISSING = object()
+
+
+def _read_location(job):
+    return job.get("locations", job.get("location", _MISSING))
+
+
+def _read_date(job):
+    return job.get("date", job.get("posted_date", _MISSING))
+
+
+def _read_id(job):
+    if "id" in job:
+        return job["id"]
+    return job_id(job) if job.get("url") else _MISSING
+
+
+# Canonical fields whose value may live under another key; other fields are read as is
+FIELD_READERS = {"id": _read_id, "location": _read_location, "date": _read_date}
+
+
+def truncate_text(text, limit):
+    """
+    Shorten ``text`` to at most ``limit`` characters, cutting at a word boundary.
+
+    Returns:
+        str: The text unchanged if it fits, otherwise the cut text ending in "…"
+    """
+    if not isinstance(text, str) or len(text) <= limit:
+        return text
+    if limit <= 1:
+        return "…"[:limit]
+    cut = text[:limit - 1]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+class Projection:
+    """
+    Selects job fields and shortens descriptions in search results.
+
+    Each output job is built in a single pass over the requested fields,
+    without intermediate copies of the full upstream job. Canonical fields
+    are read from either job shape (see FIELD_READERS), and "requirements"
+    is matched from the description when the job does not carry it.
+    """
+
+    __slots__ = ("fields", "max_description_chars", "description_key")
+
+    def __init__(self, fields=None, max_description_chars=None, description_key="description"):
+        """
+        Args:
+            fields (tuple): Job fields to keep, in output order (None keeps all)
+            max_description_chars (int): Maximum description length (None: unlimited)
+            description_key (str): Name of the description field
+        """
+        self.fields = tuple(fields) if fields is not None else None
+        self.max_description_chars = max_description_chars
+        self.description_key = description_key
+
+    def includes(self, field):
+        """Whether ``field`` is part of the output (used to skip work for dropped fields)."""
+        return self.fields is None or field in self.fields
+
+    def job(self, job, requirements=None):
+        """
+        Return the projected copy of one job.
+
+        Args:
+            job (dict): Job in upstream, index or demo shape
+            requirements (list): Skills already matched for this job (matched
+                from the description when needed and not given)
+        """
+        limit = self.max_description_chars
+        key = self.description_key
+        if self.fields is None:
+            if limit is None or key not in job:
+                return job
+            return {name: truncate_text(value, limit) if name == key else value for name, value in job.items()}
+        projected = {}
+        for name in self.fields:
+            if name == "requirements" and "requirements" not in job:
+                value = requirements if requirements is not None else get_default_matcher().match(
+                    job.get(key, ""))
+            else:
+                reader = FIELD_READERS.get(name)
+                value = reader(job) if reader is not None else job.get(name, _MISSING)
+            if value is _MISSING:
+                continue
+            projected[name] = truncate_text(value, limit) if name == key and limit is not None else value
+        return projected
+
+    def jobs(self, jobs):
+        if self.fields is None or "requirements" not in self.fields:
+            return [self.job(job) for job in jobs]
+        # Skills for the whole page are matched in one pass
+        requirements = get_default_matcher().match_many([job.get(self.description_key, "") for job in jobs])
+        return [self.job(job, skills) for job, skills in zip(jobs, requirements)]
+
+    def result(self, result):
+        """
+        Return ``result`` with its jobs projected.
+
+        Handles single results ({"jobs": [...]}) and batch results
+        ({"results": [{"result": {...}}], "merged": {...}}). The input is not
+        modified; it may be a shared cache entry.
+        """
+        if not isinstance(result, dict):
+            return result
+        projected = dict(result)
+        if isinstance(result.get("jobs"), list):
+            projected["jobs"] = self.jobs(result["jobs"])
+        if isinstance(result.get("results"), list):
+            projected["results"] = [
+                dict(item, result=self.result(item["result"])) if isinstance(item, dict) and "result" in item else item
+                for item in result["results"]
+            ]
+        if isinstance(result.get("merged"), dict):
+            projected["merged"] = self.result(result["merged"])
+        return projected
+
+
+def parse_fields(fields, allowed=JOB_FIELDS, aliases=FIELD_ALIASES):
+    """
+    Normalize a field list given as a list or a comma separated string.
+
+    Names in ``aliases`` are replaced by the field they stand for.
+
+    Returns:
+        tuple: Field names without duplicates, or None when no fields were given
+
+    Raises:
+        ValueError: For field names not in ``allowed``
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    names = (name.strip() for name in fields if isinstance(name, str) and name.strip())
+    names = tuple(dict.fromkeys(aliases.get(name, name) for name in names))
+    if not names:
+        return None
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    return names
+
+
+def make_projection(fields=None, max_description_chars=None, summary=False, allowed=JOB_FIELDS,
+                    summary_fields=SUMMARY_FIELDS, description_key="description", aliases=FIELD_ALIASES):
+    """
+    Build a Projection from request options.
+
+    ``fields`` wins over ``summary``; summary mode keeps ``summary_fields``.
+    ``max_description_chars`` applies whenever the description is kept.
+
+    Returns:
+        Projection: The projection, or None when the options keep results as they are
+
+    Raises:
+        ValueError: For unknown field names or a negative ``max_description_chars``
+    """
+    names = parse_fields(fields, allowed, aliases)
+    if names is None and summary:
+        names = tuple(summary_fields)
+    if max_description_chars is not None:
+        try:
+            max_description_chars = int(max_description_chars)
+        except (TypeError, ValueError):
+            raise ValueError("max_description_chars must be an integer") from None
+        if max_description_chars < 0:
+            raise ValueError("max_description_chars must be >= 0")
+    if names is None and max_description_chars is None:
+        return None
+    return Projection(names, max_description_chars, description_key)
@@ -0,0 +1,385 @@
+import json
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_SAVED_SEARCH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_searches.db")
+
+# A claimed search is not handed to another poller for this many seconds,
+# so a worker that dies mid-poll only delays that search
+CLAIM_LEASE = 120.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_searches (
+    id TEXT PRIMARY KEY,
+    keywords TEXT NOT NULL,
+    location TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    params TEXT NOT NULL,
+    interval REAL NOT NULL,
+    created REAL NOT NULL,
+    last_checked REAL,
+    next_check REAL NOT NULL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    last_new INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS saved_searches_next_check ON saved_searches(next_check);
+CREATE TABLE IF NOT EXISTS saved_search_jobs (
+    id INTEGER PRIMARY KEY,
+    search_id TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    payload TEXT,
+    UNIQUE (search_id, fingerprint)
+);
+"""
+
+
+def job_fingerprint(job_id):
+    """Turn a 16-hex job ID into a 63-bit integer that fits an SQLite INTEGER."""
+    return int(job_id, 16) >> 1
+
+
+def next_check_time(now, interval, jitter):
+    """``now`` plus ``interval`` randomly stretched or shrunk by up to ``jitter`` (a fraction)."""
+    return now + interval * random.uniform(1.0 - jitter, 1.0 + jitter)
+
+
+def _search_row(row):
+    (search_id, keywords, location, locale, params, interval, created,
+     last_checked, next_check, checks, last_new, last_error) = row
+    return {
+        'id': search_id,
+        'keywords': keywords,
+        'location': location,
+        'locale': locale,
+        'params': json.loads(params),
+        'interval': interval,
+        'created': created,
+        'last_checked': last_checked,
+        'next_check': next_check,
+        'checks': checks,
+        'last_new': last_new,
+        'last_error': last_error,
+    }
+
+
+_SEARCH_COLUMNS = ("id, keywords, location, locale, params, interval, created, "
+                   "last_checked, next_check, checks, last_new, last_error")
+
+
+class SavedSearchStore:
+    """
+    On-disk saved searches with a fingerprint set per search.
+
+    Each poll stores the 63-bit fingerprints of the jobs it saw. Jobs seen by
+    the first poll form the baseline and are stored without payload; jobs
+    that show up later are stored with their payload and a row ID that
+    serves as the ``since`` cursor. Old payloads are dropped after
+    ``retain_days`` and at most ``max_fingerprints`` are kept per search.
+    """
+
+    def __init__(self, path, max_fingerprints=5000, retain_days=14):
+        self.path = path
+        self.max_fingerprints = max_fingerprints
+        self.retain_days = retain_days
+        self._lock = threading.Lock()
+        # Autocommit mode, so claims can use an explicit BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self.polls = 0
+        self.new_jobs = 0
+
+    @contextmanager
+    def _transaction(self, immediate=False):
+        self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def create(self, keywords, location, locale, params, interval, next_check):
+        """
+        Store a new saved search.
+
+        Returns:
+            dict: The saved search
+        """
+        search_id = secrets.token_hex(8)
+        now = time.time()
+        with self._lock, self._transaction():
+            self._conn.execute(
+                f"INSERT INTO saved_searches ({_SEARCH_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?, 0, 0, NULL)",
+                (search_id, keywords, location, locale, json.dumps(params, sort_keys=True), interval, now, next_check),
+            )
+        return self.get(search_id)
+
+    def get(self, search_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_SEARCH_COLUMNS} FROM saved_searches WHERE id = ?", (search_id,)).fetchone()
+        return _search_row(row) if row else None
+
+    def list(self):
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_SEARCH_COLUMNS} FROM saved_searches ORDER BY created").fetchall()
+        return [_search_row(row) for row in rows]
+
+    def delete(self, search_id):
+        """Remove a saved search and its fingerprints. Returns False if it did not exist."""
+        with self._lock, self._transaction():
+            deleted = self._conn.execute("DELETE FROM saved_searches WHERE id = ?", (search_id,)).rowcount
+            self._conn.execute("DELETE FROM saved_search_jobs WHERE search_id = ?", (search_id,))
+        return deleted > 0
+
+    def claim_due(self, now, limit=10, lease=CLAIM_LEASE):
+        """
+        Claim up to ``limit`` searches whose next check is due.
+
+        Claimed searches get ``next_check`` pushed ``lease`` seconds ahead in
+        the same write transaction, so concurrent pollers (threads or worker
+        processes sharing the file) never claim the same search twice.
+
+        Returns:
+            list: The claimed saved searches
+        """
+        with self._lock, self._transaction(immediate=True):
+            rows = self._conn.execute(
+                f"SELECT {_SEARCH_COLUMNS} FROM saved_searches WHERE next_check <= ? ORDER BY next_check LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._conn.executemany("UPDATE saved_searches SET next_check = ? WHERE id = ?",
+                                   [(now + lease, row[0]) for row in rows])
+        return [_search_row(row) for row in rows]
+
+    def record_poll(self, search_id, jobs, next_check):
+        """
+        Store the result of one poll.
+
+        Args:
+            search_id (str): Saved search ID
+            jobs (list): (fingerprint, job) pairs seen by the poll
+            next_check (float): When to poll again
+
+        Returns:
+            int: Number of jobs not seen before (0 for the baseline poll), or
+                -1 when the search was deleted meanwhile
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            row = self._conn.execute("SELECT checks FROM saved_searches WHERE id = ?", (search_id,)).fetchone()
+            if row is None:
+                return -1
+            baseline = row[0] == 0
+            unique = dict(jobs)
+            known = set()
+            fingerprints = list(unique)
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(fingerprints), 500):
+                chunk = fingerprints[start:start + 500]
+                known.update(found for (found,) in self._conn.execute(
+                    f"SELECT fingerprint FROM saved_search_jobs WHERE search_id = ? "
+                    f"AND fingerprint IN ({', '.join('?' * len(chunk))})",
+                    [search_id, *chunk]))
+            fresh = [(fingerprint, job) for fingerprint, job in unique.items() if fingerprint not in known]
+            self._conn.executemany(
+                "INSERT INTO saved_search_jobs (search_id, fingerprint, first_seen, payload) VALUES (?, ?, ?, ?)",
+                [(search_id, fingerprint, now, None if baseline else json.dumps(job, ensure_ascii=False))
+                 for fingerprint, job in fresh],
+            )
+            new_count = 0 if baseline else len(fresh)
+            self._conn.execute(
+                "UPDATE saved_searches SET last_checked = ?, next_check = ?, checks = checks + 1, "
+                "last_new = ?, last_error = NULL WHERE id = ?",
+                (now, next_check, new_count, search_id),
+            )
+            self._prune(search_id, now)
+            self.polls += 1
+            self.new_jobs += new_count
+        return new_count
+
+    def record_error(self, search_id, error, next_check):
+        """Keep the previous fingerprints and retry at ``next_check``."""
+        with self._lock, self._transaction():
+            self._conn.execute(
+                "UPDATE saved_searches SET last_checked = ?, next_check = ?, last_error = ? WHERE id = ?",
+                (time.time(), next_check, str(error), search_id),
+            )
+
+    def _prune(self, search_id, now):
+        self._conn.execute(
+            "UPDATE saved_search_jobs SET payload = NULL WHERE search_id = ? AND payload IS NOT NULL AND first_seen < ?",
+            (search_id, now - self.retain_days * 86400),
+        )
+        self._conn.execute(
+            """
+            DELETE FROM saved_search_jobs WHERE search_id = ? AND id <= (
+                SELECT id FROM saved_search_jobs WHERE search_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+            """,
+            (search_id, search_id, self.max_fingerprints),
+        )
+
+    def cursor(self, search_id):
+        """Return the cursor that points past every job stored so far."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(id) FROM saved_search_jobs WHERE search_id = ?", (search_id,)).fetchone()
+        return row[0] or 0
+
+    def new_jobs_since(self, search_id, since=0, limit=100):
+        """
+        Return jobs first seen after ``since``, oldest first.
+
+        Only reads the local database; no search is made.
+
+        Returns:
+            tuple: (jobs, cursor, has_more) where ``cursor`` is passed as
+                ``since`` next time
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, first_seen FROM saved_search_jobs "
+                "WHERE search_id = ? AND id > ? AND payload IS NOT NULL ORDER BY id LIMIT ?",
+                (search_id, since, limit + 1),
+            ).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            if rows:
+                cursor = rows[-1][0]
+            else:
+                latest = self._conn.execute(
+                    "SELECT MAX(id) FROM saved_search_jobs WHERE search_id = ?", (search_id,)).fetchone()[0]
+                cursor = max(since, latest or 0)
+        jobs = [dict(json.loads(payload), first_seen=first_seen) for _, payload, first_seen in rows]
+        return jobs, cursor, has_more
+
+    def stats(self):
+        with self._lock:
+            searches = self._conn.execute("SELECT COUNT(*) FROM saved_searches").fetchone()[0]
+            fingerprints = self._conn.execute("SELECT COUNT(*) FROM saved_search_jobs").fetchone()[0]
+        return {
+            'path': self.path,
+            'searches': searches,
+            'fingerprints': fingerprints,
+            'max_fingerprints': self.max_fingerprints,
+            'retain_days': self.retain_days,
+            'polls': self.polls,
+            'new_jobs': self.new_jobs,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SavedSearchScheduler:
+    """
+    Background thread that re-polls due saved searches.
+
+    Every ``tick`` seconds it claims up to ``batch`` due searches and calls
+    ``poll(search)`` for each. The thread is per process; after a fork (e.g.
+    gunicorn workers) ``start()`` starts a new one in the child.
+    """
+
+    def __init__(self, store, poll, tick=5.0, batch=10):
+        self.store = store
+        self.poll = poll
+        self.tick = tick
+        self.batch = batch
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.runs = 0
+        self.errors = 0
+
+    def run_once(self, now=None):
+        """Poll every search that is due now. Returns the number polled."""
+        due = self.store.claim_due(time.time() if now is None else now, self.batch)
+        for search in due:
+            try:
+                self.poll(search)
+            except Exception:
+                # One failing search must not stop the others
+                self.errors += 1
+        self.runs += 1
+        return len(due)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                polled = self.run_once()
+            except Exception:
+                self.errors += 1
+                polled = 0
+            # Keep going without waiting while a backlog of due searches remains
+            if polled < self.batch:
+                self._stop.wait(self.tick)
+
+    def start(self):
+        """Start the thread unless it already runs in this process."""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop, name="saved-search-scheduler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive() and self._pid == os.getpid(),
+            'tick': self.tick,
+            'batch': self.batch,
+            'runs': self.runs,
+            'errors': self.errors,
+        }
+
+
+_default_store = None
+_default_disabled = False
+_default_lock = threading.Lock()
+
+
+def get_saved_searches():
+    """
+    Return the process-wide saved search store, opening it on first use.
+
+    The database path comes from ``CAREER_SAVED_SEARCH_PATH`` (default:
+    ``saved_searches.db`` next to this module); set it to an empty string to
+    disable saved searches. Returns None when disabled or when it cannot be opened.
+    """
+    global _default_store, _default_disabled
+    if _default_store is None and not _default_disabled:
+        with _default_lock:
+            if _default_store is None and not _default_disabled:
+                path = os.environ.get("CAREER_SAVED_SEARCH_PATH", DEFAULT_SAVED_SEARCH_PATH)
+                try:
+                    if path:
+                        _default_store = SavedSearchStore(
+                            path,
+                            max_fingerprints=int(os.environ.get("CAREER_SAVED_SEARCH_MAX_FINGERPRINTS", "5000")),
+                            retain_days=float(os.environ.get("CAREER_SAVED_SEARCH_RETAIN_DAYS", "14")),
+                        )
+                except sqlite3.Error:
+                    pass
+                _default_disabled = _default_store is None
+    return _default_store
@@ -1,11 +1,53 @@
 from mcp.server.fastmcp import FastMCP
-from app import search_jobs, get_job_details
-from typing import Optional
+from app import (search_jobs_async, get_job_details_async, search_all_pages, search_jobs_batch, search_jobs_local,
+                 search_jobs_federated,
+                 run_blocking, get_server_stats, warm_up,
+                 job_urls_from_result, prefetch_job_details, prefetch_job_details_async,
+                 save_search, get_new_jobs, list_saved_searches, delete_saved_search,
+                 start_saved_search_scheduler)
+from metrics import registry as metrics_registry
+from projection import make_projection
+from typing import List, Optional
+import functools
+import os
+import threading
+import time
 
 # Initialize MCP server
 mcp = FastMCP("careerjet-job-search-mcp")
 
+# Agent searches queue behind interactive API users for upstream capacity
+UPSTREAM_PRIORITY = "agent"
+
+tool_seconds = metrics_registry.histogram(
+    "career_mcp_tool_seconds", "MCP tool call latency by tool", labels=("tool",))
+tool_calls = metrics_registry.counter(
+    "career_mcp_tool_calls_total", "MCP tool calls by tool and outcome", labels=("tool", "outcome"))
+
+def projection_or_error(fields, max_description_chars, summary):
+    """Return (projection, None), or (None, error dict) for invalid options."""
+    try:
+        return make_projection(fields, max_description_chars, summary), None
+    except ValueError as e:
+        return None, {"error": str(e)}
+
+def instrumented(func):
+    """Record latency and outcome of every call to an MCP tool."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await func(*args, **kwargs)
+            outcome = "error" if isinstance(result, dict) and 'error' in result else "ok"
+            return result
+        finally:
+            tool_seconds.observe(time.perf_counter() - started, func.__name__)
+            tool_calls.inc(func.__name__, outcome)
+    return wrapper
+
 @mcp.tool()
+@instrumented
 async def search_jobs_tool(
     keywords: str,
     location: str,
@@ -19,7 +61,11 @@ async def search_jobs_tool(
     pagesize: Optional[int] = None,
     page: Optional[int] = None,
     contracttype: Optional[str] = None,
-    contractperiod: Optional[str] = None
+    contractperiod: Optional[str] = None,
+    prefetch_details: int = 0,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
 ) -> dict:
     """
     Search for jobs using Careerjet API.
@@ -38,10 +84,21 @@ async def search_jobs_tool(
         page: Page number of returned jobs (>= 1)
         contracttype: Contract type - 'p' (permanent), 'c' (contract), 't' (temporary), 'i' (training), 'v' (voluntary)
         contractperiod: Contract period - 'f' (full time), 'p' (part time)
+        prefetch_details: Fetch the details of the top N jobs in the background,
+            so later get_job_details_tool calls for them are fast (default: 0)
+        fields: Job fields to return (default: all). Any of: id, title, company, location, date,
+            description, requirements, salary, salary_min, salary_max, salary_type,
+            salary_currency_code, site, url ("locations" is accepted for location)
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary and url per job
 
     Returns:
         dict: Search results from Careerjet API including job listings
     """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
     # Prepare optional parameters
     optional_params = {}
     if sort: optional_params['sort'] = sort
@@ -51,8 +108,8 @@ async def search_jobs_tool(
     if contracttype: optional_params['contracttype'] = contracttype
     if contractperiod: optional_params['contractperiod'] = contractperiod
 
-    # Call the function from app.py
-    result = search_jobs(
+    # Call the function from app.py without blocking the event loop
+    result = await search_jobs_async(
         keywords=keywords,
         location=location,
         locale=locale,
@@ -60,11 +117,229 @@ async def search_jobs_tool(
         user_ip=user_ip,
         user_agent=user_agent,
         url=url,
+        priority=UPSTREAM_PRIORITY,
         **optional_params
     )
-    return result
+    if prefetch_details > 0:
+        prefetch_job_details(job_urls_from_result(result, prefetch_details), locale, wait=False)
+    return projection.result(result) if projection else result
+
+@mcp.tool()
+@instrumented
+async def search_all_pages_tool(
+    keywords: str,
+    location: str,
+    target_count: int = 100,
+    locale: str = "en_US",
+    affid: str = "213e213hd12344552",
+    user_ip: str = "127.0.0.1",
+    user_agent: str = "Mozilla/5.0 (compatible; MCP-CareerjetBot/1.0)",
+    url: str = "http://example.com/jobsearch",
+    pagesize: int = 50,
+    max_concurrency: int = 4,
+    sort: Optional[str] = None,
+    contracttype: Optional[str] = None,
+    contractperiod: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
+) -> dict:
+    """
+    Collect up to target_count jobs in one call by fetching result pages concurrently.
+
+    Args:
+        keywords: Keywords to match job titles, content or company names
+        location: Location of requested jobs (e.g., "London", "New York", "Berlin")
+        target_count: Number of jobs wanted (max 1000)
+        locale: Locale code (default: en_US). Examples: en_GB, en_US, de_DE, fr_FR
+        affid: Affiliate ID provided by Careerjet (required)
+        user_ip: IP address of the end-user
+        user_agent: User agent of the end-user's browser
+        url: URL of page that will display the search results
+        pagesize: Number of jobs per upstream page (max 100)
+        max_concurrency: Maximum number of pages fetched at the same time
+        sort: Sort type - 'relevance' (default), 'date', or 'salary'
+        contracttype: Contract type - 'p' (permanent), 'c' (contract), 't' (temporary), 'i' (training), 'v' (voluntary)
+        contractperiod: Contract period - 'f' (full time), 'p' (part time)
+        fields: Job fields to return (default: all), e.g. ["title", "company", "url"]
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary and url per job
+
+    Returns:
+        dict: Merged, deduplicated job listings with the upstream hit count
+    """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
+    optional_params = {}
+    if sort: optional_params['sort'] = sort
+    if contracttype: optional_params['contracttype'] = contracttype
+    if contractperiod: optional_params['contractperiod'] = contractperiod
+
+    result = await run_blocking(
+        search_all_pages,
+        keywords=keywords,
+        location=location,
+        target_count=target_count,
+        pagesize=pagesize,
+        max_concurrency=max_concurrency,
+        locale=locale,
+        affid=affid,
+        user_ip=user_ip,
+        user_agent=user_agent,
+        url=url,
+        priority=UPSTREAM_PRIORITY,
+        **optional_params
+    )
+    return projection.result(result) if projection else result
+
+@mcp.tool()
+@instrumented
+async def search_jobs_batch_tool(
+    queries: List[dict],
+    locale: str = "en_US",
+    affid: str = "213e213hd12344552",
+    user_ip: str = "127.0.0.1",
+    user_agent: str = "Mozilla/5.0 (compatible; MCP-CareerjetBot/1.0)",
+    url: str = "http://example.com/jobsearch",
+    max_concurrency: int = 4,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
+) -> dict:
+    """
+    Run several job searches at once (e.g. multiple cities or role synonyms).
+
+    Args:
+        queries: List of queries, each with "keywords" and "location" and optionally
+            "locale", "sort", "pagesize", "page", "contracttype", "contractperiod" (max 20)
+        locale: Default locale code for queries that do not set one
+        affid: Affiliate ID provided by Careerjet (required)
+        user_ip: IP address of the end-user
+        user_agent: User agent of the end-user's browser
+        url: URL of page that will display the search results
+        max_concurrency: Maximum number of searches sent upstream at the same time
+        fields: Job fields to return (default: all), e.g. ["title", "company", "url"]
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary and url per job
+
+    Returns:
+        dict: Per-query results under "results" and a merged, deduplicated job list under "merged"
+    """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
+    result = await run_blocking(
+        search_jobs_batch,
+        queries,
+        max_concurrency=max_concurrency,
+        locale=locale,
+        affid=affid,
+        user_ip=user_ip,
+        user_agent=user_agent,
+        url=url,
+        priority=UPSTREAM_PRIORITY
+    )
+    return projection.result(result) if projection else result
+
+@mcp.tool()
+@instrumented
+async def search_jobs_federated_tool(
+    keywords: str,
+    location: str,
+    locales: List[str],
+    timeout: Optional[float] = None,
+    date_weight: Optional[float] = None,
+    affid: str = "213e213hd12344552",
+    sort: Optional[str] = None,
+    pagesize: Optional[int] = None,
+    contracttype: Optional[str] = None,
+    contractperiod: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
+) -> dict:
+    """
+    Run the same job search in several Careerjet locales at once and get one merged list.
+
+    Use this instead of calling search_jobs_tool once per locale, e.g. for
+    cross-border or remote-friendly roles. Locales that are slow are skipped
+    after the timeout and reported, so partial results come back quickly.
+
+    Args:
+        keywords: Keywords to match job titles, content or company names
+        location: Location of requested jobs (same for every locale)
+        locales: Locale codes to search, e.g. ["tr_TR", "en_GB", "de_DE"] (at most 8)
+        timeout: Seconds to wait for the locales (default: 5)
+        date_weight: Share of recency in the ranking from 0 to 1 (default: 0.3, or 1 when sort is 'date')
+        affid: Affiliate ID provided by Careerjet
+        sort: Sort type per locale - 'relevance' (default), 'date', or 'salary'
+        pagesize: Number of jobs requested per locale
+        contracttype: Contract type - 'p', 'c', 't', 'i', 'v'
+        contractperiod: Contract period - 'f' (full time), 'p' (part time)
+        fields: Job fields to return (default: all); "locales" lists the locales that returned a job
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary, url and locales per job
+
+    Returns:
+        dict: Deduplicated "jobs" ranked by relevance and date, the status of
+            each locale under "locales" and "partial" when a locale failed or timed out
+    """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
+    optional_params = {}
+    if sort: optional_params['sort'] = sort
+    if pagesize: optional_params['pagesize'] = pagesize
+    if contracttype: optional_params['contracttype'] = contracttype
+    if contractperiod: optional_params['contractperiod'] = contractperiod
+
+    result = await run_blocking(
+        search_jobs_federated, keywords, location, locales, timeout=timeout, date_weight=date_weight,
+        affid=affid, priority=UPSTREAM_PRIORITY, **optional_params
+    )
+    return projection.result(result) if projection else result
+
+@mcp.tool()
+@instrumented
+async def search_local_jobs_tool(
+    keywords: str,
+    location: Optional[str] = None,
+    locale: Optional[str] = None,
+    page: int = 1,
+    pagesize: int = 20,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
+) -> dict:
+    """
+    Search job listings seen in earlier searches from the local full-text index, without calling Careerjet.
+
+    Args:
+        keywords: Keywords to match job titles, companies, descriptions or locations
+        location: Optional location filter (e.g., "Istanbul")
+        locale: Optional locale filter (e.g., tr_TR, en_GB)
+        page: Page number of returned jobs (>= 1)
+        pagesize: Number of jobs per page
+        fields: Job fields to return (default: all), e.g. ["title", "company", "url"]
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary and url per job
+
+    Returns:
+        dict: Matching job listings with the total hit count
+    """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
+    result = await run_blocking(search_jobs_local, keywords, location, locale=locale, page=page, pagesize=pagesize)
+    return projection.result(result) if projection else result
 
 @mcp.tool()
+@instrumented
 async def get_job_details_tool(job_url: str, locale: str = "en_US") -> dict:
     """
     Get detailed information about a specific job.
@@ -74,10 +349,155 @@ async def get_job_details_tool(job_url: str, locale: str = "en_US") -> dict:
         locale: Locale code (default: en_US)
 
     Returns:
-        dict: Job details or information about implementation
+        dict: Structured job details (title, company, location, description,
+            date_posted, valid_through, employment_type, salary, apply_url)
+    """
+    result = await get_job_details_async(job_url, locale)
+    return result
+
+@mcp.tool()
+@instrumented
+async def prefetch_job_details_tool(job_urls: List[str], locale: str = "en_US") -> dict:
+    """
+    Get the details of several jobs at once, fetched concurrently.
+
+    Args:
+        job_urls: URLs of the job postings (e.g. the top hits of a search)
+        locale: Locale code (default: en_US)
+
+    Returns:
+        dict: "requested", "fetched", "cached" and "errors" counts and the
+            structured "details" of each job in input order
+    """
+    result = await prefetch_job_details_async(job_urls, locale)
+    return result
+
+@mcp.tool()
+@instrumented
+async def save_search_tool(
+    keywords: str,
+    location: str,
+    locale: str = "en_US",
+    interval: Optional[float] = None,
+    sort: Optional[str] = None,
+    pagesize: Optional[int] = None,
+    contracttype: Optional[str] = None,
+    contractperiod: Optional[str] = None,
+    salary: Optional[int] = None
+) -> dict:
+    """
+    Save a job search; the server re-runs it in the background and keeps track of new postings.
+
+    Use get_new_jobs_tool with the returned id and cursor to get only the jobs
+    posted since then, instead of repeating the whole search.
+
+    Args:
+        keywords: Keywords to match job titles, content or company names
+        location: Location of requested jobs
+        locale: Locale code (default: en_US)
+        interval: Seconds between background checks (default: 900)
+        sort: Sort type (default: date)
+        pagesize: Jobs checked per poll (default: 50, max 100)
+        contracttype: Contract type (p, c, t, i, v)
+        contractperiod: Contract period (f, p)
+        salary: Minimum salary
+
+    Returns:
+        dict: The saved search ("id", polling state) and the initial "cursor"
     """
-    result = get_job_details(job_url, locale)
+    result = await run_blocking(
+        save_search, keywords, location, locale=locale, interval=interval, sort=sort, pagesize=pagesize,
+        contracttype=contracttype, contractperiod=contractperiod, salary=salary,
+    )
     return result
 
+@mcp.tool()
+@instrumented
+async def get_new_jobs_tool(
+    search_id: str,
+    since: int = 0,
+    limit: int = 100,
+    fields: Optional[List[str]] = None,
+    max_description_chars: Optional[int] = None,
+    summary: bool = False
+) -> dict:
+    """
+    Get the jobs a saved search found since the last check, without running a search.
+
+    Args:
+        search_id: ID returned by save_search_tool
+        since: "cursor" from the previous call (0: all jobs found since the search was saved)
+        limit: Maximum number of jobs (1-100); "has_more" tells whether more remain
+        fields: Job fields to return (default: all), e.g. ["title", "company", "url"]
+        max_description_chars: Cut job descriptions to this many characters
+        summary: Return only id, title, company, location, date, salary and url per job
+
+    Returns:
+        dict: New "jobs", the "cursor" to pass as since next time, and when the
+            search was last and will next be checked
+    """
+    projection, error = projection_or_error(fields, max_description_chars, summary)
+    if error:
+        return error
+
+    result = await run_blocking(get_new_jobs, search_id, since, limit)
+    return projection.result(result) if projection else result
+
+@mcp.tool()
+@instrumented
+async def list_saved_searches_tool() -> dict:
+    """
+    List saved searches with their polling state.
+
+    Returns:
+        dict: "searches", each with "id", query parameters, "last_checked",
+            "next_check" and "last_new" (jobs found by the latest check)
+    """
+    return await run_blocking(list_saved_searches)
+
+@mcp.tool()
+@instrumented
+async def delete_saved_search_tool(search_id: str) -> dict:
+    """
+    Delete a saved search; it is no longer checked.
+
+    Args:
+        search_id: ID returned by save_search_tool
+
+    Returns:
+        dict: {"deleted": search_id} or an error
+    """
+    return await run_blocking(delete_saved_search, search_id)
+
+@mcp.tool()
+@instrumented
+async def get_server_stats_tool() -> dict:
+    """
+    Get performance statistics of this server: per-stage search latency histograms,
+    upstream response and fallback counters, cache hit rates and circuit breaker state.
+
+    Returns:
+        dict: "metrics" (latency percentiles and counters), "demo_fallback_rate",
+            "cache", "upstream" and "saved_searches" statistics
+    """
+    return await run_blocking(get_server_stats)
+
+def start_warm_up():
+    """
+    Warm up imports and upstream connections in a background thread.
+
+    Runs while the host performs the MCP handshake, so the first tool call
+    does not pay for them.
+    """
+    thread = threading.Thread(target=warm_up, name="mcp-warm-up", daemon=True)
+    thread.start()
+    return thread
+
 if __name__ == "__main__":
+    if os.environ.get("CAREER_MCP_WARMUP", "0").lower() in ("1", "true", "yes"):
+        start_warm_up()
+    # Every MCP host starts its own stdio server; saved searches are polled by
+    # the API process unless a deployment opts in here
+    if os.environ.get("CAREER_SAVED_SEARCH_SCHEDULER", "0") != "0":
+        start_saved_search_scheduler()
     mcp.run(transport="stdio")
\ No newline at end of file
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_SHARED_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_state.db")
+
+# Expired cache rows are purged after this many writes
+_PURGE_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache(expires_at);
+CREATE TABLE IF NOT EXISTS token_buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quota_usage (
+    name TEXT PRIMARY KEY,
+    period_start REAL NOT NULL,
+    used INTEGER NOT NULL
+);
+"""
+
+
+def _key_digest(key):
+    return hashlib.blake2b(json.dumps(key, ensure_ascii=False, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SharedState:
+    """
+    Cross-process state in a local SQLite database (WAL mode).
+
+    Lets several WSGI worker processes on one host share search results
+    and upstream rate-limit tokens, so adding workers does not multiply
+    upstream calls. Each process opens its own connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def cache_get(self, key):
+        """Return the shared cached value for ``key`` or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (_key_digest(key), time.time())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def cache_set(self, key, value, ttl):
+        """Store a JSON-serializable ``value`` for ``ttl`` seconds."""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (_key_digest(key), payload, now + ttl),
+            )
+            self._writes += 1
+            if self._writes % _PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def take_token(self, name, rate, capacity):
+        """
+        Try to take one token from the shared bucket ``name``.
+
+        The bucket refills at ``rate`` tokens per second up to ``capacity``.
+        The read-modify-write runs in an IMMEDIATE transaction, so it is
+        atomic across processes.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def consume_quota(self, name, quota, period):
+        """
+        Count one use of quota ``name`` if fewer than ``quota`` were used this period.
+
+        The counter restarts every ``period`` seconds and is shared by all
+        processes using this database.
+
+        Returns:
+            bool: True if the use was counted, False if the quota is exhausted
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT period_start, used FROM quota_usage WHERE name = ?", (str(name),)
+                ).fetchone()
+                period_start, used = (now, 0) if row is None or now - row[0] >= period else row
+                allowed = used < quota
+                if allowed:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO quota_usage (name, period_start, used) VALUES (?, ?, ?)",
+                        (str(name), period_start, used + 1),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return allowed
+
+    def refund_quota(self, name, period):
+        """Give back one use of quota ``name`` counted in the current period."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE quota_usage SET used = used - 1 WHERE name = ? AND used > 0 AND period_start > ?",
+                (str(name), time.time() - period),
+            )
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+            return {"path": self.path, "cache_size": size, "hits": self.hits, "misses": self.misses}
+
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_shared_state():
+    """
+    Return this process's SharedState, or None when shared state is disabled.
+
+    Enabled by setting ``CAREER_SHARED_STATE_PATH`` (the production entry
+    point of api_server.py does this for multi-worker runs). Connections
+    are opened lazily per process, so they are never inherited across fork.
+    """
+    path = os.environ.get("CAREER_SHARED_STATE_PATH")
+    if not path:
+        return None
+    pid = os.getpid()
+    state = _instances.get(pid)
+    if state is None:
+        with _instances_lock:
+            state = _instances.get(pid)
+            if state is None:
+                state = SharedState(path)
+                _instances.clear()
+                _instances[pid] = state
+    return state
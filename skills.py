@@ -0,0 +1,212 @@
+import bisect
+import json
+import os
+import re
+import threading
+import unicodedata
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json")
+
+# Separator placed between descriptions in a batch; it is never part of a skill
+_BATCH_SEPARATOR = "\n\x00\n"
+
+
+def normalize_text(text):
+    """
+    Normalize text for skill matching.
+
+    Applies NFC normalization and case folding, and drops the combining dot
+    left by folding Turkish "İ", so "İngilizce" and "ingilizce" match.
+    """
+    return unicodedata.normalize("NFC", text or "").casefold().replace("\u0307", "")
+
+
+def _trie_pattern(terms):
+    """
+    Build a regex that matches any of ``terms``, factored as a trie.
+
+    Shared prefixes are matched once, so the compiled pattern stays fast
+    with thousands of terms instead of trying each alternative in turn.
+    Spaces inside multi-word terms match any run of whitespace.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node):
+        end = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + render(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if end else body
+
+    return render(trie)
+
+
+def _normalize_term(term):
+    return " ".join(normalize_text(term).split())
+
+
+def _word_regex(terms):
+    """Compile ``terms`` into one regex matching whole words only, or None if empty."""
+    pattern = _trie_pattern(terms)
+    return re.compile(r"(?<!\w)(?:" + pattern + r")(?!\w)") if pattern else None
+
+
+class SkillMatcher:
+    """
+    Compiled multi-pattern skill matcher.
+
+    All skill names and synonyms are compiled into one regex with Unicode
+    word boundaries, so "Java" does not match inside "JavaScript" and "API"
+    does not match inside "rapid". Matches are reported by canonical skill
+    name in taxonomy order.
+
+    Terms that are also ordinary words ("rest", "express", "swift", "go")
+    are listed as a skill's ``ambiguous`` terms. They are matched in a
+    separate pass and only count when one of the skill's ``context`` words
+    occurs within ``context_window`` characters, so "Take a rest" is not
+    REST while "REST API" is, and the API in "REST APIs" is still found.
+    """
+
+    def __init__(self, skills, context_window=60):
+        """
+        Args:
+            skills (list): [{"name": "Python", "synonyms": ["python3", ...]}, ...]
+                in priority order; a skill may add "ambiguous" terms and the
+                "context" words they need nearby
+            context_window (int): Characters searched for a context word on
+                each side of an ambiguous match
+        """
+        self.skills = []
+        self.context_window = context_window
+        self._canonical = {}
+        self._ambiguous = {}
+        self._context = {}
+        for skill in skills:
+            name = skill["name"]
+            if name not in self.skills:
+                self.skills.append(name)
+            ambiguous = {_normalize_term(term) for term in skill.get("ambiguous", [])} - {""}
+            for term in ambiguous:
+                self._ambiguous.setdefault(term, name)
+            for term in [name] + list(skill.get("synonyms", [])):
+                normalized = _normalize_term(term)
+                if normalized and normalized not in ambiguous:
+                    self._canonical.setdefault(normalized, name)
+            context = sorted({_normalize_term(word) for word in skill.get("context", [])} - {""})
+            if ambiguous and context:
+                self._context[name] = _word_regex(context)
+
+        self._priority = {name: index for index, name in enumerate(self.skills)}
+        self._regex = _word_regex(sorted(self._canonical))
+        self._ambiguous_regex = _word_regex(sorted(self._ambiguous))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load a matcher from a JSON taxonomy file.
+
+        The file holds {"skills": [{"name": ..., "synonyms": [...]}, ...]}.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["skills"] if isinstance(data, dict) else data)
+
+    def _lookup(self, matched):
+        name = self._canonical.get(matched)
+        if name is None:
+            # Multi-word terms may have matched across several whitespace characters
+            name = self._canonical[" ".join(matched.split())]
+        return name
+
+    def _ordered(self, names):
+        return sorted(names, key=self._priority.__getitem__)
+
+    def _ambiguous_matches(self, text):
+        """Yield the skill of every ambiguous term in ``text`` that has a context word nearby."""
+        if self._ambiguous_regex is None:
+            return
+        for m in self._ambiguous_regex.finditer(text):
+            name = self._ambiguous[" ".join(m.group(0).split())]
+            context = self._context.get(name)
+            if context is None:
+                continue
+            # Look on both sides of the term, but never at the term itself
+            before = text[max(0, m.start() - self.context_window):m.start()]
+            after = text[m.end():m.end() + self.context_window]
+            if context.search(before) or context.search(after):
+                yield name
+
+    def match(self, text):
+        """
+        Return the canonical skills found in ``text``, in taxonomy order.
+        """
+        if not text:
+            return []
+        text = normalize_text(text)
+        found = {self._lookup(m.group(0)) for m in self._regex.finditer(text)} if self._regex else set()
+        found.update(self._ambiguous_matches(text))
+        return self._ordered(found)
+
+    def match_many(self, texts):
+        """
+        Match a whole batch of texts in a single regex pass.
+
+        Args:
+            texts (list): Descriptions to scan
+
+        Returns:
+            list: One list of canonical skills per input text
+        """
+        texts = [normalize_text(text) for text in texts]
+        results = [set() for _ in texts]
+        if not texts:
+            return []
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_BATCH_SEPARATOR)
+
+        joined = _BATCH_SEPARATOR.join(texts)
+        if self._regex is not None:
+            for m in self._regex.finditer(joined):
+                index = bisect.bisect_right(starts, m.start()) - 1
+                results[index].add(self._lookup(m.group(0)))
+        if self._ambiguous_regex is not None and self._ambiguous_regex.search(joined):
+            # Checked per text so a context window never reaches into the next description
+            for text, found in zip(texts, results):
+                found.update(self._ambiguous_matches(text))
+
+        return [self._ordered(found) for found in results]
+
+
+_default_matcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_matcher():
+    """
+    Return the process-wide matcher, loading the taxonomy once.
+
+    The taxonomy path comes from ``CAREER_SKILLS_TAXONOMY`` and defaults to
+    ``skills.json`` next to this module.
+    """
+    global _default_matcher
+    if _default_matcher is None:
+        with _default_lock:
+            if _default_matcher is None:
+                path = os.environ.get("CAREER_SKILLS_TAXONOMY", DEFAULT_TAXONOMY_PATH)
+                _default_matcher = SkillMatcher.from_file(path)
+    return _default_matcher
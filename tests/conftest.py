@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+# Tests import the flat modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep app/api_server imports from touching the on-disk databases or starting threads
+os.environ.setdefault("CAREER_JOB_INDEX_PATH", "")
+os.environ.setdefault("CAREER_SAVED_SEARCH_PATH", "")
+os.environ.setdefault("CAREER_SAVED_SEARCH_SCHEDULER", "0")
+os.environ.pop("CAREER_SHARED_STATE_PATH", None)
+
+
+def wait_until(predicate, timeout=2.0):
+    """Poll ``predicate`` until it is true; fail the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+class FakeClock:
+    """Stand-in for the ``time`` module; patch it over a module's ``time`` to control both clocks."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
@@ -0,0 +1,84 @@
+import threading
+
+from admission import AdmissionGate
+from conftest import wait_until
+
+
+def enter_in_thread(gate):
+    outcome = []
+    thread = threading.Thread(target=lambda: outcome.append(gate.enter()))
+    thread.start()
+    return thread, outcome
+
+
+def test_admits_up_to_max_in_flight():
+    gate = AdmissionGate("search", max_in_flight=2)
+    assert gate.enter() == AdmissionGate.ADMITTED
+    assert gate.try_enter()
+    assert not gate.try_enter()
+    assert gate.stats()["in_flight"] == 2
+    gate.leave()
+    assert gate.try_enter()
+
+
+def test_sheds_when_queue_is_full():
+    gate = AdmissionGate("search", max_in_flight=1, max_queue=0)
+    assert gate.enter() == AdmissionGate.ADMITTED
+    assert gate.enter() == AdmissionGate.QUEUE_FULL
+    assert gate.stats()["shed"] == {AdmissionGate.QUEUE_FULL: 1, AdmissionGate.QUEUE_TIMEOUT: 0}
+
+
+def test_sheds_queued_request_after_timeout():
+    gate = AdmissionGate("search", max_in_flight=1, max_queue=1, queue_timeout=0.02)
+    gate.enter()
+    assert gate.enter() == AdmissionGate.QUEUE_TIMEOUT
+    stats = gate.stats()
+    assert stats["queued"] == 0
+    assert stats["queued_total"] == 1
+    assert stats["shed"][AdmissionGate.QUEUE_TIMEOUT] == 1
+
+
+def test_queued_request_gets_the_released_slot():
+    gate = AdmissionGate("search", max_in_flight=1, max_queue=1, queue_timeout=2)
+    gate.enter()
+    thread, outcome = enter_in_thread(gate)
+    wait_until(lambda: gate.stats()["queued"] == 1)
+    # A newcomer must not jump the queue while a request waits
+    assert not gate.try_enter()
+    assert gate.enter() == AdmissionGate.QUEUE_FULL
+    gate.leave()
+    thread.join()
+    assert outcome == [AdmissionGate.ADMITTED]
+    assert gate.stats()["in_flight"] == 1
+
+
+def test_parent_caps_endpoints_together():
+    total = AdmissionGate("total", max_in_flight=2)
+    search = AdmissionGate("search", max_in_flight=2, parent=total)
+    details = AdmissionGate("details", max_in_flight=2, parent=total)
+    assert search.enter() == AdmissionGate.ADMITTED
+    assert details.enter() == AdmissionGate.ADMITTED
+    # Both endpoints still have room of their own, but the shared budget is spent
+    assert search.enter() == AdmissionGate.QUEUE_FULL
+    assert not details.try_enter()
+    assert total.stats()["in_flight"] == 2
+    assert total.stats()["admitted"] == 2
+    details.leave()
+    assert total.stats()["in_flight"] == 1
+    assert search.enter() == AdmissionGate.ADMITTED
+
+
+def test_parent_queue_is_shared_across_endpoints():
+    total = AdmissionGate("total", max_in_flight=1, max_queue=1, queue_timeout=2)
+    search = AdmissionGate("search", max_in_flight=1, max_queue=1, queue_timeout=2, parent=total)
+    details = AdmissionGate("details", max_in_flight=1, max_queue=1, queue_timeout=2, parent=total)
+    search.enter()
+    thread, outcome = enter_in_thread(details)
+    wait_until(lambda: total.stats()["queued"] == 1)
+    assert search.enter() == AdmissionGate.QUEUE_FULL
+
+    # Leaving one endpoint wakes a waiter of another
+    search.leave()
+    thread.join()
+    assert outcome == [AdmissionGate.ADMITTED]
+    assert details.stats()["in_flight"] == total.stats()["in_flight"] == 1
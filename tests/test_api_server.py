@@ -0,0 +1,264 @@
+import json
+
+import pytest
+
+import api_server
+import app
+from api_server import SEARCH_WINDOW_SIZE, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replace the upstream search with a deterministic result set of 250 jobs."""
+    calls = []
+    hits = 250
+
+    def search_jobs(keywords, location, page=1, pagesize=20, **kwargs):
+        calls.append(page)
+        first = (page - 1) * pagesize
+        jobs = [
+            {
+                "title": f"Python Developer {number}",
+                "company": "Acme",
+                "locations": location,
+                "url": f"https://www.careerjet.com.tr/jobad/{number}",
+                "description": "Python, Flask",
+                "date": "2024-01-15",
+            }
+            for number in range(first, min(first + pagesize, hits))
+        ]
+        return {"type": "JOBS", "hits": hits, "pages": -(-hits // pagesize), "jobs": jobs}
+
+    monkeypatch.setattr(api_server, "search_jobs", search_jobs)
+    api_server.result_windows.clear()
+    yield calls
+    api_server.result_windows.clear()
+
+
+@pytest.fixture
+def client():
+    return api_server.app.test_client()
+
+
+def test_cursor_round_trip_keeps_only_cursor_args():
+    args = {"keywords": "python", "location": "İstanbul", "pagesize": "40", "sort": "", "prefetch": "5"}
+    cursor = encode_cursor(args, 2, 40)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ({"keywords": "python", "location": "İstanbul", "pagesize": "40"}, (2, 40))
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    encode_cursor({}, 0, 0)[:-3],
+    "W10",  # a JSON list
+    "e30",  # {} without a position
+    encode_cursor({}, -1, 0),
+    encode_cursor({}, 0, SEARCH_WINDOW_SIZE),
+    encode_cursor({}, api_server.MAX_SEARCH_WINDOWS, 0),
+    encode_cursor({}, 10 ** 6, 0),
+])
+def test_decode_cursor_rejects_invalid_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_invalid_cursor_is_a_bad_request(client, upstream):
+    response = client.get("/api/jobs/search?cursor=e30")
+    assert response.status_code == 400
+    assert upstream == []
+
+
+def test_cursor_pages_cover_every_window_once(client, upstream):
+    response = client.get("/api/jobs/search?keywords=python&location=istanbul&pagesize=40&paginate=cursor")
+    titles, sizes = [], []
+    while True:
+        assert response.status_code == 200
+        page = response.get_json()
+        titles.extend(job["title"] for job in page["jobs"])
+        sizes.append(len(page["jobs"]))
+        if page["nextCursor"] is None:
+            break
+        response = client.get(f"/api/jobs/search?cursor={page['nextCursor']}")
+
+    assert titles == [f"Python Developer {number}" for number in range(250)]
+    # Pages stop at the end of each 100-job window and the next window starts a new page
+    assert sizes == [40, 40, 20, 40, 40, 20, 40, 10]
+    assert upstream == [1, 2, 3]
+
+
+def test_cursor_rebuilds_an_evicted_window(client, upstream):
+    first = client.get("/api/jobs/search?keywords=python&location=istanbul&pagesize=40&paginate=cursor").get_json()
+    api_server.result_windows.clear()
+    second = client.get(f"/api/jobs/search?cursor={first['nextCursor']}").get_json()
+    assert [job["title"] for job in second["jobs"]] == [f"Python Developer {number}" for number in range(40, 80)]
+    assert upstream == [1, 1]
+
+
+def test_request_args_override_cursor_args(client, upstream):
+    first = client.get("/api/jobs/search?keywords=python&location=istanbul&pagesize=40&paginate=cursor").get_json()
+    second = client.get(f"/api/jobs/search?cursor={first['nextCursor']}&pagesize=10").get_json()
+    assert len(second["jobs"]) == 10
+    assert decode_cursor(second["nextCursor"]) == (
+        {"keywords": "python", "location": "istanbul", "pagesize": "10"}, (0, 50))
+
+
+def test_admission_gates_leave_a_thread_free():
+    total, gates = api_server.build_admission_gates(8)
+    assert total.max_in_flight + total.max_queue < 8
+    assert all(gate.parent is total for gate in gates.values())
+    assert all(gate.max_in_flight <= total.max_in_flight for gate in gates.values())
+
+
+SEARCH = "/api/jobs/search?keywords=python&location=istanbul&pagesize=20"
+
+
+def test_search_response_has_etag_and_cache_control(client, upstream):
+    response = client.get(SEARCH)
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("public, max-age=60")
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_matching_if_none_match_gives_304(client, upstream):
+    etag = client.get(SEARCH).headers["ETag"]
+    response = client.get(SEARCH, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert client.get(SEARCH, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_gzip_is_used_when_accepted(client, upstream):
+    import gzip
+    import json
+
+    plain = client.get(SEARCH)
+    response = client.get(SEARCH, headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+    # Each representation has its own strong ETag
+    assert response.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    conditional = client.get(SEARCH, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert conditional.status_code == 304
+
+
+def test_brotli_is_preferred_when_available(client, upstream):
+    brotli = pytest.importorskip("brotli")
+    response = client.get(SEARCH, headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data)
+
+
+def test_variant_etag_does_not_validate_another_representation(client, upstream):
+    # A client that cannot decode gzip must not get a 304 for the gzip copy a
+    # shared cache holds: the ETags differ, so it receives the full identity body
+    gzip_etag = client.get(SEARCH, headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    response = client.get(SEARCH, headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json()["jobs"]
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert len(response.data) < api_server.COMPRESS_MIN_SIZE
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" not in response.headers.get("Vary", "")
+    assert response.headers["ETag"]
+
+
+def test_streamed_responses_are_left_alone(client, upstream):
+    response = client.get("/api/jobs/search/stream?keywords=python&location=istanbul&pages=2",
+                          headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert "ETag" not in response.headers
+    assert response.data.count(b"\n") > 2
+
+
+def test_already_encoded_responses_are_left_alone():
+    body = b"x" * 4096
+    with api_server.app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+        response = api_server.app.response_class(body, headers={"Content-Encoding": "br"})
+        response = api_server.optimize_response(response)
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.get_data() == body
+    assert "ETag" not in response.headers
+
+
+def test_error_responses_are_not_compressed(client):
+    response = client.get("/api/jobs/search", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 400
+    assert "Content-Encoding" not in response.headers
+
+
+def test_search_accepts_the_mcp_field_names(client, upstream):
+    response = client.get("/api/jobs/search?keywords=python&location=istanbul&pagesize=2"
+                          "&fields=id,locations,date,requirements")
+    assert response.status_code == 200
+    job = response.get_json()["jobs"][0]
+    assert list(job) == ["id", "location", "postedDate", "requirements"]
+    assert job["location"] == "istanbul"
+    assert job["requirements"] == ["Python", "Flask"]
+
+
+def test_summary_keeps_location_and_id(client, upstream):
+    response = client.get("/api/jobs/search?keywords=python&location=istanbul&pagesize=2&summary=true")
+    job = response.get_json()["jobs"][0]
+    assert job["id"] and job["location"] == "istanbul"
+    assert "description" not in job
+
+
+def test_unknown_fields_are_a_bad_request(client, upstream):
+    response = client.get("/api/jobs/search?keywords=python&location=istanbul&fields=title,salary_min")
+    assert response.status_code == 400
+    assert "salary_min" in response.get_json()["error"]
+
+
+def test_stream_goes_through_every_demo_page(client, monkeypatch):
+    monkeypatch.setattr(api_server, "search_jobs", lambda keywords, location, page=1, pagesize=None, **kwargs:
+                        app.create_demo_response(keywords, location, page, pagesize))
+    pages = -(-app.demo_corpus.size // 15)
+    assert 1 < pages < api_server.MAX_STREAM_PAGES
+    response = client.get(f"/api/jobs/search/stream?keywords=python&location=istanbul&pagesize=15&pages={pages + 1}")
+    events = [json.loads(line) for line in response.data.splitlines()]
+    assert [event["page"] for event in events if event["event"] == "page"] == list(range(1, pages + 1))
+    assert events[-1] == {"event": "end", "count": app.demo_corpus.size}
+
+
+@pytest.mark.parametrize("query, error", [
+    ("keywords=python&location=istanbul&pagesize=many", "pagesize must be an integer"),
+    ("location=istanbul", "Keywords parameter is required"),
+    ("keywords=%20&location=istanbul", "Keywords parameter is required"),
+])
+def test_search_rejects_invalid_parameters(client, upstream, query, error):
+    response = client.get(f"/api/jobs/search?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
+    assert upstream == []
+
+
+@pytest.mark.parametrize("body, error", [
+    ({"keywords": 42, "location": "istanbul"}, "Parameters must be strings: keywords"),
+    ({"keywords": ["python"], "location": {"city": "istanbul"}}, "Parameters must be strings: keywords, location"),
+    ({"keywords": "python", "location": "istanbul", "pagesize": None}, "pagesize must be an integer"),
+    ({"keywords": "python", "location": "istanbul", "pagesize": "fifty"}, "pagesize must be an integer"),
+    ({"keywords": "python", "location": "istanbul", "sort": 1}, "Parameters must be strings: sort"),
+    ({"keywords": None, "location": "istanbul"}, "Keywords parameter is required"),
+    (["python", "istanbul"], "JSON body must be an object"),
+])
+def test_saved_search_rejects_invalid_json_types(client, body, error):
+    response = client.post("/api/saved-searches", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
+
+
+def test_cursor_pagination_stops_at_the_window_limit(client, upstream, monkeypatch):
+    monkeypatch.setattr(api_server, "MAX_SEARCH_WINDOWS", 2)
+    cursor = encode_cursor({"keywords": "python", "location": "istanbul", "pagesize": "50"}, 1, 50)
+    page = client.get(f"/api/jobs/search?cursor={cursor}").get_json()
+    assert len(page["jobs"]) == 50
+    # 250 hits would need a third window, which is past the limit
+    assert page["nextCursor"] is None
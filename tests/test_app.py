@@ -0,0 +1,199 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import app
+from app import JobDeduplicator, dedupe_jobs, rank_federated_jobs, search_jobs_federated
+from saved_searches import SavedSearchStore
+
+
+def make_job(url, title="Python Developer", company="Acme", locations="Istanbul"):
+    return {"url": url, "title": title, "company": company, "locations": locations}
+
+
+def test_dedupe_jobs_drops_same_url_variants_and_keeps_order():
+    jobs = [
+        make_job("https://careerjet.com.tr/jobad/1", title="A"),
+        make_job("https://careerjet.com.tr/jobad/2", title="B"),
+        make_job("https://www.careerjet.com.tr/jobad/1/?utm_source=x", title="A copy"),
+    ]
+    assert [job["title"] for job in dedupe_jobs(jobs)] == ["A", "B"]
+
+
+def test_dedupe_jobs_drops_same_posting_on_other_locale_sites():
+    jobs = [
+        make_job("https://careerjet.com.tr/jobad/1"),
+        make_job("https://careerjet.co.uk/jobad/9", title="python developer", company="ACME"),
+    ]
+    assert dedupe_jobs(jobs) == jobs[:1]
+
+
+def test_dedupe_jobs_keeps_distinct_postings():
+    jobs = [
+        make_job("https://careerjet.com.tr/jobad/1"),
+        make_job("https://careerjet.com.tr/jobad/2", locations="Ankara"),
+        make_job("https://careerjet.com.tr/jobad/3", company="Other"),
+    ]
+    assert dedupe_jobs(jobs) == jobs
+
+
+def test_deduplicator_tracks_state_across_calls():
+    deduplicator = JobDeduplicator()
+    assert deduplicator.add(make_job("https://careerjet.com.tr/jobad/1"))
+    assert not deduplicator.add(make_job("https://careerjet.com.tr/jobad/1#top"))
+    assert not deduplicator.add(make_job("https://careerjet.com.tr/jobad/5"))
+    assert deduplicator.add({"url": "https://careerjet.com.tr/jobad/6"})
+    assert deduplicator.dropped == 2
+
+
+TODAY = date(2026, 3, 1)
+
+
+def ranked(*urls, day=None):
+    return [dict(make_job(url, title=url.rsplit("/", 1)[-1]), date=day) for url in urls]
+
+
+def test_rank_federated_jobs_orders_by_reciprocal_rank_fusion():
+    merged = rank_federated_jobs([
+        ("tr_TR", ranked("https://careerjet.com.tr/jobad/a", "https://careerjet.com.tr/jobad/b")),
+        ("en_GB", ranked("https://careerjet.co.uk/jobad/c", "https://careerjet.co.uk/jobad/d")),
+    ], date_weight=0, today=TODAY)
+    # Equal ranks tie, and ties keep the order the locales were given in
+    assert [job["title"] for job in merged] == ["a", "c", "b", "d"]
+    assert [job["locales"] for job in merged] == [["tr_TR"], ["en_GB"], ["tr_TR"], ["en_GB"]]
+
+
+def test_rank_federated_jobs_merges_duplicates_across_locales():
+    tr = [
+        make_job("https://careerjet.com.tr/jobad/1", title="Only TR"),
+        make_job("https://careerjet.com.tr/jobad/2"),
+    ]
+    gb = [
+        make_job("https://careerjet.co.uk/jobad/9", title="python developer", company="ACME"),
+        make_job("https://careerjet.co.uk/jobad/8", title="Only GB", company="Other"),
+    ]
+    merged = rank_federated_jobs([("tr_TR", tr), ("en_GB", gb)], date_weight=0, today=TODAY)
+    # Found in both locales, so it outranks the first hit of a single locale
+    assert merged[0]["url"] == "https://careerjet.com.tr/jobad/2"
+    assert merged[0]["locales"] == ["tr_TR", "en_GB"]
+    assert [job["title"] for job in merged[1:]] == ["Only TR", "Only GB"]
+
+
+def test_rank_federated_jobs_date_weight_favours_recent_postings():
+    old = ranked("https://careerjet.com.tr/jobad/old", day="2025-12-01")
+    new = ranked("https://careerjet.co.uk/jobad/new", day=(TODAY - timedelta(days=1)).isoformat())
+    undated = ranked("https://careerjet.de/jobad/undated")
+    lists = [("tr_TR", old), ("de_DE", undated), ("en_GB", new)]
+    assert [job["title"] for job in rank_federated_jobs(lists, date_weight=0, today=TODAY)] == [
+        "old", "undated", "new"]
+    assert [job["title"] for job in rank_federated_jobs(lists, date_weight=0.5, today=TODAY)] == [
+        "new", "old", "undated"]
+    # Out of range weights are clamped instead of inverting the order
+    assert rank_federated_jobs(lists, date_weight=5, today=TODAY)[0]["title"] == "new"
+
+
+def test_rank_federated_jobs_handles_no_results():
+    assert rank_federated_jobs([("tr_TR", []), ("en_GB", [])], today=TODAY) == []
+
+
+@pytest.fixture
+def stub_search(monkeypatch):
+    """Replace search_jobs with per-locale canned results; a locale may also block or raise."""
+    results = {}
+    release = threading.Event()
+
+    def search_jobs(keywords, location, locale=None, **kwargs):
+        result = results[locale]
+        if result == "block":
+            release.wait(5)
+            return {"type": "JOBS", "hits": 1, "jobs": ranked("https://careerjet.de/jobad/late")}
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(app, "search_jobs", search_jobs)
+    yield results
+    release.set()
+
+
+def test_search_jobs_federated_merges_locales(stub_search):
+    stub_search["tr_TR"] = {"type": "JOBS", "hits": 120, "jobs": ranked("https://careerjet.com.tr/jobad/a")}
+    stub_search["en_GB"] = {"type": "JOBS", "hits": 80, "jobs": ranked("https://careerjet.co.uk/jobad/b")}
+    result = search_jobs_federated("python", "", "tr_TR, en_GB,tr_TR", date_weight=0)
+    assert not result["partial"]
+    assert result["hits"] == 200
+    assert result["total_jobs"] == 2
+    assert [job["title"] for job in result["jobs"]] == ["a", "b"]
+    assert {locale: status["status"] for locale, status in result["locales"].items()} == {
+        "tr_TR": "ok", "en_GB": "ok"}
+
+
+def test_search_jobs_federated_returns_partial_results_when_a_locale_fails(stub_search):
+    stub_search["tr_TR"] = {"type": "JOBS", "hits": 1, "jobs": ranked("https://careerjet.com.tr/jobad/a")}
+    stub_search["en_GB"] = {"error": "Upstream returned 500"}
+    stub_search["de_DE"] = RuntimeError("connection reset")
+    result = search_jobs_federated("python", "", ["tr_TR", "en_GB", "de_DE"])
+    assert result["partial"]
+    assert [job["title"] for job in result["jobs"]] == ["a"]
+    assert result["locales"]["en_GB"] == {"status": "error", "error": "Upstream returned 500",
+                                          "seconds": result["locales"]["en_GB"]["seconds"]}
+    assert result["locales"]["de_DE"] == {"status": "error", "error": "connection reset"}
+
+
+def test_search_jobs_federated_does_not_wait_past_the_timeout(stub_search):
+    stub_search["tr_TR"] = {"type": "JOBS", "hits": 1, "jobs": ranked("https://careerjet.com.tr/jobad/a")}
+    stub_search["de_DE"] = "block"
+    started = time.perf_counter()
+    result = search_jobs_federated("python", "", ["tr_TR", "de_DE"], timeout=0.2)
+    assert time.perf_counter() - started < 2
+    assert result["partial"]
+    assert result["locales"]["de_DE"] == {"status": "timeout"}
+    assert [job["title"] for job in result["jobs"]] == ["a"]
+
+
+@pytest.mark.parametrize("locales, kwargs, error", [
+    ([], {}, "At least one locale"),
+    (["tr_TR", "english"], {}, "Invalid locale codes: english"),
+    ([f"x{i}_TR" for i in range(9)], {}, "Too many locales"),
+    (["tr_TR"], {"timeout": "soon"}, "must be numbers"),
+])
+def test_search_jobs_federated_rejects_invalid_arguments(stub_search, locales, kwargs, error):
+    assert error in search_jobs_federated("python", "", locales, **kwargs)["error"]
+
+
+@pytest.fixture
+def saved_store(tmp_path, monkeypatch):
+    store = SavedSearchStore(str(tmp_path / "saved.db"))
+    monkeypatch.setattr(app, "get_saved_searches", lambda: store)
+    yield store
+    store.close()
+
+
+def live_result(*numbers):
+    return {"type": "JOBS", "hits": len(numbers), "jobs": ranked(*(f"https://careerjet.com.tr/jobad/{n}" for n in numbers))}
+
+
+def test_poll_saved_search_reports_new_jobs(saved_store, monkeypatch):
+    results = [live_result(1, 2), live_result(1, 2, 3)]
+    monkeypatch.setattr(app, "search_jobs", lambda *args, **kwargs: results.pop(0))
+    search = app.save_search("python", "istanbul", "tr_TR")
+    assert "warning" not in search
+    assert app.poll_saved_search(saved_store.get(search["id"])) == {"new": 1}
+    assert [job["title"] for job in app.get_new_jobs(search["id"])["jobs"]] == ["3"]
+
+
+def test_poll_of_a_search_deleted_meanwhile_is_not_found(saved_store, monkeypatch):
+    search = saved_store.create("python", "istanbul", "tr_TR", {}, 3600, 0.0)
+
+    def search_jobs(*args, **kwargs):
+        saved_store.delete(search["id"])
+        return live_result(1)
+
+    monkeypatch.setattr(app, "search_jobs", search_jobs)
+    assert app.poll_saved_search(search) == {"error": "Saved search not found"}
+    # Saving reports the same error when the search disappears during its baseline poll
+    monkeypatch.setattr(app, "search_jobs", lambda *args, **kwargs: saved_store.delete(
+        saved_store.list()[0]["id"]) and live_result(1))
+    assert app.save_search("python", "istanbul", "tr_TR") == {"error": "Saved search not found"}
@@ -0,0 +1,241 @@
+import threading
+
+import pytest
+
+import cache
+from cache import SingleFlight, TTLCache, estimate_size, make_search_key
+from conftest import FakeClock, wait_until
+
+
+def run_concurrently(flight, key, func, callers):
+    """Start ``callers`` threads calling ``flight.do(key, func)``; return (threads, outcomes)."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            result = flight.do(key, func)
+        except Exception as e:
+            result = e
+        with lock:
+            outcomes.append(result)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(2)
+        return {"jobs": [1, 2, 3]}
+
+    threads, outcomes = run_concurrently(flight, "python|istanbul", load, 5)
+    wait_until(lambda: flight.stats()["collapsed"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(outcomes) == 5
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["collapse_ratio"] == 0.8
+    assert stats["max_waiters"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def load():
+        release.wait(2)
+        raise RuntimeError("upstream down")
+
+    threads, outcomes = run_concurrently(flight, "key", load, 3)
+    wait_until(lambda: flight.stats()["collapsed"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, RuntimeError) and str(outcome) == "upstream down" for outcome in outcomes)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_distinct_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+    assert flight.stats()["collapsed"] == 0
+
+
+def test_completed_key_runs_again():
+    flight = SingleFlight()
+    results = iter([1, 2])
+    assert flight.do("a", lambda: next(results)) == 1
+    assert flight.do("a", lambda: next(results)) == 2
+    assert flight.stats()["executions"] == 2
+
+
+def test_leader_exception_is_raised_and_key_is_freed():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("a", lambda: (_ for _ in ()).throw(ValueError("bad")))
+    assert flight.do("a", lambda: "ok") == "ok"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    ttl_cache = TTLCache(ttl=10, stale_ttl=0)
+    ttl_cache.set("a", 1)
+    clock.advance(9.9)
+    assert ttl_cache.get("a") == 1
+    clock.advance(0.1)
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.lookup("a") == (None, "miss")
+
+
+def test_stale_entries_are_served_until_stale_ttl(clock):
+    ttl_cache = TTLCache(ttl=10, stale_ttl=20)
+    ttl_cache.set("a", 1)
+    clock.advance(15)
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.lookup("a") == (1, "stale")
+    clock.advance(15)
+    assert ttl_cache.lookup("a") == (None, "miss")
+    # An expired entry is kept as the last known good answer until evicted
+    assert ttl_cache.peek("a") == 1
+
+
+def test_peek_does_not_touch_counters_or_lru_order(clock):
+    ttl_cache = TTLCache(ttl=10, max_entries=2)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    assert ttl_cache.peek("a") == 1
+    assert ttl_cache.peek("missing") is None
+    ttl_cache.set("c", 3)
+    assert ttl_cache.peek("a") is None
+    stats = ttl_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+
+
+def test_evicts_least_recently_used_first(clock):
+    ttl_cache = TTLCache(ttl=10, max_entries=3)
+    for key in "abc":
+        ttl_cache.set(key, key)
+    assert ttl_cache.get("a") == "a"
+    ttl_cache.set("d", "d")
+    assert ttl_cache.peek("b") is None
+    assert [ttl_cache.peek(key) for key in "acd"] == ["a", "c", "d"]
+    ttl_cache.set("c", "c2")
+    ttl_cache.set("e", "e")
+    assert ttl_cache.peek("a") is None
+    assert ttl_cache.stats()["evictions"] == 2
+    assert len(ttl_cache) == 3
+
+
+def test_byte_budget_evicts_until_it_fits(clock):
+    ttl_cache = TTLCache(ttl=10, max_entries=100, max_bytes=1000, sizeof=len)
+    ttl_cache.set("a", "x" * 400)
+    ttl_cache.set("b", "x" * 400)
+    assert ttl_cache.bytes == 800
+    ttl_cache.set("c", "x" * 300)
+    assert ttl_cache.peek("a") is None
+    assert ttl_cache.bytes == 700
+
+    # Replacing a value charges only the new size
+    ttl_cache.set("b", "x" * 100)
+    assert ttl_cache.bytes == 400
+    ttl_cache.invalidate("c")
+    assert ttl_cache.bytes == 100
+    ttl_cache.clear()
+    assert ttl_cache.bytes == 0
+
+
+def test_value_larger_than_the_budget_is_not_stored(clock):
+    ttl_cache = TTLCache(ttl=10, max_bytes=100, sizeof=len)
+    ttl_cache.set("a", "x" * 50)
+    ttl_cache.set("b", "x" * 101)
+    assert ttl_cache.peek("b") is None
+    assert ttl_cache.peek("a") == "x" * 50
+    # It also drops the previous value of that key rather than serving it as current
+    ttl_cache.set("a", "x" * 200)
+    assert ttl_cache.peek("a") is None
+    assert ttl_cache.bytes == 0
+
+
+def test_byte_budget_uses_estimate_size_by_default(clock):
+    page = {"jobs": [{"title": "Python Developer", "description": "x" * 1000} for _ in range(10)]}
+    ttl_cache = TTLCache(ttl=10, max_bytes=estimate_size(page) * 2)
+    ttl_cache.set("a", page)
+    ttl_cache.set("b", page)
+    ttl_cache.set("c", page)
+    assert len(ttl_cache) == 2
+    assert ttl_cache.stats()["bytes"] == estimate_size(page) * 2
+
+
+def test_estimate_size_counts_nested_values():
+    text = "x" * 1000
+    assert estimate_size(text) >= 1000
+    assert estimate_size({"a": [text, text]}) > 2 * estimate_size(text)
+    assert estimate_size((text,)) > estimate_size(text)
+
+
+def test_get_or_load_refreshes_stale_entries_in_background(clock):
+    ttl_cache = TTLCache(ttl=10, stale_ttl=60)
+    assert ttl_cache.get_or_load("a", lambda: 1) == 1
+    clock.advance(20)
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return 2
+
+    # The stale value is returned at once and replaced in the background
+    assert ttl_cache.get_or_load("a", lambda: 3, refresh_loader=refresh) == 1
+    assert refreshed.wait(2)
+    wait_until(lambda: ttl_cache.stats()["refreshes"] == 1)
+    assert ttl_cache.get("a") == 2
+
+
+def test_get_or_load_skips_uncacheable_values(clock):
+    ttl_cache = TTLCache(ttl=10)
+    assert ttl_cache.get_or_load("a", lambda: {"error": "down"}, cacheable=lambda value: "error" not in value)
+    assert len(ttl_cache) == 0
+
+
+@pytest.mark.parametrize("keywords, location", [
+    ("yazılım geliştirici", "istanbul"),
+    ("  Yazılım   Geliştirici ", "İstanbul"),
+    ("Yazılım GELİŞTİRİCİ", "İSTANBUL"),
+    ("yazılım\tgeliştirici", "i̇stanbul"),
+])
+def test_make_search_key_normalizes_case_whitespace_and_turkish_i(keywords, location):
+    expected = make_search_key("yazılım geliştirici", "istanbul", "tr_TR", None, {})
+    assert make_search_key(keywords, location, " tr_TR ", None, {}) == expected
+
+
+def test_make_search_key_separates_parameters():
+    base = make_search_key("python", "ankara", "tr_TR", "affid", {"page": 1, "sort": None})
+    assert base == make_search_key("python", "ankara", "tr_TR", "affid", {"page": "1"})
+    assert base != make_search_key("python", "ankara", "tr_TR", "affid", {"page": 2})
+    assert base != make_search_key("python", "ankara", "en_GB", "affid", {"page": 1})
+    assert base != make_search_key("python", "ankara", "tr_TR", "other", {"page": 1})
+    # Dotless ı and dotted i are different letters (case folding maps I to i, not ı)
+    assert make_search_key("ışık", "", "", None, {}) != make_search_key("isik", "", "", None, {})
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+import app
+from demo_corpus import JobCorpus
+
+
+def test_same_seed_and_query_give_the_same_jobs():
+    first = JobCorpus(seed=7, description_words=20, reference_date=date(2026, 3, 1))
+    second = JobCorpus(seed=7, description_words=20, reference_date=date(2026, 3, 1))
+    assert first.page("Python Developer", "İstanbul", 2) == second.page("Python Developer", "İstanbul", 2)
+    # The query is case-insensitive and pages are slices of the same sequence
+    assert [job["id"] for job in first.page("python developer", "İSTANBUL", 2, style="demo")] == \
+        [job["id"] for job in second.page("Python Developer", "İstanbul", 2, style="demo")]
+    assert first.page("Python Developer", "İstanbul", 2, pagesize=5) == \
+        list(second.iter_jobs("Python Developer", "İstanbul", 5, 10))
+
+
+def test_seed_and_query_change_the_jobs():
+    corpus = JobCorpus(seed=7, reference_date=date(2026, 3, 1))
+    jobs = corpus.page("Python Developer", "İstanbul")
+    assert JobCorpus(seed=8, reference_date=date(2026, 3, 1)).page("Python Developer", "İstanbul") != jobs
+    assert corpus.page("Go Developer", "İstanbul") != jobs
+
+
+def test_pages_stop_at_the_corpus_size():
+    corpus = JobCorpus(size=45)
+    assert len(corpus.page("python", "ankara", 3, pagesize=20)) == 5
+    assert corpus.page("python", "ankara", 4, pagesize=20) == []
+
+
+def test_posting_dates_are_relative_to_the_reference_date():
+    corpus = JobCorpus(reference_date=date(2026, 3, 1))
+    dates = {job["date"] for job in corpus.iter_jobs("python", "ankara", 0, 200)}
+    assert max(dates) <= "2026-03-01"
+    assert min(dates) >= (date(2026, 3, 1) - timedelta(days=29)).isoformat()
+
+
+def test_demo_dates_default_to_today():
+    today = date.today()
+    dates = {job["date"] for job in JobCorpus(size=100).iter_jobs("python", "ankara")}
+    assert max(dates) <= today.isoformat()
+    assert min(dates) >= (today - timedelta(days=29)).isoformat()
+    if app.DEMO_REFERENCE_DATE is None:
+        jobs = app.create_demo_response("python", "ankara", 1, 50)["jobs"]
+        assert max(job["date"] for job in jobs) >= (today - timedelta(days=29)).isoformat()
+
+
+def test_demo_response_reports_pages():
+    result = app.create_demo_response("python", "ankara", 2, 25)
+    assert result["type"] == "demo"
+    assert result["pages"] == -(-app.demo_corpus.size // 25)
+    assert result["jobs"] == app.demo_corpus.page("python", "ankara", 2, 25, style="demo")
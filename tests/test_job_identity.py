@@ -0,0 +1,47 @@
+import pytest
+
+from job_identity import job_content_key, job_id, normalize_job_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://WWW.Careerjet.com.tr/jobad/abc", "https://careerjet.com.tr/jobad/abc"),
+    ("https://careerjet.com.tr/jobad/abc/", "https://careerjet.com.tr/jobad/abc"),
+    ("https://careerjet.com.tr/jobad/abc#apply", "https://careerjet.com.tr/jobad/abc"),
+    ("https://careerjet.com.tr:443/jobad/abc", "https://careerjet.com.tr/jobad/abc"),
+    ("https://careerjet.com.tr:8443/jobad/abc", "https://careerjet.com.tr:8443/jobad/abc"),
+    ("https://careerjet.com.tr", "https://careerjet.com.tr/"),
+    ("  https://careerjet.com.tr/jobad/abc  ", "https://careerjet.com.tr/jobad/abc"),
+])
+def test_normalize_job_url_canonical_forms(url, expected):
+    assert normalize_job_url(url) == expected
+
+
+def test_normalize_job_url_drops_tracking_and_sorts_query():
+    url = "https://careerjet.com.tr/jobad?utm_source=x&id=7&gclid=1&UTM_Medium=y&a=&ref=home"
+    assert normalize_job_url(url) == "https://careerjet.com.tr/jobad?a=&id=7"
+
+
+def test_job_content_key_normalizes_fields():
+    first = {"title": "Python  Developer", "company": "Acme", "locations": "Istanbul"}
+    second = {"title": "python developer", "company": "ACME", "location": " istanbul "}
+    assert job_content_key(first) == job_content_key(second)
+
+
+def test_job_content_key_requires_title_and_company():
+    assert job_content_key({"title": "Python Developer"}) is None
+    assert job_content_key({"company": "Acme"}) is None
+
+
+def test_job_id_is_stable_for_equivalent_urls():
+    first = {"url": "https://www.careerjet.com.tr/jobad/abc?utm_source=mail"}
+    second = {"url": "https://careerjet.com.tr/jobad/abc/"}
+    assert job_id(first) == job_id(second)
+    assert len(job_id(first)) == 16
+    assert job_id(first) != job_id({"url": "https://careerjet.com.tr/jobad/def"})
+
+
+def test_job_id_falls_back_to_content_without_url():
+    first = {"title": "Python Developer", "company": "Acme", "locations": "Istanbul"}
+    second = {"title": "PYTHON developer", "company": "acme", "locations": "istanbul"}
+    assert job_id(first) == job_id(second)
+    assert job_id(first) != job_id(dict(first, company="Other"))
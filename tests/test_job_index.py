@@ -0,0 +1,178 @@
+import sqlite3
+
+import pytest
+
+import job_index
+from conftest import FakeClock
+from job_index import JobIndex
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(job_index, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def index(tmp_path, clock):
+    index = JobIndex(str(tmp_path / "jobs.db"), max_jobs=100, max_age_days=1)
+    yield index
+    index.close()
+
+
+def make_job(number, title="Python Developer", company="Acme", locations="İstanbul", **extra):
+    return dict(url=f"https://careerjet.com.tr/jobad/{number}", title=title, company=company,
+                locations=locations, **extra)
+
+
+def titles(result):
+    return [job["title"] for job in result["jobs"]]
+
+
+def test_ingest_dedupes_by_job_key(index):
+    assert index.ingest([make_job(1), make_job(2, title="Go Developer")], locale="tr_TR") == 2
+    # Tracking parameters do not make a new posting; the row is refreshed in place
+    index.ingest([make_job("1/?utm_source=mail", title="Python Developer (remote)")], locale="tr_TR")
+    assert index.stats()["jobs"] == 2
+    assert titles(index.search("remote")) == ["Python Developer (remote)"]
+    # The old title is no longer searchable under the refreshed row
+    assert titles(index.search("python")) == ["Python Developer (remote)"]
+
+
+def test_ingest_dedupes_by_content_key_across_locales(index):
+    index.ingest([make_job(1)], locale="tr_TR")
+    index.ingest([{"url": "https://careerjet.co.uk/jobad/9", "title": "python developer",
+                   "company": "ACME", "locations": "İstanbul"}], locale="en_GB")
+    assert index.stats()["jobs"] == 1
+    result = index.search("python")
+    assert result["hits"] == 1
+    assert result["jobs"][0]["url"] == "https://careerjet.co.uk/jobad/9"
+    assert index.search("python", locale="en_GB")["hits"] == 1
+    assert index.search("python", locale="tr_TR")["hits"] == 0
+
+
+def test_ingest_skips_jobs_without_url(index):
+    assert index.ingest([{"title": "No URL"}]) == 0
+    assert index.stats()["jobs"] == 0
+
+
+def test_search_folds_turkish_letters_and_matches_prefixes(index):
+    index.ingest([make_job(1, title="Yazılım Geliştirici", locations="İzmir"), make_job(2, locations="Ankara")])
+    assert titles(index.search("YAZILIM gelis")) == ["Yazılım Geliştirici"]
+    assert titles(index.search("", location="izmir")) == ["Yazılım Geliştirici"]
+    assert index.search("developer", location="izmir")["hits"] == 0
+
+
+def test_search_pages_results(index):
+    index.ingest([make_job(number, title=f"Python Developer {number}") for number in range(5)])
+    result = index.search("python", page=3, pagesize=2)
+    assert result["hits"] == 5
+    assert result["pages"] == 3
+    assert len(result["jobs"]) == 1
+
+
+@pytest.mark.parametrize("keywords, hits", [
+    ('python"', 1),
+    ('"python developer', 1),
+    ("-python", 1),
+    ("python -", 1),
+    ("python*", 1),
+    ("(python", 1),
+    ("python^", 1),
+    # Operators and column filters are plain words that every match must contain
+    ('python" OR "sales', 0),
+    ("python NEAR developer", 0),
+    ("NEAR(python developer, 2)", 0),
+    ("python AND", 0),
+    ("title:python", 0),
+    ("sales NOT python", 0),
+])
+def test_search_escapes_fts_query_syntax(index, keywords, hits):
+    index.ingest([make_job(1), make_job(2, title="Near East Sales", company="Other")])
+    result = index.search(keywords)
+    assert result["hits"] == hits
+    if hits:
+        assert titles(result) == ["Python Developer"]
+
+
+def test_search_treats_operators_as_plain_words(index):
+    index.ingest([make_job(1), make_job(2, title="Near East Sales", company="Other")])
+    assert titles(index.search("near")) == ["Near East Sales"]
+    assert titles(index.search("NEAR east")) == ["Near East Sales"]
+    assert index.search("'; DROP TABLE jobs; --")["hits"] == 0
+    assert index.stats()["jobs"] == 2
+
+
+def test_search_without_terms_returns_nothing(index):
+    index.ingest([make_job(1)])
+    assert index.search("  -- \"\" ")["hits"] == 0
+
+
+def test_prune_runs_every_50_ingests(index, clock, monkeypatch):
+    calls = []
+    prune = index._prune
+    monkeypatch.setattr(index, "_prune", lambda now: calls.append(now) or prune(now))
+    for number in range(49):
+        index.ingest([make_job(number)])
+    assert calls == []
+    index.ingest([make_job(49)])
+    assert calls == [clock.now]
+    # Calls without listings do not count towards the next prune
+    index.ingest([])
+    for number in range(50, 99):
+        index.ingest([make_job(number)])
+    assert len(calls) == 1
+
+
+def test_prune_drops_jobs_older_than_max_age(index, clock):
+    index.ingest([make_job(1), make_job(2, title="Python Engineer")])
+    clock.advance(2 * 86400)
+    # Seeing a posting again keeps it alive
+    index.ingest([make_job(2, title="Python Engineer")])
+    index.prune()
+    assert index.stats()["jobs"] == 1
+    assert index.stats()["pruned"] == 1
+    assert [job["url"] for job in index.search("python")["jobs"]] == ["https://careerjet.com.tr/jobad/2"]
+
+
+def test_prune_keeps_most_recently_seen_jobs_within_max_jobs(tmp_path, clock):
+    index = JobIndex(str(tmp_path / "jobs.db"), max_jobs=3, max_age_days=30)
+    try:
+        for number in range(5):
+            index.ingest([make_job(number, title=f"Python Developer {number}")])
+            clock.advance(1)
+        index.prune()
+        assert index.stats()["jobs"] == 3
+        assert sorted(titles(index.search("python"))) == [f"Python Developer {number}" for number in (2, 3, 4)]
+    finally:
+        index.close()
+
+
+def test_old_schema_is_rebuilt(tmp_path, clock):
+    path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE jobs (url TEXT PRIMARY KEY, title TEXT, payload TEXT);
+        INSERT INTO jobs VALUES ('https://careerjet.com.tr/jobad/1?utm_source=x', 'Old', '{}');
+        CREATE VIRTUAL TABLE jobs_fts USING fts5(title);
+        INSERT INTO jobs_fts (title) VALUES ('old');
+    """)
+    conn.commit()
+    conn.close()
+
+    index = JobIndex(path)
+    try:
+        assert index.stats()["jobs"] == 0
+        assert index.search("old")["hits"] == 0
+        assert index._conn.execute("PRAGMA user_version").fetchone()[0] == job_index._SCHEMA_VERSION
+        index.ingest([make_job(1)])
+    finally:
+        index.close()
+
+    # A file already on the current schema keeps its rows
+    index = JobIndex(path)
+    try:
+        assert index.stats()["jobs"] == 1
+    finally:
+        index.close()
@@ -0,0 +1,19 @@
+import app
+from metrics import MetricsRegistry
+
+
+def test_callback_counter_is_exported_as_a_counter():
+    registry = MetricsRegistry()
+    registry.callback_counter("lookups_total", "Lookups", lambda: {("hits",): 3, ("misses",): 1}, labels=("result",))
+    registry.gauge("entries", "Entries", lambda: 2)
+    text = registry.render()
+    assert "# TYPE lookups_total counter" in text
+    assert 'lookups_total{result="hits"} 3' in text
+    assert "# TYPE entries gauge" in text
+    assert registry.snapshot()["lookups_total"] == {"hits": 3, "misses": 1}
+
+
+def test_cache_lookups_are_a_counter():
+    text = app.metrics_registry.render()
+    assert "# TYPE career_cache_lookups_total counter" in text
+    assert 'career_cache_lookups_total{result="misses"}' in text
@@ -0,0 +1,96 @@
+import pytest
+
+from demo_corpus import JobCorpus
+from job_identity import job_id
+from projection import SUMMARY_FIELDS, make_projection, parse_fields, truncate_text
+
+UPSTREAM_JOB = {
+    "title": "Python Developer",
+    "company": "Acme",
+    "locations": "İstanbul",
+    "date": "2026-03-01",
+    "description": "Python ve Docker ile REST API geliştirme.",
+    "salary": "60.000 TL",
+    "url": "https://careerjet.com.tr/jobad/1",
+}
+
+
+@pytest.mark.parametrize("text, limit, expected", [
+    ("short", 10, "short"),
+    ("exactly10!", 10, "exactly10!"),
+    ("Python developer wanted in Istanbul", 20, "Python developer…"),
+    ("Supercalifragilistic", 10, "Supercali…"),
+    ("Python, Docker, Kubernetes", 17, "Python, Docker…"),
+    ("anything", 1, "…"),
+    ("anything", 0, ""),
+    (None, 5, None),
+])
+def test_truncate_text(text, limit, expected):
+    result = truncate_text(text, limit)
+    assert result == expected
+    if isinstance(result, str):
+        assert len(result) <= limit
+
+
+def test_make_projection_keeps_results_without_options():
+    assert make_projection() is None
+    assert make_projection(fields=[], summary=False) is None
+
+
+def test_fields_win_over_summary_and_keep_request_order():
+    projection = make_projection(fields="url, title,url", summary=True)
+    assert projection.fields == ("url", "title")
+    assert list(projection.job(UPSTREAM_JOB)) == ["url", "title"]
+
+
+def test_description_is_truncated_when_kept():
+    projection = make_projection(max_description_chars=10)
+    job = projection.job(UPSTREAM_JOB)
+    assert job["description"] == "Python…"
+    assert job["title"] == UPSTREAM_JOB["title"]
+    # A description-only limit never copies jobs that have nothing to cut
+    assert projection.job({"title": "No description"}) == {"title": "No description"}
+
+
+@pytest.mark.parametrize("options, error", [
+    ({"fields": ["title", "salaryz"]}, "Unknown fields: salaryz"),
+    ({"max_description_chars": -1}, "must be >= 0"),
+    ({"max_description_chars": "many"}, "must be an integer"),
+])
+def test_make_projection_rejects_invalid_options(options, error):
+    with pytest.raises(ValueError, match=error):
+        make_projection(**options)
+
+
+def test_aliases_map_to_canonical_fields():
+    assert parse_fields(["locations", "location", "postedDate"]) == ("location", "date")
+
+
+def test_summary_has_the_same_fields_for_upstream_and_demo_jobs():
+    demo_job = JobCorpus(seed=1).job("Python", "İstanbul", 0, style="demo")
+    projection = make_projection(summary=True)
+    upstream = projection.job(UPSTREAM_JOB)
+    demo = projection.job(demo_job)
+    assert set(upstream) == set(demo) == set(SUMMARY_FIELDS) - {"locales"}
+    assert upstream["location"] == "İstanbul"
+    assert upstream["id"] == job_id(UPSTREAM_JOB)
+    assert demo["location"] == demo_job["location"]
+    assert demo["id"] == demo_job["id"]
+
+
+def test_requirements_come_from_the_job_or_its_description():
+    projection = make_projection(fields=["title", "requirements"])
+    assert projection.job(UPSTREAM_JOB)["requirements"] == ["Python", "Docker", "API", "REST"]
+    assert projection.job(dict(UPSTREAM_JOB, requirements=["Go"]))["requirements"] == ["Go"]
+    result = projection.result({"jobs": [UPSTREAM_JOB, dict(UPSTREAM_JOB, description="")]})
+    assert [job["requirements"] for job in result["jobs"]] == [["Python", "Docker", "API", "REST"], []]
+
+
+def test_result_projects_batches_without_touching_the_input():
+    result = {"results": [{"result": {"jobs": [UPSTREAM_JOB]}}, {"error": "x"}],
+              "merged": {"jobs": [UPSTREAM_JOB]}}
+    projected = make_projection(fields=["title"]).result(result)
+    assert projected["results"][0]["result"]["jobs"] == [{"title": "Python Developer"}]
+    assert projected["results"][1] == {"error": "x"}
+    assert projected["merged"]["jobs"] == [{"title": "Python Developer"}]
+    assert result["merged"]["jobs"][0] is UPSTREAM_JOB
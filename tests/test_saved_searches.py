@@ -0,0 +1,152 @@
+import pytest
+
+from job_identity import job_id
+from saved_searches import SavedSearchScheduler, SavedSearchStore, job_fingerprint, next_check_time
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SavedSearchStore(str(tmp_path / "saved.db"))
+    yield store
+    store.close()
+
+
+def make_jobs(*numbers):
+    jobs = [{"title": f"Job {number}", "url": f"https://careerjet.com.tr/jobad/{number}"} for number in numbers]
+    return [(job_fingerprint(job_id(job)), job) for job in jobs]
+
+
+def create(store, next_check=0.0):
+    return store.create("python", "istanbul", "tr_TR", {"sort": "date"}, 3600, next_check)
+
+
+def test_job_fingerprint_fits_sqlite_integer():
+    assert job_fingerprint("ffffffffffffffff") == 2 ** 63 - 1
+    assert job_fingerprint("0000000000000001") == 0
+
+
+def test_next_check_time_stays_within_jitter():
+    for _ in range(100):
+        assert 1090 <= next_check_time(1000, 100, 0.1) <= 1110
+
+
+def test_first_poll_is_the_baseline(store):
+    search = create(store)
+    assert store.record_poll(search["id"], make_jobs(1, 2, 3), 100) == 0
+    jobs, cursor, has_more = store.new_jobs_since(search["id"])
+    assert jobs == []
+    assert not has_more
+    # The cursor still moves past the baseline
+    assert cursor == store.cursor(search["id"]) > 0
+    assert store.get(search["id"])["checks"] == 1
+
+
+def test_later_polls_report_only_unseen_jobs(store):
+    search = create(store)
+    store.record_poll(search["id"], make_jobs(1, 2, 3), 100)
+    cursor = store.cursor(search["id"])
+
+    assert store.record_poll(search["id"], make_jobs(2, 3, 4, 5, 4), 200) == 2
+    assert store.record_poll(search["id"], make_jobs(1, 5), 300) == 0
+
+    jobs, next_cursor, has_more = store.new_jobs_since(search["id"], cursor)
+    assert [job["title"] for job in jobs] == ["Job 4", "Job 5"]
+    assert all("first_seen" in job for job in jobs)
+    assert not has_more
+    assert store.new_jobs_since(search["id"], next_cursor) == ([], next_cursor, False)
+
+    saved = store.get(search["id"])
+    assert saved["checks"] == 3
+    assert saved["last_new"] == 0
+    assert saved["next_check"] == 300
+
+
+def test_new_jobs_since_pages_with_limit(store):
+    search = create(store)
+    store.record_poll(search["id"], [], 100)
+    store.record_poll(search["id"], make_jobs(1, 2, 3), 200)
+
+    jobs, cursor, has_more = store.new_jobs_since(search["id"], limit=2)
+    assert [job["title"] for job in jobs] == ["Job 1", "Job 2"]
+    assert has_more
+    jobs, cursor, has_more = store.new_jobs_since(search["id"], cursor, limit=2)
+    assert [job["title"] for job in jobs] == ["Job 3"]
+    assert not has_more
+
+
+def test_fingerprints_are_capped_per_search(tmp_path):
+    store = SavedSearchStore(str(tmp_path / "saved.db"), max_fingerprints=3)
+    search = create(store)
+    store.record_poll(search["id"], make_jobs(1, 2, 3, 4, 5), 100)
+    assert store.stats()["fingerprints"] == 3
+    # The oldest fingerprints were dropped, so those jobs count as new again
+    assert store.record_poll(search["id"], make_jobs(1), 200) == 1
+    store.close()
+
+
+def test_record_poll_for_deleted_search(store):
+    search = create(store)
+    assert store.delete(search["id"])
+    assert not store.delete(search["id"])
+    assert store.record_poll(search["id"], make_jobs(1), 100) == -1
+
+
+def test_record_error_keeps_fingerprints(store):
+    search = create(store)
+    store.record_poll(search["id"], make_jobs(1), 100)
+    store.record_error(search["id"], RuntimeError("upstream down"), 150)
+    saved = store.get(search["id"])
+    assert saved["last_error"] == "upstream down"
+    assert saved["next_check"] == 150
+    assert store.record_poll(search["id"], make_jobs(1), 200) == 0
+    assert store.get(search["id"])["last_error"] is None
+
+
+def test_claim_due_takes_a_lease(store):
+    due = create(store, next_check=100)
+    create(store, next_check=500)
+
+    claimed = store.claim_due(now=200, lease=60)
+    assert [search["id"] for search in claimed] == [due["id"]]
+    assert store.get(due["id"])["next_check"] == 260
+    # Leased searches are not handed out again until the lease expires
+    assert store.claim_due(now=250, lease=60) == []
+    assert [search["id"] for search in store.claim_due(now=260, lease=60)] == [due["id"]]
+
+
+def test_claim_due_respects_limit_and_order(store):
+    late = create(store, next_check=30)
+    early = create(store, next_check=10)
+    middle = create(store, next_check=20)
+    claimed = store.claim_due(now=100, limit=2)
+    assert [search["id"] for search in claimed] == [early["id"], middle["id"]]
+    assert store.get(late["id"])["next_check"] == 30
+
+
+def test_stores_sharing_a_file_never_claim_the_same_search(tmp_path):
+    path = str(tmp_path / "saved.db")
+    first, second = SavedSearchStore(path), SavedSearchStore(path)
+    for _ in range(5):
+        create(first)
+    claimed = first.claim_due(now=100, limit=3) + second.claim_due(now=100, limit=3)
+    assert len({search["id"] for search in claimed}) == len(claimed) == 5
+    first.close()
+    second.close()
+
+
+def test_scheduler_polls_due_searches_and_survives_errors(store):
+    polled = []
+
+    def poll(search):
+        polled.append(search["id"])
+        if len(polled) == 1:
+            raise RuntimeError("boom")
+
+    first = create(store, next_check=10)
+    second = create(store, next_check=20)
+    create(store, next_check=1000)
+    scheduler = SavedSearchScheduler(store, poll, batch=10)
+    assert scheduler.run_once(now=100) == 2
+    assert polled == [first["id"], second["id"]]
+    assert scheduler.errors == 1
+    assert scheduler.run_once(now=100) == 0
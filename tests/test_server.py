@@ -0,0 +1,21 @@
+import asyncio
+import threading
+
+import app
+import server
+
+
+def test_server_stats_tool_is_instrumented_and_runs_off_the_event_loop(monkeypatch):
+    threads = []
+    stats = app.get_server_stats
+
+    def get_server_stats():
+        threads.append(threading.current_thread())
+        return stats()
+
+    monkeypatch.setattr(server, "get_server_stats", get_server_stats)
+    before = server.tool_calls.snapshot().get("get_server_stats_tool,ok", 0)
+    result = asyncio.run(server.get_server_stats_tool())
+    assert set(result) >= {"metrics", "cache", "upstream", "saved_searches"}
+    assert threads and threads[0] is not threading.main_thread()
+    assert server.tool_calls.snapshot()["get_server_stats_tool,ok"] == before + 1
@@ -0,0 +1,88 @@
+import pytest
+
+from skills import DEFAULT_TAXONOMY_PATH, SkillMatcher, normalize_text
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Word boundaries: neither skill is found inside the other word
+    ("Java ve JavaScript bilgisi", ["JavaScript", "Java"]),
+    ("JavaScript geliştirici", ["JavaScript"]),
+    ("Java developer", ["Java"]),
+    ("rapid prototyping", []),
+    ("API tasarımı", ["API"]),
+    # Synonyms, case and Turkish İ
+    ("python3, PostgreSQL ve docker compose", ["Python", "PostgreSQL", "Docker"]),
+    ("İNGİLİZCE ve İleri Excel", ["Excel", "English"]),
+    ("react   native", ["React Native"]),
+])
+def test_matches_on_word_boundaries(matcher, text, expected):
+    assert matcher.match(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Take a rest, go home",
+    "express",
+    "Express your ideas freely",
+    "Swift bir şekilde karar verebilen",
+    "Let's go!",
+    "Sonuçları swift ve doğru raporlamak",
+])
+def test_ambiguous_words_in_prose_are_not_skills(matcher, text):
+    assert matcher.match(text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("JavaScript and REST APIs", ["JavaScript", "API", "REST"]),
+    ("REST API geliştirme", ["API", "REST"]),
+    ("RESTful servisler", ["REST"]),
+    ("REST ve GraphQL deneyimi", ["REST", "GraphQL"]),
+    ("Node.js ve Express ile backend", ["Node.js", "Express.js"]),
+    ("Express.js", ["Express.js"]),
+    ("iOS için Swift ve SwiftUI", ["Swift", "iOS", "SwiftUI"]),
+    ("Go ve Kubernetes deneyimi", ["Golang", "Kubernetes"]),
+    ("golang", ["Golang"]),
+])
+def test_ambiguous_words_need_context(matcher, text, expected):
+    assert matcher.match(text) == expected
+
+
+def test_context_must_be_within_the_window(matcher):
+    assert matcher.match("swift " + "x " * 40 + "ios") == ["iOS"]
+    assert matcher.match("swift " + "x " * 10 + "ios") == ["Swift", "iOS"]
+
+
+def test_match_many_keeps_results_per_text(matcher):
+    texts = ["Take a rest", "REST API", "", None, "Java", "express", "node.js"]
+    assert matcher.match_many(texts) == [[], ["API", "REST"], [], [], ["Java"], [], ["Node.js"]]
+    assert matcher.match_many(texts) == [matcher.match(text) for text in texts]
+
+
+def test_context_does_not_leak_between_batched_texts(matcher):
+    assert matcher.match_many(["swift", "ios"]) == [[], ["iOS"]]
+    assert matcher.match_many([]) == []
+
+
+def test_results_follow_taxonomy_order_and_limit_duplicates():
+    matcher = SkillMatcher([
+        {"name": "B", "synonyms": ["bee"]},
+        {"name": "A", "synonyms": []},
+        {"name": "Word", "synonyms": [], "ambiguous": ["word"], "context": ["term"]},
+    ])
+    assert matcher.match("a bee b A") == ["B", "A"]
+    assert matcher.match("word") == []
+    assert matcher.match("word term") == ["Word"]
+
+
+def test_empty_taxonomy_matches_nothing():
+    assert SkillMatcher([]).match("Python") == []
+    assert SkillMatcher([]).match_many(["Python"]) == [[]]
+
+
+def test_normalize_text_folds_turkish_dotted_i():
+    assert normalize_text("İngilizce") == normalize_text("ingilizce")
+    assert normalize_text(None) == ""
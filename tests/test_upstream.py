@@ -0,0 +1,254 @@
+import threading
+
+import pytest
+
+import upstream
+from conftest import FakeClock, wait_until
+from shared_state import SharedState
+from upstream import CircuitBreaker, UpstreamScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(upstream, "time", clock)
+    return clock
+
+
+def make_breaker(**kwargs):
+    options = dict(min_calls=4, failure_threshold=0.5, open_seconds=30, window_seconds=60)
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def run_in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_breaker_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_stays_closed_below_failure_threshold(clock):
+    breaker = make_breaker()
+    for success in (True, True, True, False, True):
+        breaker.record(success, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.trips == 0
+
+
+def test_breaker_opens_and_rejects_while_open(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.trips == 1
+    clock.advance(29)
+    assert not breaker.allow()
+
+
+def test_breaker_ignores_failures_outside_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    clock.advance(61)
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_calls"] == 0
+    assert not breaker.degraded()
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 2
+    assert not breaker.allow()
+
+
+def test_release_frees_an_unrecorded_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_release_after_record_does_not_free_a_new_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record(False, 0.1)
+    clock.advance(30)
+    assert run_in_thread(breaker.allow)
+    # The first caller's finally must not hand out the other thread's probe
+    breaker.release()
+    assert not breaker.allow()
+
+
+def test_release_ignores_probes_owned_by_other_threads(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.advance(30)
+    assert run_in_thread(breaker.allow)
+    breaker.release()
+    assert not breaker.allow()
+
+
+def test_degraded_tracks_failures_and_state(clock):
+    breaker = make_breaker()
+    assert not breaker.degraded()
+    breaker.record(False, 0.1)
+    assert breaker.degraded()
+    clock.advance(61)
+    assert not breaker.degraded()
+    trip(breaker)
+    assert breaker.degraded()
+
+
+def test_timeout_follows_p99_latency_within_bounds(clock):
+    breaker = make_breaker(min_timeout=0.5, max_timeout=5.0, timeout_multiplier=2.0)
+    assert breaker.timeout() == 5.0
+    for _ in range(4):
+        breaker.record(True, 0.8)
+    assert breaker.timeout() == pytest.approx(1.6)
+    for _ in range(4):
+        breaker.record(True, 0.01)
+    assert breaker.timeout() == pytest.approx(1.6)
+    fast = make_breaker(min_timeout=0.5)
+    for _ in range(4):
+        fast.record(True, 0.01)
+    assert fast.timeout() == 0.5
+
+
+class TokenGate:
+    """take_token stand-in that hands out tokens only when the test adds them."""
+
+    def __init__(self):
+        self.tokens = 0
+
+    def __call__(self):
+        if self.tokens > 0:
+            self.tokens -= 1
+            return 0
+        return 0.005
+
+
+def queued(scheduler, priority):
+    return scheduler.stats()["classes"][priority]["queued"]
+
+
+def granted(scheduler, priority):
+    return scheduler.stats()["classes"][priority]["granted"]
+
+
+def test_scheduler_rejects_unknown_priority():
+    with pytest.raises(ValueError):
+        UpstreamScheduler().acquire("urgent")
+
+
+def test_scheduler_grants_by_priority_then_arrival():
+    gate = TokenGate()
+    scheduler = UpstreamScheduler(take_token=gate, max_wait=5)
+    order = ["background", "agent", "agent", "interactive"]
+    threads = []
+    for priority in order:
+        threads.append(threading.Thread(target=scheduler.acquire, args=(priority,)))
+        threads[-1].start()
+        expected = order[:len(threads)].count(priority)
+        wait_until(lambda: queued(scheduler, priority) == expected)
+
+    grants = []
+    for _ in order:
+        before = {priority: granted(scheduler, priority) for priority in UpstreamScheduler.PRIORITIES}
+        gate.tokens += 1
+        wait_until(lambda: sum(granted(scheduler, p) for p in before) == sum(before.values()) + 1)
+        grants.extend(p for p in before if granted(scheduler, p) > before[p])
+    for thread in threads:
+        thread.join()
+
+    assert grants == ["interactive", "agent", "agent", "background"]
+
+
+def test_scheduler_times_out_when_no_token_arrives():
+    scheduler = UpstreamScheduler(take_token=lambda: 1.0, max_wait=5)
+    assert scheduler.acquire("agent", max_wait=0.02) == UpstreamScheduler.TIMEOUT
+    stats = scheduler.stats()
+    assert stats["classes"]["agent"]["timeouts"] == 1
+    assert stats["classes"]["agent"]["queued"] == 0
+
+
+def test_scheduler_enforces_quota_per_affid(clock):
+    scheduler = UpstreamScheduler(quota=2, quota_period=60)
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.GRANTED
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.GRANTED
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.QUOTA_EXCEEDED
+    assert scheduler.acquire(affid="b") == UpstreamScheduler.GRANTED
+    stats = scheduler.stats()
+    assert stats["affids"]["a"] == {"calls": 3, "rejected": 1, "period_used": 2}
+    assert stats["classes"]["interactive"]["quota_rejected"] == 1
+
+    clock.advance(60)
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.GRANTED
+
+
+def test_scheduler_refunds_quota_on_timeout():
+    scheduler = UpstreamScheduler(take_token=lambda: 1.0, quota=1, quota_period=60)
+    assert scheduler.acquire(affid="a", max_wait=0.01) == UpstreamScheduler.TIMEOUT
+    assert scheduler.stats()["affids"]["a"]["period_used"] == 0
+
+    scheduler.take_token = lambda: 0
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.GRANTED
+    assert scheduler.acquire(affid="a") == UpstreamScheduler.QUOTA_EXCEEDED
+
+
+def test_scheduler_refunds_shared_quota_on_timeout(tmp_path):
+    state = SharedState(str(tmp_path / "shared.sqlite3"))
+    scheduler = UpstreamScheduler(
+        take_token=lambda: 1.0, quota=1, quota_period=60,
+        consume_quota=state.consume_quota, refund_quota=state.refund_quota,
+    )
+    assert scheduler.acquire(affid="a", max_wait=0.01) == UpstreamScheduler.TIMEOUT
+
+    # Another worker sharing the database still has the whole quota
+    other = UpstreamScheduler(quota=1, quota_period=60, consume_quota=state.consume_quota)
+    assert other.acquire(affid="a") == UpstreamScheduler.GRANTED
+    assert other.acquire(affid="a") == UpstreamScheduler.QUOTA_EXCEEDED
@@ -0,0 +1,545 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+
+class UpstreamClientRegistry:
+    """
+    Long-lived, thread-safe registry of upstream clients.
+
+    Keeps one pooled ``requests.Session`` per upstream host (with keep-alive)
+    and one ``CareerjetAPIClient`` per locale, so repeated searches reuse
+    open connections instead of paying a new TCP+TLS handshake every time.
+    """
+
+    def __init__(self, pool_size=10, pool_connections=4, max_retries=0):
+        self.pool_size = pool_size
+        self.pool_connections = pool_connections
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._pages_session = None
+        self._careerjet_clients = {}
+        self._careerjet_import_error = None
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """
+        Return the pooled session for the host of ``url``.
+
+        Args:
+            url (str): Any URL on the upstream host
+
+        Returns:
+            requests.Session: Shared session with a connection pool for that host
+        """
+        parts = urlsplit(url)
+        host_key = f"{parts.scheme}://{parts.netloc}"
+
+        session = self._sessions.get(host_key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host_key] = session
+            return session
+
+    def pages_session(self):
+        """
+        Return the one session used for third-party pages (job detail pages).
+
+        Unlike ``session_for`` this does not add a session per host: urllib3
+        keeps at most ``pool_connections`` host pools in an LRU inside the
+        single adapter, so arbitrary job-site hosts cannot grow the registry.
+
+        Returns:
+            requests.Session: Shared session for job pages
+        """
+        session = self._pages_session
+        if session is not None:
+            return session
+
+        with self._lock:
+            if self._pages_session is None:
+                self._pages_session = self._create_session()
+            return self._pages_session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_size,
+            max_retries=self.max_retries,
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def careerjet_client(self, locale):
+        """
+        Return the cached ``CareerjetAPIClient`` for ``locale``.
+
+        The import of ``careerjet_api_client`` is attempted only once; if it
+        fails, the error is remembered and re-raised on every call so the
+        caller can go straight to the direct API fallback.
+
+        Raises:
+            Exception: If the client library cannot be imported or the
+                locale is not supported
+        """
+        client = self._careerjet_clients.get(locale)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if self._careerjet_import_error is not None:
+                raise self._careerjet_import_error
+
+            client = self._careerjet_clients.get(locale)
+            if client is not None:
+                return client
+
+            try:
+                from careerjet_api_client import CareerjetAPIClient
+            except Exception as e:
+                # Remember the failure so the import is not retried on every search
+                self._careerjet_import_error = RuntimeError(f"careerjet_api_client unavailable: {e}")
+                raise self._careerjet_import_error
+
+            client = CareerjetAPIClient(locale)
+            self._careerjet_clients[locale] = client
+            return client
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            if self._pages_session is not None:
+                sessions.append(self._pages_session)
+                self._pages_session = None
+            self._sessions.clear()
+            self._careerjet_clients.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "sessions": sorted(self._sessions),
+                "careerjet_locales": sorted(self._careerjet_clients),
+                "careerjet_client_available": self._careerjet_import_error is None,
+            }
+
+
+class TokenBucket:
+    """
+    In-process token bucket refilling at ``rate`` tokens per second up to ``capacity``.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take_token(self):
+        """
+        Try to take one token.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _ms(value):
+    return round(value * 1000, 1) if value is not None else None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for upstream calls with latency-derived timeouts.
+
+    Keeps a rolling window of call outcomes and latencies. When the error
+    rate over the window reaches ``failure_threshold`` (with at least
+    ``min_calls`` samples) the breaker opens and callers fail fast for
+    ``open_seconds``. It then goes half-open and lets one probe call
+    through: success closes it, failure opens it again.
+
+    The recommended timeout is the observed p99 latency of successful calls
+    times ``timeout_multiplier``, clamped to [min_timeout, max_timeout].
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window_seconds=60, window_size=200, failure_threshold=0.5, min_calls=10,
+                 open_seconds=30, min_timeout=1.0, max_timeout=10.0, timeout_multiplier=2.0):
+        self.window_seconds = window_seconds
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self._samples = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_owner = None
+        self._lock = threading.Lock()
+        self.trips = 0
+        self.rejected = 0
+
+    def _window(self, now):
+        cutoff = now - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return self._samples
+
+    def allow(self):
+        """
+        Return True if a call may go upstream now.
+
+        In the half-open state only one probe call is allowed at a time.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self._probe_in_flight = True
+                self._probe_owner = threading.get_ident()
+            return True
+
+    def release(self):
+        """
+        Give back the calling thread's half-open probe slot if no outcome was recorded.
+
+        Safe to call unconditionally after every allowed call (e.g. in a
+        ``finally``): it does nothing once ``record`` finished the probe or
+        when another thread owns the current one.
+        """
+        with self._lock:
+            if self._probe_in_flight and self._probe_owner == threading.get_ident():
+                self._probe_in_flight = False
+                self._probe_owner = None
+
+    def degraded(self):
+        """True while half-open or when the rolling window holds failed calls."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                return True
+            return any(not ok for _, ok, _ in self._window(time.monotonic()))
+
+    def record(self, success, latency):
+        """
+        Record the outcome of an upstream call.
+
+        Args:
+            success (bool): Whether the upstream answered usefully
+            latency (float): Call duration in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._samples.append((now, success, latency))
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._probe_owner = None
+                if success:
+                    self._state = self.CLOSED
+                    self._samples.clear()
+                else:
+                    self._trip(now)
+                return
+
+            samples = self._window(now)
+            if self._state == self.CLOSED and len(samples) >= self.min_calls:
+                failures = sum(1 for _, ok, _ in samples if not ok)
+                if failures / len(samples) >= self.failure_threshold:
+                    self._trip(now)
+
+    def _trip(self, now):
+        self._state = self.OPEN
+        self._opened_at = now
+        self.trips += 1
+
+    def timeout(self):
+        """Return the upstream timeout (seconds) derived from the observed p99 latency."""
+        with self._lock:
+            latencies = sorted(latency for _, ok, latency in self._window(time.monotonic()) if ok)
+        p99 = _percentile(latencies, 99)
+        if p99 is None or len(latencies) < self.min_calls:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, p99 * self.timeout_multiplier))
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def stats(self):
+        """Return breaker state, rolling error rate and latency percentiles."""
+        state = self.state
+        timeout = self.timeout()
+        with self._lock:
+            samples = list(self._window(time.monotonic()))
+            trips = self.trips
+            rejected = self.rejected
+        latencies = sorted(latency for _, _, latency in samples)
+        failures = sum(1 for _, ok, _ in samples if not ok)
+        return {
+            "state": state,
+            "window_calls": len(samples),
+            "window_failures": failures,
+            "error_rate": round(failures / len(samples), 4) if samples else 0.0,
+            "latency_ms": {
+                "p50": _ms(_percentile(latencies, 50)),
+                "p95": _ms(_percentile(latencies, 95)),
+                "p99": _ms(_percentile(latencies, 99)),
+            },
+            "timeout_seconds": round(timeout, 3),
+            "trips": trips,
+            "rejected": rejected,
+        }
+
+
+class UpstreamScheduler:
+    """
+    Priority scheduler in front of the upstream token bucket.
+
+    Callers wait in one queue ordered by priority class (``interactive`` >
+    ``agent`` > ``background``) and arrival order; only the head of the
+    queue may take a token, so a burst of agent or background searches
+    cannot starve user-facing ones. Admissions are counted per affiliate
+    ID and can be capped with a quota per period. Queue-wait times are
+    kept per class for monitoring.
+    """
+
+    PRIORITIES = ("interactive", "agent", "background")
+
+    GRANTED = "granted"
+    TIMEOUT = "timeout"
+    QUOTA_EXCEEDED = "quota_exceeded"
+
+    def __init__(self, take_token=None, max_wait=5.0, quota=0, quota_period=86400,
+                 consume_quota=None, refund_quota=None, sample_size=1000):
+        """
+        Args:
+            take_token (callable): Returns 0 when a token was taken, otherwise
+                seconds until one is available; None disables rate limiting
+            max_wait (float): Default maximum seconds to wait in the queue
+            quota (int): Upstream calls allowed per affiliate ID per period (0 = unlimited)
+            quota_period (float): Quota period in seconds
+            consume_quota (callable): ``(affid, quota, period) -> bool`` used instead
+                of in-process counting (e.g. SharedState.consume_quota); returning
+                None falls back to in-process counting
+            refund_quota (callable): ``(affid, period) -> None`` that gives back
+                a use counted by ``consume_quota`` (e.g. SharedState.refund_quota)
+            sample_size (int): Queue-wait samples kept per priority class
+        """
+        self.take_token = take_token
+        self.max_wait = max_wait
+        self.quota = quota
+        self.quota_period = quota_period
+        self.consume_quota = consume_quota
+        self.refund_quota = refund_quota
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._classes = {
+            priority: {"granted": 0, "timeouts": 0, "quota_rejected": 0, "waits": deque(maxlen=sample_size)}
+            for priority in self.PRIORITIES
+        }
+        self._affids = {}
+
+    def _admit(self, affid):
+        """
+        Count one upstream call against ``affid``.
+
+        Returns:
+            tuple: (admitted, shared) where ``shared`` tells whether the use
+                was counted through ``consume_quota``
+        """
+        admitted = None
+        if self.quota > 0 and self.consume_quota is not None:
+            admitted = self.consume_quota(affid, self.quota, self.quota_period)
+        shared = admitted is not None
+
+        with self._cond:
+            usage = self._affids.get(affid)
+            if usage is None:
+                usage = self._affids[affid] = {"calls": 0, "rejected": 0, "period_start": time.time(), "period_used": 0}
+            usage["calls"] += 1
+            now = time.time()
+            if now - usage["period_start"] >= self.quota_period:
+                usage["period_start"] = now
+                usage["period_used"] = 0
+            if admitted is None:
+                admitted = self.quota <= 0 or usage["period_used"] < self.quota
+            if admitted:
+                usage["period_used"] += 1
+            else:
+                usage["rejected"] += 1
+        return admitted, shared
+
+    def _refund(self, affid, shared):
+        """Give back the quota use of a call that never went upstream."""
+        if shared and self.refund_quota is not None:
+            self.refund_quota(affid, self.quota_period)
+        with self._cond:
+            usage = self._affids.get(affid)
+            if usage is not None and usage["period_used"] > 0:
+                usage["period_used"] -= 1
+
+    def acquire(self, priority="interactive", affid=None, max_wait=None):
+        """
+        Wait for permission to make one upstream call.
+
+        Args:
+            priority (str): "interactive", "agent" or "background"
+            affid (str): Affiliate ID the call is made with, for quota accounting
+            max_wait (float): Maximum seconds to wait (default: ``self.max_wait``)
+
+        Returns:
+            str: GRANTED, TIMEOUT (rate limit budget exhausted) or QUOTA_EXCEEDED
+
+        Raises:
+            ValueError: If ``priority`` is not a known priority class
+        """
+        if priority not in self._classes:
+            raise ValueError(f"Unknown upstream priority: {priority}")
+        counters = self._classes[priority]
+
+        # Charged before the wait so an exhausted affid is rejected without
+        # queueing; a call that times out in the queue is refunded below
+        admitted, shared = self._admit(affid)
+        if not admitted:
+            with self._cond:
+                counters["quota_rejected"] += 1
+            return self.QUOTA_EXCEEDED
+
+        started = time.monotonic()
+        if self.take_token is None:
+            with self._cond:
+                counters["granted"] += 1
+                counters["waits"].append(0.0)
+            return self.GRANTED
+
+        deadline = started + (self.max_wait if max_wait is None else max_wait)
+        entry = (self.PRIORITIES.index(priority), next(self._sequence))
+        outcome = self.TIMEOUT
+        try:
+            outcome = self._wait_for_token(entry, counters, started, deadline)
+        finally:
+            if outcome != self.GRANTED:
+                self._refund(affid, shared)
+        return outcome
+
+    def _wait_for_token(self, entry, counters, started, deadline):
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    wait = None
+                    if self._queue[0] == entry:
+                        wait = self.take_token()
+                        if wait <= 0:
+                            counters["granted"] += 1
+                            counters["waits"].append(time.monotonic() - started)
+                            return self.GRANTED
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        counters["timeouts"] += 1
+                        return self.TIMEOUT
+                    # Waiters behind the head sleep until the queue moves
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def stats(self):
+        """Return queue depth, per-class wait percentiles and per-affid usage."""
+        with self._cond:
+            depth = {priority: 0 for priority in self.PRIORITIES}
+            for rank, _ in self._queue:
+                depth[self.PRIORITIES[rank]] += 1
+            classes = {}
+            for priority, counters in self._classes.items():
+                waits = sorted(counters["waits"])
+                classes[priority] = {
+                    "granted": counters["granted"],
+                    "timeouts": counters["timeouts"],
+                    "quota_rejected": counters["quota_rejected"],
+                    "queued": depth[priority],
+                    "wait_ms": {
+                        "p50": _ms(_percentile(waits, 50)),
+                        "p95": _ms(_percentile(waits, 95)),
+                        "max": _ms(waits[-1] if waits else None),
+                    },
+                }
+            affids = {
+                affid: {"calls": usage["calls"], "rejected": usage["rejected"], "period_used": usage["period_used"]}
+                for affid, usage in self._affids.items()
+            }
+        return {
+            "rate_limited": self.take_token is not None,
+            "max_wait": self.max_wait,
+            "quota": self.quota,
+            "quota_period": self.quota_period,
+            "classes": classes,
+            "affids": affids,
+        }
+
+
+# Process-wide registry shared by all callers of app.search_jobs
+registry = UpstreamClientRegistry(
+    pool_size=int(os.environ.get("CAREER_UPSTREAM_POOL_SIZE", "10")),
+    pool_connections=int(os.environ.get("CAREER_UPSTREAM_POOL_CONNECTIONS", "4")),
+)
+
+# Process-wide breaker guarding the Careerjet API
+breaker = CircuitBreaker(
+    failure_threshold=float(os.environ.get("CAREER_BREAKER_FAILURE_THRESHOLD", "0.5")),
+    min_calls=int(os.environ.get("CAREER_BREAKER_MIN_CALLS", "10")),
+    open_seconds=float(os.environ.get("CAREER_BREAKER_OPEN_SECONDS", "30")),
+    min_timeout=float(os.environ.get("CAREER_UPSTREAM_MIN_TIMEOUT", "1")),
+    max_timeout=float(os.environ.get("CAREER_UPSTREAM_MAX_TIMEOUT", "10")),
+)